@@ -71,9 +71,14 @@ def _cmd_start(args: argparse.Namespace) -> None:
         "--critique-rounds", str(args.critique_rounds),
         "--n-columns", str(args.n_columns),
         "--overlap-frac", str(args.overlap_frac),
+        "--page-workers", str(args.page_workers),
+        "--max-requests", str(args.max_requests),
+        "--strip-workers", str(args.strip_workers),
         "--structured",
         "--verbose",
     ]
+    for limit in args.model_limit:
+        cmd += ["--model-limit", limit]
     if args.overwrite:
         cmd.append("--overwrite")
     if args.show_vis:
@@ -203,9 +208,17 @@ def _build_parser() -> argparse.ArgumentParser:
     s.add_argument("--critique-rounds", type=int, default=1)
     s.add_argument("--n-columns", type=int, default=8)
     s.add_argument("--overlap-frac", type=float, default=0.05)
+    s.add_argument("--page-workers", type=int, default=4,
+                   help="Pages annotated concurrently.")
+    s.add_argument("--max-requests", type=int, default=8,
+                   help="Gemini requests in flight at once across all pages.")
+    s.add_argument("--model-limit", action="append", default=[], metavar="MODEL=N",
+                   help="Cap in-flight requests per model, e.g. 'pro=2' (repeatable).")
+    s.add_argument("--strip-workers", type=int, default=4,
+                   help="Strips annotated concurrently per page.")
     s.add_argument("--overwrite", action="store_true")
     s.add_argument("--show-vis", action="store_true",
-                   help="Open each visualisation PNG after it is written.")
+                   help="Open each visualisation after it is written.")
     s.set_defaults(func=_cmd_start)
 
     # --- watch ---
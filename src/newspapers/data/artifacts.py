@@ -0,0 +1,217 @@
+"""Content-addressed store for intermediate pipeline artifacts.
+
+Intermediate outputs (deskewed pages, strips, OCR transcriptions, …) used
+to be keyed only by the page's filename stem, so changing a parameter such
+as ``overlap_frac`` silently reused or overwrote stale files.  Here every
+artifact lives in its own directory named after a hash of
+
+- the *contents* of its input files,
+- the stage parameters, and
+- the code version (package version + a per-stage version string),
+
+so unchanged reruns are free and parameter sweeps never clobber each other::
+
+    data/interim/artifacts/
+        structure/3f9c…/         # one directory per (inputs, params, version)
+            manifest.json        # written last — marks the artifact complete
+            …stage files…
+        ocr/a71e…/
+
+Usage::
+
+    store = ArtifactStore()
+    key = artifact_key("ocr", inputs=[strip_png], params={"backend": name})
+    hit = store.lookup("ocr", key)
+    if hit is None:
+        build = store.prepare("ocr", key)
+        (build / "text.txt").write_text(text)
+        hit = store.commit("ocr", key, build, params={"backend": name})
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from newspapers import __version__
+
+logger = logging.getLogger(__name__)
+
+#: Default root of the artifact store.
+ARTIFACTS_DIR = Path("data") / "interim" / "artifacts"
+
+#: Marker file written once an artifact directory is complete.
+MANIFEST_NAME = "manifest.json"
+
+#: Hex digits of the SHA-256 kept in artifact directory names (96 bits).
+KEY_LENGTH = 24
+
+_digest_cache: dict[tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of *path*'s contents, memoised per (path, mtime, size)."""
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    with _digest_lock:
+        cached = _digest_cache.get(memo_key)
+    if cached is not None:
+        return cached
+
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    with _digest_lock:
+        _digest_cache[memo_key] = digest
+    return digest
+
+
+def remember_digest(path: Path, digest: str) -> None:
+    """Seed :func:`file_digest`'s memo with a digest computed elsewhere.
+
+    Lets a process that got *path*'s digest from a worker (or passes one to
+    it) avoid hashing the file a second time.
+    """
+    st = path.stat()
+    with _digest_lock:
+        _digest_cache[(str(path.resolve()), st.st_mtime_ns, st.st_size)] = digest
+
+
+def artifact_key(
+    stage: str,
+    *,
+    inputs: Sequence[Path | str | bytes] = (),
+    params: Mapping[str, Any] | None = None,
+    version: str = "",
+) -> str:
+    """Deterministic key for *stage* applied to *inputs* with *params*.
+
+    Parameters
+    ----------
+    stage:
+        Stage name (also the store sub-directory).
+    inputs:
+        Input files (hashed by content), or literal strings / bytes such as
+        prompts.
+    params:
+        JSON-serialisable stage parameters.
+    version:
+        Stage algorithm version; bump it whenever the stage's output for the
+        same inputs and parameters changes.
+    """
+    hashed_inputs: list[str] = []
+    for item in inputs:
+        if isinstance(item, Path):
+            hashed_inputs.append(file_digest(item))
+        elif isinstance(item, bytes):
+            hashed_inputs.append(hashlib.sha256(item).hexdigest())
+        else:
+            hashed_inputs.append(hashlib.sha256(item.encode("utf-8")).hexdigest())
+    payload = json.dumps(
+        {
+            "stage": stage,
+            "inputs": hashed_inputs,
+            "params": dict(params or {}),
+            "version": f"{__version__}:{version}",
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:KEY_LENGTH]
+
+
+class ArtifactStore:
+    """Directory-per-artifact store rooted at *root*.
+
+    Each build happens in its own hidden temporary directory next to the
+    artifact's final location (:meth:`prepare`) and is moved into place
+    with a single ``os.replace`` once its manifest is written
+    (:meth:`commit`).  Readers therefore only ever see complete artifacts,
+    a crash mid-build leaves nothing behind at the final path, and
+    concurrent builders of the same key (threads or processes) never touch
+    each other's files — the first to commit wins and the others' identical
+    builds are discarded.
+    """
+
+    def __init__(self, root: Path = ARTIFACTS_DIR) -> None:
+        self.root = root
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.root / stage / key
+
+    def lookup(self, stage: str, key: str) -> Path | None:
+        """Return the artifact directory if it is complete, else ``None``."""
+        path = self.path(stage, key)
+        if (path / MANIFEST_NAME).exists():
+            logger.debug("artifact hit: %s/%s", stage, key)
+            return path
+        return None
+
+    def prepare(self, stage: str, key: str) -> Path:
+        """Create a private build directory for a new artifact.
+
+        Write the artifact's files there, then pass it to :meth:`commit`, or
+        to :meth:`abort` if the build fails.
+        """
+        stage_dir = self.root / stage
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(prefix=f".{key}.", suffix=".tmp", dir=stage_dir))
+
+    def abort(self, build_dir: Path) -> None:
+        """Discard a build directory from :meth:`prepare` without committing it."""
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    def commit(
+        self,
+        stage: str,
+        key: str,
+        build_dir: Path,
+        *,
+        params: Mapping[str, Any] | None = None,
+        sources: Sequence[Path] = (),
+    ) -> Path:
+        """Write the manifest into *build_dir* and move it into place.
+
+        Returns the final artifact directory (which may be another
+        builder's, if it committed the same key first).
+        """
+        path = self.path(stage, key)
+        manifest = {
+            "stage": stage,
+            "key": key,
+            "version": __version__,
+            "params": dict(params or {}),
+            "sources": [str(p) for p in sources],
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        (build_dir / MANIFEST_NAME).write_text(
+            json.dumps(manifest, indent=2, default=str), encoding="utf-8"
+        )
+        if path.exists() and not (path / MANIFEST_NAME).exists():
+            # Left by an older, non-atomic version of the store — builds in
+            # progress live in their own temporary directories, never here.
+            shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.replace(build_dir, path)
+        except OSError:
+            if self.lookup(stage, key) is None:
+                raise
+            logger.debug("artifact %s/%s committed concurrently; discarding build", stage, key)
+            shutil.rmtree(build_dir, ignore_errors=True)
+        return path
+
+
+#: Process-wide default store.
+default_store = ArtifactStore()
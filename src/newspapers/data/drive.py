@@ -0,0 +1,519 @@
+"""Concurrent, resumable Google Drive downloader for the KB ``.jp2`` archive.
+
+Provides:
+- :class:`GoogleDriveClient` — thin Drive v3 wrapper.  Each worker thread
+  keeps its own authorised keep-alive HTTP connection, which is reused for
+  every listing page and download chunk that thread handles.
+- :func:`crawl_folder_tree` — breadth-first folder crawl; listing pages of
+  different folders are fetched concurrently.
+- :func:`download_files` — bounded worker pool over the discovered files with
+  chunked ``Range`` requests, MD5 verification and a persistent JSON manifest
+  so reruns skip completed files and resume partial ones.
+
+Anything implementing the :class:`DriveClient` protocol can be passed in
+place of :class:`GoogleDriveClient`, e.g. a local fake in the test suite.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+#: Size of each ``Range`` request.  Partial files are resumable at this
+#: granularity after an interruption.
+DEFAULT_CHUNK_SIZE: int = 8 * 1024 * 1024
+
+#: Default number of concurrent listing / download workers.
+DEFAULT_WORKERS: int = 8
+
+#: Manifest filename written inside the download directory.
+MANIFEST_NAME = ".drive_manifest.json"
+
+#: Seconds between manifest writes; updates in between are batched.
+MANIFEST_FLUSH_INTERVAL: float = 5.0
+
+_MEDIA_URL = "https://www.googleapis.com/drive/v3/files/{file_id}?alt=media"
+
+
+class DriveError(RuntimeError):
+    """Raised when a Drive request fails or a download does not verify."""
+
+
+class RangeIgnoredError(DriveError):
+    """A ranged request past the start was answered with the whole file (HTTP 200).
+
+    *content* holds that full body, so the download can restart from byte 0
+    without fetching it again.
+    """
+
+    def __init__(self, file_id: str, content: bytes) -> None:
+        super().__init__(f"GET {file_id}: server ignored the range and sent the whole file")
+        self.content = content
+
+
+@dataclass(frozen=True)
+class DriveFile:
+    """A downloadable file discovered by :func:`crawl_folder_tree`."""
+
+    id: str
+    name: str
+    size: int | None = None
+    md5: str | None = None
+    folder: str = ""
+    """Slash-separated folder path relative to the crawl root (informational)."""
+
+
+class DriveClient(Protocol):
+    """Minimal Drive interface used by the crawler and downloader."""
+
+    def list_folder(
+        self, folder_id: str, page_token: str | None = None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return one page of ``(items, next_page_token)`` for *folder_id*."""
+        ...
+
+    def fetch_range(self, file_id: str, start: int, end: int) -> bytes:
+        """Return bytes ``start..end`` (inclusive) of *file_id*'s content.
+
+        Raises :class:`RangeIgnoredError` if a range with ``start > 0`` is
+        answered with the whole file instead.
+        """
+        ...
+
+
+# ---------------------------------------------------------------------------
+# Google Drive v3 client
+# ---------------------------------------------------------------------------
+
+
+class GoogleDriveClient:
+    """Drive v3 client with one persistent authorised connection per thread.
+
+    ``httplib2`` connections are not thread-safe, so instead of sharing a
+    single one (or opening a new one per file) each worker thread lazily
+    creates its own and reuses it for the rest of the run.
+
+    Parameters
+    ----------
+    credentials:
+        ``google.auth`` credentials with a Drive read-only scope.
+    page_size:
+        Items per listing page (Drive maximum is 1000).
+    timeout:
+        Socket timeout in seconds for each request.
+    """
+
+    def __init__(self, credentials: Any, *, page_size: int = 1000, timeout: int = 120) -> None:
+        self._credentials = credentials
+        self._page_size = page_size
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def _http(self) -> Any:
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import google_auth_httplib2  # noqa: PLC0415
+            import httplib2  # noqa: PLC0415
+
+            http = google_auth_httplib2.AuthorizedHttp(
+                self._credentials, http=httplib2.Http(timeout=self._timeout)
+            )
+            self._local.http = http
+        return http
+
+    def _service(self) -> Any:
+        service = getattr(self._local, "service", None)
+        if service is None:
+            from googleapiclient.discovery import build  # noqa: PLC0415
+
+            service = build("drive", "v3", http=self._http(), cache_discovery=False)
+            self._local.service = service
+        return service
+
+    def list_folder(
+        self, folder_id: str, page_token: str | None = None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        results = (
+            self._service()
+            .files()
+            .list(
+                q=f"'{folder_id}' in parents and trashed=false",
+                pageToken=page_token,
+                pageSize=self._page_size,
+                fields="nextPageToken, files(id, name, mimeType, size, md5Checksum)",
+            )
+            .execute()
+        )
+        return results.get("files", []), results.get("nextPageToken")
+
+    def fetch_range(self, file_id: str, start: int, end: int) -> bytes:
+        resp, content = self._http().request(
+            _MEDIA_URL.format(file_id=file_id),
+            "GET",
+            headers={"range": f"bytes={start}-{end}"},
+        )
+        if resp.status == 200 and start > 0:
+            raise RangeIgnoredError(file_id, content)
+        if resp.status not in (200, 206):
+            raise DriveError(f"GET {file_id} bytes={start}-{end} failed: HTTP {resp.status}")
+        return content
+
+
+# ---------------------------------------------------------------------------
+# Breadth-first concurrent crawl
+# ---------------------------------------------------------------------------
+
+
+def crawl_folder_tree(
+    client: DriveClient,
+    root_id: str,
+    *,
+    suffix: str = ".jp2",
+    workers: int = DEFAULT_WORKERS,
+    max_files: int | None = None,
+) -> list[DriveFile]:
+    """List every file ending in *suffix* below *root_id*.
+
+    The crawl is breadth-first: each listing page is a separate task, so
+    sibling folders (and follow-up pages of large folders) are fetched
+    concurrently by up to *workers* threads.
+
+    Parameters
+    ----------
+    client:
+        A :class:`DriveClient`.
+    root_id:
+        Drive folder ID to start from.
+    suffix:
+        Only files whose name ends with this suffix are returned.
+    workers:
+        Maximum concurrent listing requests.
+    max_files:
+        Stop crawling once this many files have been found.
+
+    Returns
+    -------
+    list[DriveFile]
+        Files in discovery order (at most *max_files*).
+    """
+    found: list[DriveFile] = []
+
+    def _full() -> bool:
+        return max_files is not None and len(found) >= max_files
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(client.list_folder, root_id, None): (root_id, "")}
+        while pending and not _full():
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                folder_id, folder_path = pending.pop(fut)
+                items, next_token = fut.result()
+                if next_token:
+                    pending[pool.submit(client.list_folder, folder_id, next_token)] = (
+                        folder_id,
+                        folder_path,
+                    )
+                for item in items:
+                    if item.get("mimeType") == FOLDER_MIME_TYPE:
+                        sub_path = f"{folder_path}/{item['name']}".lstrip("/")
+                        logger.debug("Crawling folder: %s", sub_path)
+                        pending[pool.submit(client.list_folder, item["id"], None)] = (
+                            item["id"],
+                            sub_path,
+                        )
+                    elif item["name"].endswith(suffix):
+                        found.append(
+                            DriveFile(
+                                id=item["id"],
+                                name=item["name"],
+                                size=int(item["size"]) if item.get("size") is not None else None,
+                                md5=item.get("md5Checksum"),
+                                folder=folder_path,
+                            )
+                        )
+        for fut in pending:
+            fut.cancel()
+
+    if max_files is not None:
+        found = found[:max_files]
+    logger.info("crawl_folder_tree: %d %s file(s) found", len(found), suffix)
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Persistent download manifest
+# ---------------------------------------------------------------------------
+
+
+class DownloadManifest:
+    """JSON record of ``file_id → {name, size, md5Checksum, complete}``.
+
+    Entries are recorded when a download starts (``complete=False``) and when
+    it finishes, so a rerun can tell a resumable partial file from a stale
+    one whose remote content has since changed.  Thread-safe.  Updates are
+    written to disk atomically, at most every *flush_interval* seconds, and
+    by :meth:`flush` at the end of a run — so an archive of N files costs
+    O(N) manifest writes per interval rather than per update.  Entries lost
+    to a crash only cost a re-check: the file is resumed or re-downloaded.
+    """
+
+    def __init__(self, path: Path, *, flush_interval: float = MANIFEST_FLUSH_INTERVAL) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._entries: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError):
+                logger.warning("Ignoring unreadable download manifest %s", path)
+
+    def get(self, file_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(file_id)
+            return dict(entry) if entry is not None else None
+
+    def record(self, f: DriveFile, *, complete: bool, **extra: Any) -> None:
+        """Update *f*'s entry.  Extra keys survive only while the MD5 is unchanged."""
+        with self._lock:
+            old = self._entries.get(f.id, {})
+            entry = dict(old) if old.get("md5Checksum") == f.md5 else {}
+            entry.update(name=f.name, size=f.size, md5Checksum=f.md5, complete=complete, **extra)
+            self._entries[f.id] = entry
+            self._dirty = True
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending updates to disk now."""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = json.dumps(self._entries, separators=(",", ":"))
+                self._dirty = False
+                self._last_flush = time.monotonic()
+            # Serialised under the lock, written outside it: workers keep recording.
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Concurrent resumable downloads
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class DownloadSummary:
+    """Counters and throughput for a :func:`download_files` run."""
+
+    downloaded: int = 0
+    resumed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_fetched: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes_fetched / 1e6 / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def _file_md5(path: Path) -> str:
+    h = hashlib.md5()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def local_path(dest_dir: Path, f: DriveFile) -> Path:
+    """Where *f* is stored under *dest_dir*: its Drive folder path, then its name.
+
+    Files with the same name in different Drive folders therefore never
+    share a local file (or ``.part``).
+    """
+    parts = [p for p in f.folder.split("/") if p not in ("", ".", "..")]
+    return dest_dir.joinpath(*parts, f.name)
+
+
+def _is_complete(f: DriveFile, path: Path, entry: dict[str, Any] | None) -> bool:
+    if entry is None or not entry.get("complete") or entry.get("md5Checksum") != f.md5:
+        return False
+    return path.exists() and (f.size is None or path.stat().st_size == f.size)
+
+
+def _download_one(
+    client: DriveClient,
+    f: DriveFile,
+    dest_dir: Path,
+    manifest: DownloadManifest,
+    chunk_size: int,
+) -> tuple[str, int]:
+    """Download (or resume) a single file.  Returns ``(status, bytes_fetched)``."""
+    path = local_path(dest_dir, f)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = manifest.get(f.id)
+    if _is_complete(f, path, entry):
+        return "skipped", 0
+
+    part = path.with_name(path.name + ".part")
+    offset = 0
+    if part.exists() and entry is not None and entry.get("md5Checksum") == f.md5:
+        offset = part.stat().st_size
+        if f.size is not None and offset > f.size:
+            offset = 0
+    manifest.record(f, complete=False)
+
+    start_offset = offset
+    fetched = 0
+    with part.open("r+b" if offset else "wb") as fh:
+        fh.seek(offset)
+        fh.truncate()
+        while f.size is None or offset < f.size:
+            whole = False
+            try:
+                data = client.fetch_range(f.id, offset, offset + chunk_size - 1)
+            except RangeIgnoredError as exc:
+                # The body is the whole file, not the tail: start over from byte 0.
+                logger.warning("%s: range not honoured at byte %d; restarting", f.name, offset)
+                data, whole = exc.content, True
+                offset = start_offset = 0
+                fh.seek(0)
+                fh.truncate()
+            if not data:
+                break
+            fh.write(data)
+            offset += len(data)
+            fetched += len(data)
+            if whole or (f.size is None and len(data) < chunk_size):
+                break
+
+    if f.size is not None and offset != f.size:
+        raise DriveError(f"{f.name}: got {offset} bytes, expected {f.size}")
+    if f.md5 and _file_md5(part) != f.md5:
+        part.unlink(missing_ok=True)
+        raise DriveError(f"{f.name}: MD5 mismatch after download")
+
+    os.replace(part, path)
+    manifest.record(f, complete=True)
+    return ("resumed" if start_offset else "downloaded"), fetched
+
+
+def download_files(
+    client: DriveClient,
+    files: Iterable[DriveFile],
+    dest_dir: Path,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    manifest_path: Path | None = None,
+    manifest: DownloadManifest | None = None,
+    on_complete: Callable[[DriveFile, Path], None] | None = None,
+) -> DownloadSummary:
+    """Download *files* into *dest_dir* with a bounded pool of worker threads.
+
+    Each file is stored at :func:`local_path` (its Drive folder path below
+    *dest_dir*).
+
+    Parameters
+    ----------
+    client:
+        A :class:`DriveClient`.
+    files:
+        Files to fetch, typically from :func:`crawl_folder_tree`.
+    dest_dir:
+        Target directory (created if needed).
+    workers:
+        Maximum concurrent downloads.
+    chunk_size:
+        Bytes per ``Range`` request.
+    manifest_path:
+        Manifest location.  Defaults to ``dest_dir / .drive_manifest.json``.
+    manifest:
+        An already-open :class:`DownloadManifest` to share with the caller
+        (takes precedence over *manifest_path*).
+    on_complete:
+        Called from the calling thread with ``(file, local_path)`` for every
+        file that is on disk and verified — including skipped ones — so a
+        caller can stream them into the next stage.  Blocking in the
+        callback throttles further downloads.
+
+    Returns
+    -------
+    DownloadSummary
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    if manifest is None:
+        manifest = DownloadManifest(manifest_path or dest_dir / MANIFEST_NAME)
+    summary = DownloadSummary()
+    t0 = time.perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            queue = iter(files)
+            in_flight: dict = {}
+
+            def _submit_next() -> bool:
+                f = next(queue, None)
+                if f is None:
+                    return False
+                in_flight[
+                    pool.submit(_download_one, client, f, dest_dir, manifest, chunk_size)
+                ] = f
+                return True
+
+            while len(in_flight) < workers * 2 and _submit_next():
+                pass
+
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    f = in_flight.pop(fut)
+                    try:
+                        status, fetched = fut.result()
+                    except Exception:
+                        logger.exception("Failed to download %s", f.name)
+                        summary.failed += 1
+                    else:
+                        setattr(summary, status, getattr(summary, status) + 1)
+                        summary.bytes_fetched += fetched
+                        logger.info("   -> %s %s", status.capitalize(), f.name)
+                        if on_complete is not None:
+                            on_complete(f, local_path(dest_dir, f))
+                    _submit_next()
+    finally:
+        manifest.flush()
+
+    summary.elapsed_s = time.perf_counter() - t0
+    logger.info(
+        "download_files: %d downloaded, %d resumed, %d skipped, %d failed "
+        "(%.1f MB in %.1fs, %.1f MB/s)",
+        summary.downloaded,
+        summary.resumed,
+        summary.skipped,
+        summary.failed,
+        summary.bytes_fetched / 1e6,
+        summary.elapsed_s,
+        summary.mb_per_s,
+    )
+    return summary
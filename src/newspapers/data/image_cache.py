@@ -0,0 +1,128 @@
+"""In-process cache of decoded page images shared across pipeline stages.
+
+During a single structured annotation run the same page used to be decoded
+several times (structure analysis, strip decomposition, visualisation, OCR).
+:class:`PageImageCache` decodes each file once and hands out shared,
+read-only numpy arrays:
+
+- keyed by resolved path + mtime + file size, so a rewritten file is
+  transparently re-decoded;
+- bounded by total bytes with least-recently-used eviction;
+- thread-safe, so concurrent strip workers can share it.
+
+Most callers should use the process-wide :data:`page_cache` instance.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+#: Default byte budget — room for a handful of 4 000 × 6 000 RGB pages
+#: plus their grayscale copies.
+DEFAULT_MAX_BYTES: int = 512 * 1024 * 1024
+
+_Key = tuple[str, int, int, str]
+
+
+class PageImageCache:
+    """LRU cache of decoded images, bounded by total array size in bytes.
+
+    Parameters
+    ----------
+    max_bytes:
+        Upper bound on the summed ``nbytes`` of all cached arrays.  An array
+        larger than the whole budget is returned but not cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[_Key, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path: Path, mode: str) -> _Key:
+        st = path.stat()
+        return str(path.resolve()), st.st_mtime_ns, st.st_size, mode
+
+    def _lookup(self, key: _Key) -> np.ndarray | None:
+        with self._lock:
+            arr = self._entries.get(key)
+            if arr is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return arr
+
+    def _store(self, key: _Key, arr: np.ndarray) -> np.ndarray:
+        arr = arr.view()  # read-only view; never alters the caller's array flags
+        arr.setflags(write=False)
+        if arr.nbytes > self.max_bytes:
+            return arr
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = arr
+            self._bytes += arr.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return arr
+
+    def get_rgb(self, path: Path) -> np.ndarray:
+        """Return the page at *path* as a read-only ``(H, W, 3)`` uint8 array."""
+        key = self._key(path, "RGB")
+        arr = self._lookup(key)
+        if arr is None:
+            with Image.open(path) as img:
+                arr = np.asarray(img.convert("RGB"))
+            logger.debug("page_cache: decoded %s (%.1f MB)", path.name, arr.nbytes / 1e6)
+            arr = self._store(key, arr)
+        return arr
+
+    def get_gray(self, path: Path) -> np.ndarray:
+        """Return the page at *path* as a read-only ``(H, W)`` uint8 array.
+
+        Derived from the cached RGB array (same luma conversion as
+        ``Image.convert("L")``), so it never triggers a second decode.
+        """
+        key = self._key(path, "L")
+        arr = self._lookup(key)
+        if arr is None:
+            rgb = self.get_rgb(path)
+            arr = self._store(key, np.asarray(Image.fromarray(rgb).convert("L")))
+        return arr
+
+    def get_image(self, path: Path) -> Image.Image:
+        """Return a fresh, writable RGB PIL image built from the cached array."""
+        return Image.fromarray(self.get_rgb(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes currently held."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+#: Process-wide shared cache used by the structure, annotate, detect and OCR
+#: modules.
+page_cache = PageImageCache()
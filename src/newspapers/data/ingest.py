@@ -8,11 +8,19 @@ Provides utilities for:
 
 from __future__ import annotations
 
+import argparse
 import logging
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
 
 from PIL import Image
 
+from newspapers.data.tiles import META_NAME, record_source, tiles_path, write_tiled_page
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -20,12 +28,60 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
+#: Upper bound on the number of wavelet levels discarded when decoding a
+#: JPEG2000 file at reduced resolution.  KB scans use the OpenJPEG default of
+#: 6 resolutions (5 decompositions); asking for more than exist fails to decode.
+MAX_JP2_REDUCE: int = 5
+
+
+def _jp2_reduce_factor(size: tuple[int, int], target: tuple[int, int]) -> int:
+    """Return the largest wavelet reduction whose output still covers *target*.
+
+    Each reduction level halves both dimensions, so the decoded image is at
+    least as large as the final ``thumbnail(target)`` result and the LANCZOS
+    downsample still has real pixels to work with.
+    """
+    factor = max(size[0] / target[0], size[1] / target[1])
+    if factor < 2:
+        return 0
+    return min(int(math.log2(factor)), MAX_JP2_REDUCE)
+
+
+def _open_reduced(input_path: Path, target: tuple[int, int]) -> Image.Image:
+    """Open *input_path*, decoding only the resolution level needed for *target*.
+
+    Non-JPEG2000 inputs (and files with fewer decomposition levels than
+    requested) fall back gracefully to a full-resolution decode.
+    """
+    img = Image.open(input_path)
+    if img.format != "JPEG2000":
+        return img
+
+    reduce = _jp2_reduce_factor(img.size, target)
+    while reduce > 0:
+        img = Image.open(input_path)
+        img.reduce = reduce
+        try:
+            img.load()
+        except OSError:
+            # Codestream has fewer resolution levels than we asked for
+            logger.debug("%s: reduce=%d not available; retrying", input_path.name, reduce)
+            reduce -= 1
+            continue
+        logger.debug("%s: decoded at 1/%d resolution", input_path.name, 1 << reduce)
+        return img
+
+    return Image.open(input_path)
+
+
 def convert_jp2(
     input_path: Path,
     output_dir: Path,
     *,
     low_res_size: tuple[int, int] = (1280, 1280),
-) -> tuple[Path, Path]:
+    write_png: bool = True,
+    write_tiles: bool = False,
+) -> tuple[Path, Path | None]:
     """Convert a JPEG2000 file to both a low-res JPEG and a high-res PNG.
 
     Parameters
@@ -37,20 +93,39 @@ def convert_jp2(
     low_res_size:
         Maximum (width, height) for the low-resolution JPEG thumbnail
         used by the segmentation model.
+    write_png:
+        If ``False``, skip the full-resolution PNG and decode only the
+        JPEG2000 resolution level needed for the JPEG.  This is several
+        times faster and uses a fraction of the memory; call
+        :func:`ensure_png` later for the pages that actually need it.
+    write_tiles:
+        Also write a tiled multi-resolution copy of the page to
+        ``<stem>.tiles/`` (see :mod:`newspapers.data.tiles`) so cropping and
+        strip generation can decode only the regions they need.
 
     Returns
     -------
-    tuple[Path, Path]
+    tuple[Path, Path | None]
         ``(jpg_path, png_path)`` — paths to the generated files.
+        *png_path* is ``None`` when ``write_png=False``.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     stem = input_path.stem
 
-    img = Image.open(input_path)
+    png_path: Path | None = None
+    if write_png or write_tiles:
+        img = Image.open(input_path)
+
+        # High-resolution lossless PNG (for Vision LLM extraction)
+        if write_png:
+            png_path = output_dir / f"{stem}.png"
+            img.save(png_path, format="PNG")
 
-    # High-resolution lossless PNG (for Vision LLM extraction)
-    png_path = output_dir / f"{stem}.png"
-    img.save(png_path, format="PNG")
+        # Tiled pyramid (for region-level reads by crop / strip stages)
+        if write_tiles:
+            write_tiled_page(img, tiles_path(output_dir / f"{stem}.png"), source=png_path)
+    else:
+        img = _open_reduced(input_path, low_res_size)
 
     # Low-resolution JPEG (for YOLOv11 segmentation)
     jpg_path = output_dir / f"{stem}.jpg"
@@ -58,84 +133,347 @@ def convert_jp2(
     thumbnail.thumbnail(low_res_size, Image.LANCZOS)
     thumbnail.save(jpg_path, format="JPEG", quality=85)
 
-    logger.info("Converted %s → %s, %s", input_path.name, jpg_path.name, png_path.name)
+    logger.info(
+        "Converted %s → %s, %s",
+        input_path.name, jpg_path.name, png_path.name if png_path else "(no PNG)",
+    )
     return jpg_path, png_path
 
-import os
-import io
+
+def ensure_png(input_path: Path, output_dir: Path) -> Path:
+    """Write the full-resolution PNG for *input_path* unless an up-to-date one exists.
+
+    Companion to ``convert_jp2(..., write_png=False)``: lets later stages
+    materialise the lossless PNG only for pages that are actually cropped
+    or transcribed.
+
+    Returns
+    -------
+    Path
+        Path to the (possibly pre-existing) PNG.
+    """
+    png_path = output_dir / f"{input_path.stem}.png"
+    if png_path.exists() and png_path.stat().st_mtime >= input_path.stat().st_mtime:
+        return png_path
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with Image.open(input_path) as img:
+        img.save(png_path, format="PNG")
+    tiles_meta = tiles_path(png_path) / META_NAME
+    if tiles_meta.exists() and tiles_meta.stat().st_mtime >= input_path.stat().st_mtime:
+        record_source(tiles_meta.parent, png_path)  # tiles made from the same input
+    logger.info("Materialised full-resolution PNG %s", png_path.name)
+    return png_path
+
+
+# ---------------------------------------------------------------------------
+# Batch conversion of whole archive folders
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ConversionSummary:
+    """Counters and throughput for a :func:`convert_directory` run."""
+
+    converted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_read: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def pages_per_s(self) -> float:
+        return self.converted / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes_read / 1e6 / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def _is_up_to_date(src: Path, outputs: list[Path]) -> bool:
+    """True if every output exists, is non-empty and is newer than *src*."""
+    src_mtime = src.stat().st_mtime
+    for out in outputs:
+        try:
+            st = out.stat()
+        except FileNotFoundError:
+            return False
+        if st.st_size == 0 or st.st_mtime < src_mtime:
+            return False
+    return True
+
+
+def _limit_worker_memory(memory_limit_mb: int | None) -> None:
+    """Process-pool initializer: cap the worker's address space (POSIX only)."""
+    if not memory_limit_mb:
+        return
+    try:
+        import resource  # noqa: PLC0415
+    except ImportError:  # Windows
+        logger.warning("memory_limit_mb is not supported on this platform; ignoring.")
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _convert_worker(
+    src: Path,
+    output_dir: Path,
+    low_res_size: tuple[int, int],
+    write_png: bool,
+    write_tiles: bool,
+) -> int:
+    """Convert one file in a worker process; returns the source size in bytes."""
+    convert_jp2(
+        src, output_dir, low_res_size=low_res_size, write_png=write_png, write_tiles=write_tiles
+    )
+    return src.stat().st_size
+
+
+def convert_directory(
+    input_dir: Path,
+    output_dir: Path,
+    *,
+    low_res_size: tuple[int, int] = (1280, 1280),
+    write_png: bool = True,
+    write_tiles: bool = False,
+    workers: int | None = None,
+    max_tasks_per_child: int | None = 50,
+    memory_limit_mb: int | None = None,
+    overwrite: bool = False,
+    progress_every: int = 100,
+) -> ConversionSummary:
+    """Convert every ``.jp2`` under *input_dir* (recursively) with a process pool.
+
+    Outputs are written flat into *output_dir* (KB page stems are unique),
+    matching the layout expected by the annotate and detect stages.
+
+    Parameters
+    ----------
+    input_dir:
+        Root of the ``.jp2`` archive tree.
+    output_dir:
+        Directory for the converted ``.jpg`` / ``.png`` files.
+    low_res_size, write_png, write_tiles:
+        Passed to :func:`convert_jp2`.
+    workers:
+        Number of worker processes.  Defaults to ``os.cpu_count()``.
+    max_tasks_per_child:
+        Recycle each worker after this many pages so decoder buffers and
+        heap fragmentation cannot accumulate over a long run.
+    memory_limit_mb:
+        Optional hard address-space cap per worker (POSIX only).  A page
+        that exceeds it fails with ``MemoryError`` instead of swapping.
+    overwrite:
+        If ``False`` (default), skip pages whose outputs are non-empty and
+        newer than the source file.
+    progress_every:
+        Log a progress line every this many completed pages.
+
+    Returns
+    -------
+    ConversionSummary
+        Counts of converted / skipped / failed pages and throughput.
+    """
+    sources = sorted(input_dir.rglob("*.jp2"))
+    summary = ConversionSummary()
+    if not sources:
+        logger.warning("No .jp2 files found under %s", input_dir)
+        return summary
+
+    pending: list[Path] = []
+    for src in sources:
+        outputs = [output_dir / f"{src.stem}.jpg"]
+        if write_png:
+            outputs.append(output_dir / f"{src.stem}.png")
+        if write_tiles:
+            outputs.append(tiles_path(output_dir / f"{src.stem}.png") / META_NAME)
+        if not overwrite and _is_up_to_date(src, outputs):
+            summary.skipped += 1
+        else:
+            pending.append(src)
+
+    logger.info(
+        "convert_directory: %d file(s) found, %d up to date, %d to convert",
+        len(sources), summary.skipped, len(pending),
+    )
+    if not pending:
+        return summary
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    # Keep only a couple of tasks per worker in flight so the parent does not
+    # hold futures for an entire archive at once.
+    max_in_flight = workers * 2
+    t0 = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        max_tasks_per_child=max_tasks_per_child,
+        initializer=_limit_worker_memory,
+        initargs=(memory_limit_mb,),
+    ) as pool:
+        queue = iter(pending)
+        in_flight: dict = {}
+        done_count = 0
+
+        def _submit_next() -> bool:
+            src = next(queue, None)
+            if src is None:
+                return False
+            fut = pool.submit(
+                _convert_worker, src, output_dir, low_res_size, write_png, write_tiles
+            )
+            in_flight[fut] = src
+            return True
+
+        while len(in_flight) < max_in_flight and _submit_next():
+            pass
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                src = in_flight.pop(fut)
+                try:
+                    summary.bytes_read += fut.result()
+                    summary.converted += 1
+                except Exception:
+                    logger.exception("Failed to convert %s", src)
+                    summary.failed += 1
+                done_count += 1
+                if done_count % progress_every == 0:
+                    summary.elapsed_s = time.perf_counter() - t0
+                    logger.info(
+                        "  %d/%d pages  (%.2f pages/s, %.1f MB/s)",
+                        done_count, len(pending), summary.pages_per_s, summary.mb_per_s,
+                    )
+                _submit_next()
+
+    summary.elapsed_s = time.perf_counter() - t0
+    logger.info(
+        "convert_directory done: %d converted, %d skipped, %d failed in %.1fs "
+        "(%.2f pages/s, %.1f MB/s)",
+        summary.converted, summary.skipped, summary.failed, summary.elapsed_s,
+        summary.pages_per_s, summary.mb_per_s,
+    )
+    return summary
+
 import google.auth
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+
+from newspapers.data.drive import (
+    DEFAULT_WORKERS,
+    GoogleDriveClient,
+    crawl_folder_tree,
+    download_files,
+)
 
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 TARGET_FOLDER_ID = '1uwu7l_8Xm9W3F9x8kakamWzXsFoi_07A'  # Provided Google Drive Folder ID
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'raw')
 
-def authenticate_gdrive():
-    """Authenticates and returns a Drive API service object.
-    Uses Application Default Credentials.
-    """
+def get_drive_credentials():
+    """Returns Application Default Credentials with the Drive read-only scope."""
     try:
         credentials, project_id = google.auth.default(scopes=SCOPES)
-        service = build('drive', 'v3', credentials=credentials)
-        return service
+        return credentials
     except Exception as e:
         print("Error during authentication. Please make sure you have run:")
         print("  gcloud auth application-default login --scopes=https://www.googleapis.com/auth/drive.readonly")
         raise e
 
-def list_and_download_samples(max_downloads=5):
-    """Maps the directory structure and downloads a few sample .jp2 files."""
-    service = authenticate_gdrive()
-    os.makedirs(DATA_DIR, exist_ok=True)
-    
-    downloaded = [0] # Use a list to mutate inside recursive function
-
-    def crawl_folder(folder_id, folder_name="Root"):
-        if downloaded[0] >= max_downloads:
-            return
-            
-        print(f"Crawling folder: {folder_name}")
-        query = f"'{folder_id}' in parents and trashed=false"
-        # Support pagination if there are many items
-        page_token = None
-        while True:
-            results = service.files().list(
-                q=query, 
-                pageToken=page_token,
-                fields="nextPageToken, files(id, name, mimeType)"
-            ).execute()
-            
-            items = results.get('files', [])
-            for item in items:
-                if downloaded[0] >= max_downloads:
-                    break
-                    
-                if item['mimeType'] == 'application/vnd.google-apps.folder':
-                    crawl_folder(item['id'], item['name'])
-                elif item['name'].endswith('.jp2'):
-                    download_file(service, item['id'], item['name'])
-                    downloaded[0] += 1
-            
-            page_token = results.get('nextPageToken', None)
-            if not page_token or downloaded[0] >= max_downloads:
-                break
-
-    crawl_folder(TARGET_FOLDER_ID)
-    print(f"\nDownloaded {downloaded[0]} sample image(s) to {os.path.abspath(DATA_DIR)}")
-
-def download_file(service, file_id, file_name):
-    """Downloads a single file from Google Drive."""
-    print(f"   -> Downloading {file_name}...")
-    request = service.files().get_media(fileId=file_id)
-    file_path = os.path.join(DATA_DIR, file_name)
-    
-    with io.FileIO(file_path, 'wb') as fh:
-        downloader = MediaIoBaseDownload(fh, request)
-        done = False
-        while done is False:
-            status, done = downloader.next_chunk()
-            print(f"      Download {int(status.progress() * 100)}%.")
+def list_and_download_samples(max_downloads=5, *, workers=DEFAULT_WORKERS):
+    """Maps the directory structure and downloads a few sample .jp2 files.
+
+    Folders are crawled breadth-first and files fetched concurrently (see
+    :mod:`newspapers.data.drive`).  A manifest in ``DATA_DIR`` lets reruns
+    skip completed files and resume partial ones.
+    """
+    client = GoogleDriveClient(get_drive_credentials())
+
+    files = crawl_folder_tree(
+        client, TARGET_FOLDER_ID, workers=workers, max_files=max_downloads
+    )
+    summary = download_files(client, files, Path(DATA_DIR), workers=workers)
+    print(
+        f"\nDownloaded {summary.downloaded + summary.resumed} sample image(s) "
+        f"({summary.skipped} already present, {summary.failed} failed) "
+        f"to {os.path.abspath(DATA_DIR)}"
+    )
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        description="Download KB .jp2 scans from Google Drive and convert them to JPG/PNG.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument("--verbose", action="store_true", help="Enable DEBUG logging.")
+    # Also accepted after the subcommand; SUPPRESS keeps it from resetting
+    # a --verbose given before the subcommand.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--verbose", action="store_true", default=argparse.SUPPRESS,
+                        help="Enable DEBUG logging.")
+    sub = p.add_subparsers(dest="command")
+    dl = sub.add_parser(
+        "download", parents=[common], help="Download a few sample .jp2 files (default)."
+    )
+    dl.add_argument("--max-downloads", type=int, default=5,
+                    help="Number of .jp2 files to fetch.")
+    dl.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                    help="Concurrent listing / download workers.")
+
+    conv = sub.add_parser(
+        "convert",
+        parents=[common],
+        help="Batch-convert a directory tree of .jp2 files with a process pool.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    conv.add_argument("--input", type=Path, default=Path("data/raw"),
+                      help="Root directory searched recursively for .jp2 files.")
+    conv.add_argument("--output", type=Path, default=Path("data/processed"),
+                      help="Output directory for .jpg / .png files.")
+    conv.add_argument("--workers", type=int, default=None,
+                      help="Worker processes (default: all cores).")
+    conv.add_argument("--no-png", action="store_true",
+                      help="Skip the full-res PNG and use reduced-resolution JP2 decoding.")
+    conv.add_argument("--tiles", action="store_true",
+                      help="Also write a tiled multi-resolution copy of each page.")
+    conv.add_argument("--max-tasks-per-child", type=int, default=50,
+                      help="Recycle each worker process after this many pages.")
+    conv.add_argument("--memory-limit-mb", type=int, default=None,
+                      help="Per-worker address-space cap in MB (POSIX only).")
+    conv.add_argument("--overwrite", action="store_true",
+                      help="Re-convert files whose outputs are already up to date.")
+    return p
+
 
 if __name__ == '__main__':
-    list_and_download_samples()
+    args = _build_parser().parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s – %(message)s",
+    )
+
+    if args.command == "convert":
+        result = convert_directory(
+            args.input,
+            args.output,
+            write_png=not args.no_png,
+            write_tiles=args.tiles,
+            workers=args.workers,
+            max_tasks_per_child=args.max_tasks_per_child,
+            memory_limit_mb=args.memory_limit_mb,
+            overwrite=args.overwrite,
+        )
+        print(
+            f"Converted {result.converted}, skipped {result.skipped}, "
+            f"failed {result.failed} in {result.elapsed_s:.1f}s "
+            f"({result.pages_per_s:.2f} pages/s, {result.mb_per_s:.1f} MB/s)"
+        )
+    elif args.command == "download":
+        list_and_download_samples(args.max_downloads, workers=args.workers)
+    else:
+        list_and_download_samples()
@@ -0,0 +1,302 @@
+"""Streaming ingest: overlap Google Drive downloads with JP2 conversion.
+
+Instead of downloading a whole archive into ``data/raw`` and converting it in
+a second pass, :func:`stream_ingest` hands every verified download straight
+to a conversion process pool while the next files are still being fetched.
+The number of raw files waiting for conversion is capped, so disk use stays
+bounded, and raw ``.jp2`` files can be deleted as soon as their outputs have
+been verified.
+
+Usage
+-----
+::
+
+    uv run python -m newspapers.data.pipeline \\
+        --raw data/raw --output data/processed --delete-raw
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PIL import Image
+
+from newspapers.data.drive import (
+    DEFAULT_WORKERS,
+    MANIFEST_NAME,
+    DownloadManifest,
+    DownloadSummary,
+    DriveClient,
+    DriveFile,
+    crawl_folder_tree,
+    download_files,
+)
+from newspapers.data.ingest import convert_jp2
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StreamSummary:
+    """Counters and throughput for a :func:`stream_ingest` run."""
+
+    download: DownloadSummary = field(default_factory=DownloadSummary)
+    converted: int = 0
+    already_converted: int = 0
+    failed: int = 0
+    raw_deleted: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def pages_per_s(self) -> float:
+        return self.converted / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def _convert_and_verify(
+    src: Path,
+    output_dir: Path,
+    low_res_size: tuple[int, int],
+    write_png: bool,
+) -> None:
+    """Worker: convert *src* and re-open every output to prove it decodes."""
+    outputs = convert_jp2(src, output_dir, low_res_size=low_res_size, write_png=write_png)
+    for out in outputs:
+        if out is None:
+            continue
+        with Image.open(out) as im:
+            im.verify()
+
+
+def _outputs_exist(f: DriveFile, output_dir: Path, write_png: bool) -> bool:
+    stem = Path(f.name).stem
+    suffixes = (".jpg", ".png") if write_png else (".jpg",)
+    return all((output_dir / f"{stem}{sfx}").exists() for sfx in suffixes)
+
+
+def stream_ingest(
+    client: DriveClient,
+    root_id: str,
+    raw_dir: Path,
+    output_dir: Path,
+    *,
+    download_workers: int = DEFAULT_WORKERS,
+    convert_workers: int | None = None,
+    max_pending_raw: int | None = None,
+    max_files: int | None = None,
+    low_res_size: tuple[int, int] = (1280, 1280),
+    write_png: bool = True,
+    delete_raw: bool = False,
+) -> StreamSummary:
+    """Download every ``.jp2`` below *root_id* and convert each as it lands.
+
+    Parameters
+    ----------
+    client:
+        A :class:`~newspapers.data.drive.DriveClient`.
+    root_id:
+        Drive folder ID to crawl.
+    raw_dir:
+        Download directory for ``.jp2`` files, laid out by Drive folder
+        (also holds the manifest).
+    output_dir:
+        Directory for converted ``.jpg`` / ``.png`` files.
+    download_workers:
+        Concurrent download threads.
+    convert_workers:
+        Conversion processes.  Defaults to ``os.cpu_count()``.
+    max_pending_raw:
+        Maximum downloaded-but-unconverted files on disk; downloads pause
+        when it is reached.  Defaults to ``2 × convert_workers``.
+    max_files:
+        Stop after this many files (useful for samples).
+    low_res_size, write_png:
+        Passed to :func:`~newspapers.data.ingest.convert_jp2`.
+    delete_raw:
+        Delete each ``.jp2`` once its outputs have been written and verified.
+        The manifest remembers the page as converted so reruns skip it.
+
+    Returns
+    -------
+    StreamSummary
+    """
+    convert_workers = convert_workers or os.cpu_count() or 1
+    max_pending_raw = max_pending_raw or convert_workers * 2
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = DownloadManifest(raw_dir / MANIFEST_NAME)
+    summary = StreamSummary()
+    t0 = time.perf_counter()
+
+    files = crawl_folder_tree(client, root_id, workers=download_workers, max_files=max_files)
+
+    # Pages converted (and possibly deleted) by an earlier run need no download
+    todo: list[DriveFile] = []
+    for f in files:
+        entry = manifest.get(f.id)
+        if (
+            entry is not None
+            and entry.get("converted")
+            and entry.get("md5Checksum") == f.md5
+            and _outputs_exist(f, output_dir, write_png)
+        ):
+            summary.already_converted += 1
+        else:
+            todo.append(f)
+    logger.info(
+        "stream_ingest: %d file(s), %d already converted, %d to process",
+        len(files),
+        summary.already_converted,
+        len(todo),
+    )
+
+    try:
+        with ProcessPoolExecutor(max_workers=convert_workers) as pool:
+            in_flight: dict[Future, tuple[DriveFile, Path]] = {}
+
+            def _collect(block: bool) -> None:
+                if not in_flight:
+                    return
+                done, _ = wait(
+                    in_flight, timeout=None if block else 0, return_when=FIRST_COMPLETED
+                )
+                for fut in done:
+                    f, raw_path = in_flight.pop(fut)
+                    try:
+                        fut.result()
+                    except Exception:
+                        logger.exception("Failed to convert %s", raw_path.name)
+                        summary.failed += 1
+                        continue
+                    summary.converted += 1
+                    manifest.record(f, complete=True, converted=True)
+                    if delete_raw:
+                        raw_path.unlink(missing_ok=True)
+                        summary.raw_deleted += 1
+
+            def _on_downloaded(f: DriveFile, raw_path: Path) -> None:
+                # Back-pressure: stop pulling new downloads while the converters lag
+                while len(in_flight) >= max_pending_raw:
+                    _collect(block=True)
+                fut = pool.submit(
+                    _convert_and_verify, raw_path, output_dir, low_res_size, write_png
+                )
+                in_flight[fut] = (f, raw_path)
+                _collect(block=False)
+
+            summary.download = download_files(
+                client,
+                todo,
+                raw_dir,
+                workers=download_workers,
+                manifest=manifest,
+                on_complete=_on_downloaded,
+            )
+            while in_flight:
+                _collect(block=True)
+    finally:
+        manifest.flush()  # conversions recorded after the downloads finished
+
+    summary.elapsed_s = time.perf_counter() - t0
+    logger.info(
+        "stream_ingest done: %d converted, %d already converted, %d failed, "
+        "%d raw deleted in %.1fs (%.2f pages/s)",
+        summary.converted,
+        summary.already_converted,
+        summary.failed,
+        summary.raw_deleted,
+        summary.elapsed_s,
+        summary.pages_per_s,
+    )
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        description="Stream .jp2 scans from Google Drive straight into JPG/PNG conversion.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument(
+        "--raw",
+        type=Path,
+        default=Path("data/raw"),
+        help="Download directory for .jp2 files and the manifest.",
+    )
+    p.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/processed"),
+        help="Output directory for converted .jpg / .png files.",
+    )
+    p.add_argument(
+        "--folder-id", default=None, help="Drive folder to crawl (default: the KB archive folder)."
+    )
+    p.add_argument("--max-files", type=int, default=None, help="Stop after this many .jp2 files.")
+    p.add_argument(
+        "--download-workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent download threads.",
+    )
+    p.add_argument(
+        "--convert-workers",
+        type=int,
+        default=None,
+        help="Conversion processes (default: all cores).",
+    )
+    p.add_argument(
+        "--max-pending-raw",
+        type=int,
+        default=None,
+        help="Cap on downloaded-but-unconverted files (default: 2 × convert workers).",
+    )
+    p.add_argument(
+        "--no-png",
+        action="store_true",
+        help="Skip the full-res PNG and use reduced-resolution JP2 decoding.",
+    )
+    p.add_argument(
+        "--delete-raw",
+        action="store_true",
+        help="Delete each .jp2 after its conversion has been verified.",
+    )
+    p.add_argument("--verbose", action="store_true", help="Enable DEBUG logging.")
+    return p
+
+
+if __name__ == "__main__":
+    from newspapers.data.drive import GoogleDriveClient
+    from newspapers.data.ingest import TARGET_FOLDER_ID, get_drive_credentials
+
+    args = _build_parser().parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s – %(message)s",
+    )
+
+    result = stream_ingest(
+        GoogleDriveClient(get_drive_credentials()),
+        args.folder_id or TARGET_FOLDER_ID,
+        args.raw,
+        args.output,
+        download_workers=args.download_workers,
+        convert_workers=args.convert_workers,
+        max_pending_raw=args.max_pending_raw,
+        max_files=args.max_files,
+        write_png=not args.no_png,
+        delete_raw=args.delete_raw,
+    )
+    print(
+        f"Converted {result.converted} page(s) "
+        f"({result.already_converted} already done, {result.failed} failed, "
+        f"{result.raw_deleted} raw files deleted) in {result.elapsed_s:.1f}s"
+    )
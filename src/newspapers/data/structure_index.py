@@ -0,0 +1,168 @@
+"""Persistent SQLite index of page layouts (skew, columns, strip geometry).
+
+Structure analysis is deterministic for a given page and set of parameters,
+so its geometric result is recorded once per
+``artifact_key("structure", page, params, STRUCTURE_VERSION)`` and looked up
+by every later stage instead of re-running skew and column detection::
+
+    index = StructureIndex()
+    layout = index.get(key)          # PageLayout | None
+    if layout is None:
+        ...analyse...
+        index.put(key, layout)
+
+Only geometry lives here — no pixels — so the index stays small (a few KB
+per page) and can be shared between processes.  Strip images are either
+rebuilt in memory from :attr:`PageLayout.strips` or fetched from the
+artifact store.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+#: Default location of the index database.
+STRUCTURE_INDEX_PATH = Path("data") / "interim" / "structure_index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_layout (
+    key           TEXT PRIMARY KEY,
+    digest        TEXT NOT NULL,
+    page          TEXT NOT NULL,
+    params        TEXT NOT NULL,
+    width         INTEGER NOT NULL,
+    height        INTEGER NOT NULL,
+    skew_angle    REAL NOT NULL,
+    column_bounds TEXT NOT NULL,
+    rules         TEXT NOT NULL,
+    strips        TEXT NOT NULL,
+    profile       BLOB NOT NULL,
+    created_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS page_layout_digest ON page_layout (digest);
+"""
+
+
+@dataclass
+class PageLayout:
+    """Geometric result of structure analysis for one page."""
+
+    digest: str
+    """SHA-256 of the page file."""
+
+    page: str
+    """Page filename (informational; lookups go by key)."""
+
+    width: int
+    """Width of the analysed page — the deskewed canvas if skew was corrected."""
+
+    height: int
+    skew_angle: float
+    column_bounds: list[int]
+    rules: list[int]
+    """Printed vertical rule x-positions."""
+
+    strips: list[dict[str, Any]]
+    """Strip geometry: ``strip_id``, offsets, sizes, column index/count."""
+
+    profile: np.ndarray = field(repr=False)
+    """Full-width smoothed projection profile (float32)."""
+
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+class StructureIndex:
+    """SQLite-backed mapping from structure keys to :class:`PageLayout`.
+
+    A short-lived connection is opened per call, so one instance can be used
+    from several threads and several processes can share the file.
+    """
+
+    def __init__(self, path: Path = STRUCTURE_INDEX_PATH) -> None:
+        self.path = path
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._ready = True
+        return conn
+
+    def get(self, key: str) -> PageLayout | None:
+        """Return the layout stored under *key*, or ``None``."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT digest, page, params, width, height, skew_angle, column_bounds, "
+                "rules, strips, profile FROM page_layout WHERE key = ?",
+                (key,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        digest, page, params, width, height, skew, bounds, rules, strips, profile = row
+        logger.debug("structure index hit: %s (%s)", page, key)
+        return PageLayout(
+            digest=digest,
+            page=page,
+            width=width,
+            height=height,
+            skew_angle=skew,
+            column_bounds=json.loads(bounds),
+            rules=json.loads(rules),
+            strips=json.loads(strips),
+            profile=np.frombuffer(profile, dtype=np.float32).copy(),
+            params=json.loads(params),
+        )
+
+    def put(self, key: str, layout: PageLayout) -> None:
+        """Insert or replace the layout for *key*."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO page_layout"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        layout.digest,
+                        layout.page,
+                        json.dumps(layout.params, sort_keys=True),
+                        int(layout.width),
+                        int(layout.height),
+                        float(layout.skew_angle),
+                        json.dumps([int(x) for x in layout.column_bounds]),
+                        json.dumps([int(x) for x in layout.rules]),
+                        json.dumps(layout.strips),
+                        np.ascontiguousarray(layout.profile, dtype=np.float32).tobytes(),
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM page_layout").fetchone()[0]
+        finally:
+            conn.close()
+
+
+#: Process-wide default index.
+default_index = StructureIndex()
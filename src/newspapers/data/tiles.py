@@ -0,0 +1,250 @@
+"""Tiled, multi-resolution page storage.
+
+A full-resolution newspaper page (4 000 × 6 000 px or larger) is stored as a
+directory of fixed-size PNG tiles at several power-of-two resolution levels::
+
+    page.tiles/
+        meta.json            # size, mode, tile size, level dimensions
+        L0/r0000_c0000.png   # full resolution
+        L1/r0000_c0000.png   # 1/2 resolution
+        ...
+
+:class:`TiledPage` decodes only the tiles intersecting a requested box, at
+the coarsest level that still satisfies the requested scale, so a column
+strip, an advertisement crop or a page thumbnail no longer pays for a
+full-page decode.
+
+The ``.tiles`` directory sits next to the page PNG (``page.png`` →
+``page.tiles``); use :func:`tiles_path` / :func:`open_tiled` to find it.
+The metadata records the size and mtime of the PNG the tiles were made
+with, so tiles left over from an earlier conversion of a page are ignored.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from pathlib import Path
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+#: Edge length of each square tile in pixels.
+DEFAULT_TILE_SIZE: int = 512
+
+#: PNG zlib level for tiles.  Tiles are written once per page and read many
+#: times, so fast compression is preferred over the smallest files.
+DEFAULT_TILE_COMPRESS_LEVEL: int = 1
+
+#: Pyramid metadata file inside every ``.tiles`` directory.
+META_NAME = "meta.json"
+
+
+def tiles_path(image_path: Path) -> Path:
+    """Return the ``.tiles`` directory path that belongs to *image_path*."""
+    return image_path.with_suffix(".tiles")
+
+
+def _tile_name(row: int, col: int) -> str:
+    return f"r{row:04d}_c{col:04d}.png"
+
+
+def _source_stamp(path: Path) -> dict[str, int]:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def record_source(output_path: Path, source: Path) -> None:
+    """Record *source* (the page PNG) as the image the tiles at *output_path* show."""
+    meta_path = output_path / META_NAME
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["source"] = _source_stamp(source)
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def write_tiled_page(
+    image: Image.Image | Path,
+    output_path: Path,
+    *,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    compress_level: int = DEFAULT_TILE_COMPRESS_LEVEL,
+    source: Path | None = None,
+) -> Path:
+    """Write *image* as a tiled pyramid under *output_path*.
+
+    Levels are added (each half the size of the previous) until the whole
+    page fits into a single tile.
+
+    Parameters
+    ----------
+    image:
+        A PIL image or a path to one.
+    output_path:
+        Target ``.tiles`` directory (created; existing tiles are overwritten).
+    tile_size:
+        Tile edge length in pixels.
+    compress_level:
+        PNG compression level for the tiles (0–9).
+    source:
+        The page PNG the tiles belong to; defaults to *image* when it is a
+        path.  Its size and mtime are recorded so :func:`open_tiled` can
+        tell when the PNG has been rewritten since.
+
+    Returns
+    -------
+    Path
+        *output_path*.
+    """
+    if isinstance(image, Path):
+        source = source or image
+        with Image.open(image) as src:
+            level_img = src.convert("RGB") if src.mode not in ("L", "RGB") else src.copy()
+    else:
+        level_img = image if image.mode in ("L", "RGB") else image.convert("RGB")
+
+    width, height = level_img.size
+    levels: list[dict[str, int]] = []
+    level = 0
+    while True:
+        lw, lh = level_img.size
+        level_dir = output_path / f"L{level}"
+        level_dir.mkdir(parents=True, exist_ok=True)
+        for row in range(math.ceil(lh / tile_size)):
+            for col in range(math.ceil(lw / tile_size)):
+                box = (
+                    col * tile_size,
+                    row * tile_size,
+                    min(lw, (col + 1) * tile_size),
+                    min(lh, (row + 1) * tile_size),
+                )
+                level_img.crop(box).save(
+                    level_dir / _tile_name(row, col), format="PNG", compress_level=compress_level
+                )
+        levels.append({"factor": 1 << level, "width": lw, "height": lh})
+        if max(lw, lh) <= tile_size:
+            break
+        level_img = level_img.reduce(2)
+        level += 1
+
+    meta = {
+        "width": width,
+        "height": height,
+        "mode": level_img.mode,
+        "tile_size": tile_size,
+        "levels": levels,
+        "source": _source_stamp(source) if source is not None else None,
+    }
+    (output_path / META_NAME).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    logger.info(
+        "Wrote tiled page %s (%dx%d, %d levels)", output_path.name, width, height, len(levels)
+    )
+    return output_path
+
+
+class TiledPage:
+    """Read-only access to a page written by :func:`write_tiled_page`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        meta = json.loads((path / META_NAME).read_text(encoding="utf-8"))
+        self.width: int = meta["width"]
+        self.height: int = meta["height"]
+        self.mode: str = meta["mode"]
+        self.tile_size: int = meta["tile_size"]
+        self.levels: list[dict[str, int]] = meta["levels"]
+        self.source: dict[str, int] | None = meta.get("source")
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Full-resolution ``(width, height)``."""
+        return self.width, self.height
+
+    def _level_for_scale(self, scale: float) -> int:
+        """Coarsest level whose resolution is still ≥ *scale* × full resolution."""
+        if scale >= 1.0:
+            return 0
+        level = int(math.floor(math.log2(1.0 / scale) + 1e-9))
+        return min(level, len(self.levels) - 1)
+
+    def read_region(
+        self,
+        box: tuple[int, int, int, int] | None = None,
+        *,
+        scale: float = 1.0,
+    ) -> Image.Image:
+        """Decode the region *box* of the page at *scale*.
+
+        Parameters
+        ----------
+        box:
+            ``(x0, y0, x1, y1)`` in full-resolution pixels.  ``None`` means
+            the whole page.  Clamped to the page bounds.
+        scale:
+            Output scale relative to full resolution (``0.25`` → a quarter
+            of the size in each dimension).
+
+        Returns
+        -------
+        PIL.Image.Image
+            Image of size ``round((x1 - x0) * scale) × round((y1 - y0) * scale)``.
+        """
+        x0, y0, x1, y1 = box if box is not None else (0, 0, self.width, self.height)
+        x0, x1 = max(0, x0), min(self.width, x1)
+        y0, y1 = max(0, y0), min(self.height, y1)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError(f"Empty region {box} for page of size {self.size}")
+        out_size = (max(1, round((x1 - x0) * scale)), max(1, round((y1 - y0) * scale)))
+
+        level = self._level_for_scale(scale)
+        info = self.levels[level]
+        f = info["factor"]
+        lx0, ly0 = x0 // f, y0 // f
+        lx1 = min(info["width"], math.ceil(x1 / f))
+        ly1 = min(info["height"], math.ceil(y1 / f))
+
+        ts = self.tile_size
+        canvas = Image.new(self.mode, (lx1 - lx0, ly1 - ly0))
+        level_dir = self.path / f"L{level}"
+        for row in range(ly0 // ts, (ly1 - 1) // ts + 1):
+            for col in range(lx0 // ts, (lx1 - 1) // ts + 1):
+                tx0, ty0 = col * ts, row * ts
+                with Image.open(level_dir / _tile_name(row, col)) as tile:
+                    part = tile.crop(
+                        (
+                            max(lx0, tx0) - tx0,
+                            max(ly0, ty0) - ty0,
+                            min(lx1, tx0 + tile.width) - tx0,
+                            min(ly1, ty0 + tile.height) - ty0,
+                        )
+                    )
+                canvas.paste(part, (max(lx0, tx0) - lx0, max(ly0, ty0) - ly0))
+
+        if canvas.size != out_size:
+            canvas = canvas.resize(out_size, Image.LANCZOS)
+        return canvas
+
+    def thumbnail(self, max_size: int) -> Image.Image:
+        """Whole page scaled so its longest side is at most *max_size*."""
+        scale = min(1.0, max_size / max(self.width, self.height))
+        return self.read_region(scale=scale)
+
+
+def open_tiled(image_path: Path) -> TiledPage | None:
+    """Return the :class:`TiledPage` stored alongside *image_path*, if any.
+
+    ``None`` as well when *image_path* exists but is not the file the tiles
+    were made from (e.g. the page was converted again without tiles), so
+    callers fall back to the PNG instead of cropping stale tiles.
+    """
+    if image_path.suffix == ".tiles":
+        return TiledPage(image_path) if (image_path / META_NAME).exists() else None
+    path = tiles_path(image_path)
+    if not (path / META_NAME).exists():
+        return None
+    tiled = TiledPage(path)
+    if image_path.exists() and tiled.source != _source_stamp(image_path):
+        logger.debug("Ignoring stale tiles %s (%s has changed)", path.name, image_path.name)
+        return None
+    return tiled
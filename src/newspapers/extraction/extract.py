@@ -36,11 +36,11 @@ def _load_dotenv() -> None:
 _load_dotenv()
 
 # Note: The new dependencies. google-genai and langextract
-from google import genai
 from google.genai import types
 from PIL import Image
 import langextract as lx
 
+from newspapers.gemini import gemini_clients
 from newspapers.models import JobAdvertisement
 
 logger = logging.getLogger(__name__)
@@ -71,17 +71,10 @@ def transcribe_advertisement_image(
     model_name: str = "gemini-2.5-flash",
 ) -> str:
     """Uses Vision LLM to perform zero-shot exact transcription (Hybrid OCR)."""
-    # Assuming API Key is set in environment: GEMINI_API_KEY
-    client = genai.Client()
     img = Image.open(image_path)
     
-    response = client.models.generate_content(
-        model=model_name,
-        contents=[
-            img,
-            TRANSCRIPTION_PROMPT
-        ]
-    )
+    # Shared client: keeps its connections alive across transcriptions
+    response = gemini_clients.generate(model_name, [img, TRANSCRIPTION_PROMPT])
     
     text = response.text or ""
     logger.info("Transcribed %s (%d characters)", image_path.name, len(text))
@@ -0,0 +1,735 @@
+"""Process-wide Gemini client shared by annotation, extraction and OCR.
+
+Building a ``google.genai.Client`` reads the environment and opens a fresh
+HTTP connection pool, so creating one per request paid a TLS handshake on
+every call.  :class:`GeminiClients` builds each client once, on first use,
+and hands the same instance to every caller — its keep-alive connections
+are reused across requests and threads::
+
+    from newspapers.gemini import gemini_clients
+
+    response = gemini_clients.generate(
+        "gemini-2.5-flash",
+        [image, prompt],
+        config=gemini_clients.config("gemini-2.5-flash", response_schema=MySchema),
+    )
+
+Clients are cached per API key and request configs per model and response
+schema.  The async interface of the same client (and connection pool) is
+``gemini_clients.client(model).aio``.
+
+Every :meth:`GeminiClients.generate` call also goes through the shared
+request-execution layer, per model and API key:
+
+- a :class:`TokenBucket` paces requests to the configured requests/minute;
+- transient failures (429, 5xx, dropped connections) are retried with
+  jittered exponential backoff, waiting at least as long as the server's
+  ``Retry-After`` / ``RetryInfo`` hint — a 429 hint pauses the whole bucket,
+  so concurrent callers back off together instead of piling on;
+- a :class:`CircuitBreaker` fails new requests fast with
+  :class:`CircuitOpenError` once several requests in a row have used up
+  their retries on 5xx / connection errors, then lets a single trial call
+  through.  429s only pause the bucket and never trip the breaker, and a
+  request that is already retrying waits out an open circuit rather than
+  failing.
+
+When several API keys (projects) are configured, a :class:`KeyPool` spreads
+requests across them — each key has its own bucket and breaker, so quotas
+add up — and steers traffic away from keys that are throttled or failing;
+a retry after a 429 goes to another key when one is available.
+
+Most callers should use the process-wide :data:`gemini_clients` instance.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+#: Environment variables holding an API key, in order of preference, for
+#: Pro models and for everything else.  Every key found is used.
+PRO_KEY_VARS: tuple[str, ...] = ("GEMINI_PRO_API_KEY", "GEMINI_API_KEY")
+FLASH_KEY_VARS: tuple[str, ...] = ("GEMINI_FLASH_API_KEY", "GEMINI_PRO_API_KEY", "GEMINI_API_KEY")
+
+#: Optional comma-separated list of further API keys usable for any model.
+EXTRA_KEYS_VAR: str = "GEMINI_API_KEYS"
+
+#: Seconds a key is avoided after a 429 that carried no retry hint.
+KEY_COOLDOWN: float = 30.0
+
+#: Requests per minute allowed per API key, keyed by model name or by a
+#: substring of it.  Models that match nothing are not paced.
+GEMINI_RATE_LIMITS: dict[str, float] = {"flash": 1000.0, "pro": 150.0}
+
+#: HTTP status codes worth retrying.
+TRANSIENT_STATUS: frozenset[int] = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_pro_model(model: str) -> bool:
+    """``True`` for Gemini Pro models (which keep their default thinking budget)."""
+    return "pro" in model.lower()
+
+
+def load_dotenv(dotenv_path: Path | None = None) -> None:
+    """Load API keys from the nearest ``.env`` without overriding the environment.
+
+    Tries ``python-dotenv`` first; falls back to a simple ``KEY=value``
+    parser so the project has no hard dependency on that package.
+    """
+    candidates = (
+        [dotenv_path]
+        if dotenv_path
+        else [Path(".env"), *[p / ".env" for p in Path(__file__).parents]]
+    )
+    for candidate in candidates:
+        if not candidate.exists():
+            continue
+        try:
+            from dotenv import load_dotenv as _load  # type: ignore[import-not-found]
+        except ImportError:
+            for line in candidate.read_text(encoding="utf-8").splitlines():
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                key, _, val = line.partition("=")
+                os.environ.setdefault(key.strip(), val.strip().strip('"').strip("'"))
+        else:
+            _load(candidate, override=False)
+        return
+
+
+# ---------------------------------------------------------------------------
+# Request execution: pacing, retries, circuit breaking
+# ---------------------------------------------------------------------------
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Gemini while a model/key circuit is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Jittered exponential backoff for transient Gemini failures."""
+
+    max_attempts: int = 6
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def delay(self, attempt: int, hint: float | None = None) -> float:
+        """Seconds to wait before retry *attempt* (1-based).
+
+        "Full jitter": uniform in ``[0, base · 2^(attempt-1)]``, capped at
+        *max_delay*, but never shorter than the server's *hint*.
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        return max(backoff, hint or 0.0)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: *rate* requests per minute, bursts up to *burst*."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate / 60.0
+        self.capacity = max(1.0, burst if burst is not None else rate / 60.0)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token (possibly in the future); return how long to wait for it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for *seconds* (e.g. a server ``Retry-After``)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class CircuitBreaker:
+    """Open after *failure_threshold* consecutive recorded failures.
+
+    While open, calls fail immediately; after *reset_timeout* seconds one
+    trial call is let through (half-open) and its outcome closes or
+    re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allows_call(self) -> bool:
+        """Whether :meth:`before_call` would currently let a call through."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            expired = self._clock() - self._opened_at >= self.reset_timeout
+            return expired and not self._trial_running
+
+    def remaining(self) -> float:
+        """Seconds until the circuit half-opens (0 when closed or half-open)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def before_call(self, name: str) -> bool:
+        """Raise :class:`CircuitOpenError` unless a call may go ahead.
+
+        Returns ``True`` if the call is the half-open trial, whose outcome
+        must be reported (:meth:`record_success`, :meth:`record_failure` or
+        :meth:`release_trial`).
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self.reset_timeout - (self._clock() - self._opened_at)
+            if remaining <= 0 and not self._trial_running:
+                self._trial_running = True
+                return True
+        raise CircuitOpenError(
+            f"{name}: circuit open after repeated failures; retry in {max(remaining, 0):.0f}s"
+        )
+
+    def release_trial(self) -> None:
+        """Let another caller make the trial call (the trial was inconclusive)."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("Gemini circuit opened after %d failures", self._failures)
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+
+def status_code(exc: BaseException) -> int | None:
+    """HTTP status of a ``google.genai`` / ``httpx`` error, if it carries one."""
+    for attr in ("code", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_transient(exc: BaseException) -> bool:
+    """``True`` for failures worth retrying: throttling, 5xx, timeouts, dropped connections."""
+    code = status_code(exc)
+    if code is not None:
+        return code in TRANSIENT_STATUS
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    # httpx transport errors (ConnectError, ReadTimeout, RemoteProtocolError, …)
+    return any(cls.__name__ == "TransportError" for cls in type(exc).__mro__)
+
+
+_RETRY_DELAY_RE = re.compile(r"retry(?:Delay'?:\s*'| in )(\d+(?:\.\d+)?)s", re.IGNORECASE)
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Server-suggested wait in seconds: ``Retry-After`` header or ``RetryInfo.retryDelay``."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value is not None:
+            return float(value)
+    except (AttributeError, TypeError, ValueError):
+        pass
+    details = getattr(exc, "details", None)
+    if isinstance(details, Mapping):
+        for item in details.get("error", {}).get("details", []) or []:
+            delay = item.get("retryDelay") if isinstance(item, Mapping) else None
+            if isinstance(delay, str) and delay.endswith("s"):
+                try:
+                    return float(delay[:-1])
+                except ValueError:
+                    pass
+    match = _RETRY_DELAY_RE.search(str(exc))
+    return float(match.group(1)) if match else None
+
+
+# ---------------------------------------------------------------------------
+# API key pool
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class KeyStats:
+    """Usage and health of one API key for one model.
+
+    Gemini quotas are per model on each key, so a key throttled for Pro
+    may still have Flash quota; everything here is tracked per
+    ``(model, key)``, like the buckets and breakers.
+    """
+
+    requests: int = 0
+    errors: int = 0
+    """Transient failures (throttling, 5xx, dropped connections)."""
+
+    throttled: int = 0
+    """429 responses."""
+
+    in_flight: int = 0
+    error_rate: float = 0.0
+    """Exponentially weighted share of recent requests that failed."""
+
+    cooldown_until: float = 0.0
+    recent: deque[float] = field(default_factory=deque, repr=False)
+    """Start times of requests in the last minute."""
+
+    def per_minute(self, now: float) -> int:
+        while self.recent and now - self.recent[0] > 60.0:
+            self.recent.popleft()
+        return len(self.recent)
+
+
+def _mask(key: str) -> str:
+    return f"…{key[-4:]}" if len(key) > 4 else "…"
+
+
+class KeyPool:
+    """Spread Gemini requests over several API keys.
+
+    Each request goes to the usable key with the fewest requests to the
+    same model in flight, then the lowest recent error rate for that model,
+    then the lowest usage of that model over the last minute — so traffic
+    is balanced in quiet periods and drains away from keys that are
+    throttled (cooling down after a 429) or failing for that model, while
+    other models keep using them.
+
+    Parameters
+    ----------
+    keys:
+        Keys for Pro models and for all other models (``{"pro": [...],
+        "flash": [...]}``), in order of preference.
+    """
+
+    #: Weight of the latest outcome in :attr:`KeyStats.error_rate`.
+    ERROR_RATE_ALPHA = 0.2
+
+    def __init__(
+        self,
+        keys: Mapping[str, Sequence[str]],
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._keys = {family: list(dict.fromkeys(k)) for family, k in keys.items()}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index = {
+            key: i
+            for i, key in enumerate(
+                dict.fromkeys(key for ks in self._keys.values() for key in ks), 1
+            )
+        }
+        self._stats: dict[tuple[str, str], KeyStats] = {}
+
+    @classmethod
+    def from_env(cls) -> KeyPool:
+        """Build from :data:`PRO_KEY_VARS`, :data:`FLASH_KEY_VARS` and :data:`EXTRA_KEYS_VAR`."""
+        extra = [k.strip() for k in os.environ.get(EXTRA_KEYS_VAR, "").split(",") if k.strip()]
+
+        def _keys(names: tuple[str, ...]) -> list[str]:
+            return [os.environ[n] for n in names if os.environ.get(n)] + extra
+
+        pool = cls({"pro": _keys(PRO_KEY_VARS), "flash": _keys(FLASH_KEY_VARS)})
+        logger.debug("Gemini key pool: %d key(s)", len(pool._index))
+        return pool
+
+    def keys_for(self, model: str) -> list[str]:
+        return self._keys.get("pro" if is_pro_model(model) else "flash", [])
+
+    def _get(self, model: str, key: str) -> KeyStats:
+        st = self._stats.get((model, key))
+        if st is None:
+            st = self._stats[(model, key)] = KeyStats()
+        return st
+
+    def choose(self, model: str, *, avoid: Iterable[str] = ()) -> str | None:
+        """Key for the next request to *model*; keys in *avoid* only as a last resort.
+
+        ``None`` when no key is configured (the SDK then does its own lookup).
+        """
+        keys = self.keys_for(model)
+        if not keys:
+            return None
+        avoid = set(avoid)
+        now = self._clock()
+        with self._lock:
+
+            def _score(item: tuple[int, str]) -> tuple:
+                rank, key = item
+                st = self._get(model, key)
+                return (
+                    key in avoid,
+                    st.cooldown_until > now,
+                    st.in_flight,
+                    round(st.error_rate, 1),
+                    st.per_minute(now),
+                    rank,
+                )
+
+            return min(enumerate(keys), key=_score)[1]
+
+    def started(self, model: str, key: str | None) -> None:
+        if key is None:
+            return
+        with self._lock:
+            st = self._get(model, key)
+            st.requests += 1
+            st.in_flight += 1
+            st.recent.append(self._clock())
+
+    def finished(
+        self,
+        model: str,
+        key: str | None,
+        *,
+        error: bool = False,
+        throttled: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        """Record the outcome of a request started with :meth:`started`."""
+        if key is None:
+            return
+        with self._lock:
+            st = self._get(model, key)
+            st.in_flight -= 1
+            st.errors += error
+            st.error_rate += self.ERROR_RATE_ALPHA * (float(error) - st.error_rate)
+            if throttled:
+                st.throttled += 1
+                cooldown = retry_after if retry_after is not None else KEY_COOLDOWN
+                st.cooldown_until = max(st.cooldown_until, self._clock() + cooldown)
+
+    def stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Usage per key and model, keyed by position and masked key (``"1:…abcd"``)."""
+        now = self._clock()
+        with self._lock:
+            out: dict[str, dict[str, dict[str, float]]] = {
+                f"{i}:{_mask(key)}": {} for key, i in self._index.items()
+            }
+            for (model, key), st in sorted(self._stats.items()):
+                if not st.requests:
+                    continue
+                out[f"{self._index[key]}:{_mask(key)}"][model] = {
+                    "requests": st.requests,
+                    "errors": st.errors,
+                    "throttled": st.throttled,
+                    "per_minute": st.per_minute(now),
+                    "error_rate": round(st.error_rate, 3),
+                    "cooling_down": st.cooldown_until > now,
+                }
+            return out
+
+
+def _genai_client(api_key: str | None) -> Any:
+    try:
+        from google import genai  # noqa: PLC0415
+    except ImportError as exc:
+        raise ImportError(
+            "google-genai is required. Install with: uv pip install google-genai"
+        ) from exc
+    return genai.Client(api_key=api_key)
+
+
+class GeminiClients:
+    """Lazily built ``genai.Client`` instances, one per API key, shared by all threads.
+
+    Parameters
+    ----------
+    client_factory:
+        Builds a client for an API key (``None`` = the SDK's own lookup).
+        Defaults to ``google.genai.Client``.
+    rate_limits:
+        Requests per minute per API key by model (name or substring);
+        defaults to :data:`GEMINI_RATE_LIMITS`.
+    retry:
+        Backoff policy for transient failures.
+    failure_threshold, reset_timeout:
+        Circuit-breaker settings (see :class:`CircuitBreaker`); the breaker
+        counts requests that ran out of retries.  *failure_threshold* must
+        exceed ``retry.max_attempts``.
+    sleep, clock:
+        Used for backoff and pacing waits (replaceable in tests).
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[str | None], Any] | None = None,
+        *,
+        rate_limits: Mapping[str, float] | None = None,
+        retry: RetryPolicy = RetryPolicy(),
+        failure_threshold: int = 8,
+        reset_timeout: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold <= retry.max_attempts:
+            raise ValueError(
+                f"failure_threshold ({failure_threshold}) must exceed "
+                f"retry.max_attempts ({retry.max_attempts})"
+            )
+        self._factory = client_factory or _genai_client
+        self._lock = threading.Lock()
+        self._clients: dict[str | None, Any] = {}
+        self._configs: dict[tuple[str, type[BaseModel] | None], Any] = {}
+        self._env_loaded = False
+        self.rate_limits = dict(GEMINI_RATE_LIMITS if rate_limits is None else rate_limits)
+        self.retry = retry
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._sleep = sleep
+        self._clock = clock
+        self._buckets: dict[tuple[str, str | None], TokenBucket | None] = {}
+        self._breakers: dict[tuple[str, str | None], CircuitBreaker] = {}
+        self._pool: KeyPool | None = None
+
+    @property
+    def keys(self) -> KeyPool:
+        """The API key pool, read from the environment (and ``.env``) on first use."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if not self._env_loaded:
+                        load_dotenv()
+                        self._env_loaded = True
+                    self._pool = KeyPool.from_env()
+        return self._pool
+
+    def api_key(self, model: str) -> str | None:
+        """API key the next request to *model* would use (see :class:`KeyPool`)."""
+        return self.keys.choose(model, avoid=self._open_circuits(model))
+
+    def key_stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Usage and error counts per key and model (see :meth:`KeyPool.stats`)."""
+        return self.keys.stats()
+
+    def client(self, model: str) -> Any:
+        """A shared client for *model* (on its currently preferred key)."""
+        return self._client_for(self.api_key(model))
+
+    def _client_for(self, key: str | None) -> Any:
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = self._factory(key)
+                    logger.debug("Created Gemini client (%d cached)", len(self._clients))
+        return client
+
+    def config(self, model: str, *, response_schema: type[BaseModel] | None = None) -> Any:
+        """Cached ``GenerateContentConfig`` for *model*.
+
+        Thinking is switched off for non-Pro models; with *response_schema*
+        the response is constrained to that model's JSON schema.
+        """
+        cache_key = (model, response_schema)
+        cfg = self._configs.get(cache_key)
+        if cfg is None:
+            from google.genai import types  # noqa: PLC0415
+
+            kwargs: dict[str, Any] = {}
+            if response_schema is not None:
+                kwargs["response_mime_type"] = "application/json"
+                kwargs["response_json_schema"] = response_schema.model_json_schema()
+            if not is_pro_model(model):
+                kwargs["thinking_config"] = types.ThinkingConfig(thinking_budget=0)
+            cfg = self._configs.setdefault(cache_key, types.GenerateContentConfig(**kwargs))
+        return cfg
+
+    def rate_limit(self, model: str) -> float | None:
+        """Requests/minute for *model*: exact name first, then the first matching substring."""
+        if model in self.rate_limits:
+            return self.rate_limits[model]
+        lowered = model.lower()
+        return next(
+            (rate for key, rate in self.rate_limits.items() if key.lower() in lowered), None
+        )
+
+    def _open_circuits(self, model: str) -> list[str]:
+        with self._lock:
+            return [
+                key
+                for (m, key), breaker in self._breakers.items()
+                if m == model and key is not None and not breaker.allows_call()
+            ]
+
+    def _route(self, model: str, key: str | None) -> tuple[TokenBucket | None, CircuitBreaker]:
+        route = (model, key)
+        with self._lock:
+            if route not in self._breakers:
+                rate = self.rate_limit(model)
+                self._buckets[route] = (
+                    TokenBucket(rate, clock=self._clock, sleep=self._sleep) if rate else None
+                )
+                self._breakers[route] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, clock=self._clock
+                )
+            return self._buckets[route], self._breakers[route]
+
+    def generate(
+        self,
+        model: str,
+        contents: Sequence[Any],
+        *,
+        config: Any = None,
+        slot: Callable[[], AbstractContextManager[Any]] | None = None,
+    ) -> Any:
+        """``models.generate_content`` on the shared client for *model*.
+
+        Paced, retried and circuit-broken as described in the module
+        docstring; non-transient errors (bad request, auth) raise at once.
+        *slot*, if given, is entered around each attempt only — e.g. a
+        concurrency limit that should not stay taken during backoff.
+        """
+        contents = list(contents)
+        attempt = 0
+        while True:
+            attempt += 1
+            key = self.api_key(model)
+            client = self._client_for(key)
+            bucket, breaker = self._route(model, key)
+            trial = self._before_call(model, breaker, retrying=attempt > 1)
+            if bucket is not None:
+                bucket.acquire()
+            self.keys.started(model, key)
+            try:
+                with slot() if slot is not None else nullcontext():
+                    response = client.models.generate_content(
+                        model=model, contents=contents, config=config
+                    )
+            except Exception as exc:
+                transient = is_transient(exc)
+                throttled = status_code(exc) == 429
+                hint = retry_after(exc) if transient else None
+                self.keys.finished(
+                    model, key, error=transient, throttled=throttled, retry_after=hint
+                )
+                if not transient:
+                    breaker.record_success()  # the service answered; don't trip
+                    raise
+                if throttled:
+                    # Pacing handles quota; a 429 says nothing about the service's health.
+                    if trial:
+                        breaker.release_trial()
+                    if hint is not None and bucket is not None:
+                        bucket.pause(hint)
+                elif trial or attempt >= self.retry.max_attempts:
+                    # One failure per request that ran out of retries (or failed the trial).
+                    breaker.record_failure()
+                if attempt >= self.retry.max_attempts:
+                    raise
+                # Another healthy key can be tried without waiting out this one's hint.
+                switching = self.api_key(model) != key
+                delay = self.retry.delay(attempt, None if switching else hint)
+                logger.warning(
+                    "%s: transient error (%s) on key %s; retry %d/%d in %.1fs%s",
+                    model,
+                    status_code(exc) or type(exc).__name__,
+                    _mask(key) if key else "(default)",
+                    attempt,
+                    self.retry.max_attempts - 1,
+                    delay,
+                    " on another key" if switching else "",
+                )
+                self._sleep(delay)
+            else:
+                self.keys.finished(model, key)
+                breaker.record_success()
+                return response
+
+    def _before_call(self, model: str, breaker: CircuitBreaker, *, retrying: bool) -> bool:
+        """:meth:`CircuitBreaker.before_call`, waiting out an open circuit when *retrying*.
+
+        New requests fail fast; a request that is already retrying has paid
+        for its place and sleeps until the circuit lets it through.
+        """
+        while True:
+            try:
+                return breaker.before_call(model)
+            except CircuitOpenError:
+                if not retrying:
+                    raise
+                self._sleep(breaker.remaining() or self.retry.base_delay)
+
+    def reset(self) -> None:
+        """Drop cached clients, configs, rate buckets and circuit state."""
+        with self._lock:
+            self._clients.clear()
+            self._configs.clear()
+            self._buckets.clear()
+            self._breakers.clear()
+            self._pool = None
+            self._env_loaded = False
+
+
+#: Process-wide client manager.
+gemini_clients = GeminiClients()
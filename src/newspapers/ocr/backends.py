@@ -21,6 +21,8 @@ from pathlib import Path
 
 from PIL import Image
 
+from newspapers.gemini import gemini_clients
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -89,28 +91,14 @@ class GeminiOCR(OCRBackend):
     def __init__(self, model_name: str = "gemini-2.5-flash") -> None:
         self.model_name = model_name
         self.name = f"Gemini ({model_name})"
-        _load_dotenv()
-
-        from google import genai  # noqa: PLC0415
-
-        api_key = (
-            os.environ.get("GEMINI_FLASH_API_KEY")
-            or os.environ.get("GEMINI_PRO_API_KEY")
-            or os.environ.get("GEMINI_API_KEY")
-        )
-        self._client = genai.Client(api_key=api_key)
+        # Fail early if google-genai is missing; the client itself is shared.
+        gemini_clients.client(model_name)
 
     def transcribe(self, image: Image.Image) -> str:
-        from google.genai import types  # noqa: PLC0415
-
-        _is_pro = "pro" in self.model_name.lower()
-        cfg = types.GenerateContentConfig(
-            **({} if _is_pro else {"thinking_config": types.ThinkingConfig(thinking_budget=0)}),
-        )
-        response = self._client.models.generate_content(
-            model=self.model_name,
-            contents=[image, TRANSCRIPTION_PROMPT],
-            config=cfg,
+        response = gemini_clients.generate(
+            self.model_name,
+            [image, TRANSCRIPTION_PROMPT],
+            config=gemini_clients.config(self.model_name),
         )
         text = response.text or ""
         logger.info("%s: transcribed %d chars", self.name, len(text))
@@ -212,9 +200,8 @@ def get_all_backends(
     _load_dotenv()
     backends: list[OCRBackend] = []
 
-    # Gemini (always available if GEMINI_API_KEY is set)
-    gemini_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GEMINI_FLASH_API_KEY")
-    if gemini_key:
+    # Gemini (always available if any Gemini API key is set)
+    if gemini_clients.keys.keys_for(gemini_model):
         backends.append(GeminiOCR(model_name=gemini_model))
     elif not skip_missing:
         raise EnvironmentError("GEMINI_API_KEY not set")
@@ -382,8 +369,7 @@ class EndpointManager:
         """Return OCR backends using the managed endpoints."""
         backends: list[OCRBackend] = []
 
-        gemini_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GEMINI_FLASH_API_KEY")
-        if gemini_key:
+        if gemini_clients.keys.keys_for(gemini_model):
             backends.append(GeminiOCR(model_name=gemini_model))
 
         hf_token = os.environ.get("HF_TOKEN")
@@ -1,5 +1,11 @@
 """Run OCR comparison across all pages and cache results.
 
+Transcriptions are cached in the artifact store (stage ``"ocr"``), keyed by
+the strip image's content, the backend name and the transcription prompt, so
+a re-segmented page or an edited prompt is transcribed afresh while
+unchanged strips cost nothing.  ``data/interim/ocr_comparison_<stem>.json``
+is rewritten after every page as a per-page summary for the notebooks.
+
 Usage::
 
     uv run python -m newspapers.ocr.run_comparison
@@ -17,9 +23,8 @@ import time
 from collections import defaultdict
 from pathlib import Path
 
-from PIL import Image
-
-from newspapers.ocr.backends import EndpointManager
+from newspapers.data.artifacts import ArtifactStore, artifact_key, default_store
+from newspapers.ocr.backends import TRANSCRIPTION_PROMPT, EndpointManager
 from newspapers.segmentation.structure import analyse_page_structure
 
 logging.basicConfig(
@@ -56,8 +61,11 @@ def run(
     pages: list[Path],
     strip_ids: list[str],
     backends,
+    *,
+    store: ArtifactStore | None = None,
 ) -> None:
     """Run OCR on all pages × strips × backends, caching results."""
+    store = store or default_store
     total_new = 0
 
     for page_path in pages:
@@ -71,7 +79,7 @@ def run(
         )
         logger.info("Page %s: %d strips, skew=%.2f°", stem, len(strips), skew)
 
-        # Load cache
+        # Per-page summary; earlier entries for strips not run now are kept
         cache_path = INTERIM / f"ocr_comparison_{stem}.json"
         if cache_path.exists():
             cached = json.loads(cache_path.read_text(encoding="utf-8"))
@@ -85,13 +93,25 @@ def run(
         run_strips = [s for s in strips if s.strip_id in strip_ids]
 
         page_new = 0
+        page_cached = 0
         for strip in run_strips:
-            img = Image.open(strip.image_path).convert("RGB")
+            img = None
             for backend in backends:
-                key = strip.strip_id
-                if key in results and backend.name in results[key]:
+                key = artifact_key(
+                    "ocr",
+                    inputs=[strip.image_path, TRANSCRIPTION_PROMPT],
+                    params={"backend": backend.name},
+                )
+                hit = store.lookup("ocr", key)
+                if hit is not None:
+                    results[strip.strip_id][backend.name] = (
+                        (hit / "text.txt").read_text(encoding="utf-8")
+                    )
+                    page_cached += 1
                     continue
 
+                if img is None:
+                    img = strip.image()
                 print(
                     f"  {stem} / {strip.strip_id} / {backend.name}...",
                     end=" ",
@@ -100,25 +120,40 @@ def run(
                 t0 = time.time()
                 try:
                     text = backend.transcribe(img)
-                    results[key][backend.name] = text
-                    elapsed = time.time() - t0
-                    print(f"{len(text)} chars in {elapsed:.1f}s")
                 except Exception as exc:
-                    results[key][backend.name] = f"[ERROR] {exc}"
+                    # Neither stored nor summarised: the next run retries it,
+                    # and an earlier good transcription in the summary stays
                     print(f"FAILED: {exc}")
+                    logger.warning(
+                        "%s / %s / %s failed: %s", stem, strip.strip_id, backend.name, exc
+                    )
+                    continue
+                else:
+                    results[strip.strip_id][backend.name] = text
+                    build_dir = store.prepare("ocr", key)
+                    try:
+                        (build_dir / "text.txt").write_text(text, encoding="utf-8")
+                        store.commit(
+                            "ocr", key, build_dir,
+                            params={"backend": backend.name, "strip_id": strip.strip_id},
+                            sources=[strip.image_path],
+                        )
+                    except BaseException:
+                        store.abort(build_dir)
+                        raise
+                    elapsed = time.time() - t0
+                    print(f"{len(text)} chars in {elapsed:.1f}s")
                 page_new += 1
 
-        # Save cache
-        if page_new:
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            cache_path.write_text(
-                json.dumps(dict(results), indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
+        # Save per-page summary
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps(dict(results), indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
         total_new += page_new
-        cached_count = sum(len(v) for v in results.values()) - page_new
         logger.info(
-            "  %s: %d new, %d cached", stem, page_new, cached_count
+            "  %s: %d new, %d cached", stem, page_new, page_cached
         )
 
     logger.info("Done! %d new transcriptions.", total_new)
@@ -7,7 +7,7 @@ Workflow
 3. Convert Gemini's [y_min, x_min, y_max, x_max] (0–1000 normalised space)
    → YOLO format: ``<class_id> <cx> <cy> <w> <h>`` (0–1 normalised).
 4. Write a ``.txt`` label file alongside the image.
-5. Save a PIL overlay visualisation PNG for human review.
+5. Save a downscaled overlay visualisation (WebP by default) for human review.
 
 Usage
 -----
@@ -35,65 +35,26 @@ import json
 import logging
 import os
 import shutil
-from collections import Counter
+import threading
+from collections import Counter, deque
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Annotated, Literal
 
+import cv2
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from pydantic import BaseModel, Field, RootModel
 
-
-def _load_dotenv(dotenv_path: Path | None = None) -> None:
-    """Load ``GEMINI_API_KEY`` (and any other vars) from a ``.env`` file.
-
-    Tries ``python-dotenv`` first; falls back to a simple line parser so the
-    project has no hard dependency on that package.
-    """
-    path = dotenv_path or Path(".env")
-    if not path.exists():
-        # Walk up to repo root in case cwd is a subdirectory
-        for parent in Path(__file__).parents:
-            candidate = parent / ".env"
-            if candidate.exists():
-                path = candidate
-                break
-        else:
-            return
-
-    try:
-        from dotenv import load_dotenv  # type: ignore[import-not-found]
-        load_dotenv(path, override=False)
-        return
-    except ImportError:
-        pass
-
-    # Minimal fallback parser (handles KEY=value and KEY="value")
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, _, val = line.partition("=")
-        key = key.strip()
-        val = val.strip().strip('"').strip("'")
-        os.environ.setdefault(key, val)
+from newspapers.gemini import gemini_clients
+from newspapers.segmentation.regions import CLASS_ID, CLASS_NAMES, RegionSet  # noqa: F401
+from newspapers.segmentation.structure import DEFAULT_ANALYSIS_WIDTH
 
 logger = logging.getLogger(__name__)
 
-# ---------------------------------------------------------------------------
-# Class taxonomy – must stay consistent with data/annotations/classes.txt
-#                  and data/annotations/dataset.yaml
-# ---------------------------------------------------------------------------
-CLASS_NAMES: list[str] = [
-    "job_advertisement",       # 0 – primary extraction target
-    "article_text",            # 1 – general news columns
-    "headline",                # 2 – section/article headings
-    "commercial_advertisement",# 3 – non-job ads
-    "financial_table",         # 4 – price lists, stock tables
-    "masthead",                # 5 – newspaper title/date banner
-]
-CLASS_ID: dict[str, int] = {name: idx for idx, name in enumerate(CLASS_NAMES)}
-
 # Distinct colours for the overlay visualisation
 _VIS_COLOURS: dict[str, str] = {
     "job_advertisement":        "#FF4136",
@@ -104,6 +65,38 @@ _VIS_COLOURS: dict[str, str] = {
     "masthead":                 "#FFDC00",
 }
 
+#: Longest side (px) of review visualisations; ``None`` keeps the page size.
+VIS_MAX_SIZE: int | None = 2000
+
+#: File format (suffix) of review visualisations: ``webp``, ``jpg`` or ``png``.
+VIS_FORMAT: str = "webp"
+
+#: Quality of lossy (WebP / JPEG) visualisations.
+VIS_QUALITY: int = 80
+
+#: Strips of one page annotated concurrently by :func:`annotate_page_structured`.
+STRIP_WORKERS: int = 4
+
+#: Pages annotated concurrently by :func:`annotate_directory`.
+PAGE_WORKERS: int = 4
+
+#: Gemini requests in flight at once across all pages and strips.
+MAX_GEMINI_REQUESTS: int = 8
+
+#: Per-model caps on in-flight requests, keyed by model name or by a
+#: substring of it (``"pro"`` covers every Pro model).
+GEMINI_MODEL_LIMITS: dict[str, int] = {"flash": 8, "pro": 4}
+
+#: Outputs :class:`OutputWriter` may hold before :meth:`~OutputWriter.submit` blocks.
+WRITER_MAX_PENDING: int = 4
+
+_VIS_FORMATS: dict[str, str] = {
+    ".webp": "WEBP",
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+    ".png": "PNG",
+}
+
 # ---------------------------------------------------------------------------
 # Gemini prompt
 # ---------------------------------------------------------------------------
@@ -388,6 +381,124 @@ def _parse_regions_json(raw: str, *, source: str) -> list[BBoxRegion]:
     return regions
 
 
+# ---------------------------------------------------------------------------
+# Request scheduling
+# ---------------------------------------------------------------------------
+
+
+class RequestLimiter:
+    """Cap in-flight Gemini requests globally and per model.
+
+    Every Gemini request attempt in this module runs inside :meth:`slot`, so
+    the limits hold however many pages and strips are being annotated at
+    once; a slot is released while its request backs off before a retry.
+    Waiting requests are admitted in arrival order.  A request blocked
+    only by its own model's cap does not hold up requests for other models,
+    so a saturated Pro critic leaves free slots to Flash.
+    """
+
+    def __init__(
+        self,
+        max_requests: int = MAX_GEMINI_REQUESTS,
+        model_limits: Mapping[str, int] | None = None,
+    ) -> None:
+        self._cond = threading.Condition()
+        self._waiting: deque[tuple[object, str]] = deque()
+        self._active = 0
+        self._active_by_model: Counter[str] = Counter()
+        self.configure(max_requests, model_limits)
+
+    def configure(
+        self, max_requests: int, model_limits: Mapping[str, int] | None = None
+    ) -> None:
+        """Change the limits; requests already in flight are not interrupted."""
+        too_low = {model: n for model, n in (model_limits or {}).items() if n < 1}
+        if too_low:
+            raise ValueError(f"model limits must be at least 1: {too_low}")
+        with self._cond:
+            self.max_requests = max(1, max_requests)
+            self.model_limits = dict(GEMINI_MODEL_LIMITS if model_limits is None else model_limits)
+            self._cond.notify_all()
+
+    def limit_for(self, model: str) -> int:
+        """Cap for *model*: exact name first, then the first matching substring."""
+        if model in self.model_limits:
+            return self.model_limits[model]
+        lowered = model.lower()
+        for key, limit in self.model_limits.items():
+            if key.lower() in lowered:
+                return limit
+        return self.max_requests
+
+    def _admissible(self, ticket: object) -> bool:
+        # Replay admission in arrival order: earlier waiters that could start
+        # take their slots first; those blocked by their model's cap are skipped.
+        free = self.max_requests - self._active
+        taken: Counter[str] = Counter()
+        for other, model in self._waiting:
+            if free <= 0:
+                return False
+            if self._active_by_model[model] + taken[model] >= self.limit_for(model):
+                continue
+            if other is ticket:
+                return True
+            free -= 1
+            taken[model] += 1
+        return False
+
+    @contextmanager
+    def slot(self, model: str) -> Iterator[None]:
+        """Block until a request to *model* may be sent, and hold the slot."""
+        ticket = object()
+        with self._cond:
+            self._waiting.append((ticket, model))
+            try:
+                self._cond.wait_for(lambda: self._admissible(ticket))
+            finally:
+                self._waiting.remove((ticket, model))
+            self._active += 1
+            self._active_by_model[model] += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._active_by_model[model] -= 1
+                self._cond.notify_all()
+
+
+#: Process-wide limiter shared by every Gemini call in this module.
+request_limiter = RequestLimiter()
+
+
+def run_pages(
+    pages: list[Path],
+    annotate_fn: Callable[[Path], list[BBoxRegion]],
+    *,
+    page_workers: int = PAGE_WORKERS,
+) -> dict[str, int]:
+    """Run *annotate_fn* over *pages*, keeping *page_workers* pages in flight.
+
+    Pages start in the given order and a slow page no longer holds up the
+    ones behind it.  Only the number of pages is limited here; how many
+    Gemini requests run at once is governed by :data:`request_limiter`.
+    Returns ``{page_stem: region_count}`` in page order (``-1`` = failed).
+    """
+
+    def _one(page: Path) -> int:
+        try:
+            return len(annotate_fn(page))
+        except Exception:
+            logger.exception("Failed to annotate %s – continuing.", page.name)
+            return -1
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, page_workers), thread_name_prefix="annotate-page"
+    ) as pool:
+        counts = list(pool.map(_one, pages))
+    return {page.stem: count for page, count in zip(pages, counts)}
+
+
 # ---------------------------------------------------------------------------
 # Core annotation logic
 # ---------------------------------------------------------------------------
@@ -395,35 +506,14 @@ def _parse_regions_json(raw: str, *, source: str) -> list[BBoxRegion]:
 
 def _call_gemini(image_path: Path, model_name: str) -> list[BBoxRegion]:
     """Send the image to Gemini and parse the JSON response into BBoxRegion list."""
-    _load_dotenv()
-
-    try:
-        from google import genai
-    except ImportError as exc:
-        raise ImportError(
-            "google-genai is required. Install with: uv pip install google-genai"
-        ) from exc
-
-    from google.genai import types  # noqa: PLC0415
-
-    api_key = (
-        os.environ.get("GEMINI_FLASH_API_KEY")
-        or os.environ.get("GEMINI_PRO_API_KEY")
-        or os.environ.get("GEMINI_API_KEY")
-    )
-    client = genai.Client(api_key=api_key)
     img = Image.open(image_path)
 
-    _is_pro = "pro" in model_name.lower()
-    _cfg = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_json_schema=_GeminiRegionList.model_json_schema(),
-        **({} if _is_pro else {"thinking_config": types.ThinkingConfig(thinking_budget=0)}),
-    )
-    response = client.models.generate_content(
-        model=model_name,
-        contents=[img, _ANNOTATION_PROMPT],
-        config=_cfg,
+    config = gemini_clients.config(model_name, response_schema=_GeminiRegionList)
+    response = gemini_clients.generate(
+        model_name,
+        [img, _ANNOTATION_PROMPT],
+        config=config,
+        slot=lambda: request_limiter.slot(model_name),  # released during backoff
     )
 
     raw = response.text or ""
@@ -433,72 +523,49 @@ def _call_gemini(image_path: Path, model_name: str) -> list[BBoxRegion]:
     return regions
 
 
+def _image_and_name(image: Path | Image.Image) -> tuple[Image.Image, str]:
+    """Open *image* if it is a path; return it with a name for log messages."""
+    if isinstance(image, Path):
+        return Image.open(image), image.name
+    return image, "in-memory image"
+
+
 def _call_gemini_with_prompt(
-    image_path: Path,
+    image: Path | Image.Image,
     model_name: str,
     prompt: str,
 ) -> list[BBoxRegion]:
-    """Like :func:`_call_gemini` but accepts an explicit *prompt* string."""
-    _load_dotenv()
+    """Like :func:`_call_gemini` but accepts an explicit *prompt* string.
 
-    try:
-        from google import genai
-    except ImportError as exc:
-        raise ImportError(
-            "google-genai is required. Install with: uv pip install google-genai"
-        ) from exc
-
-    from google.genai import types  # noqa: PLC0415
-
-    api_key = (
-        os.environ.get("GEMINI_FLASH_API_KEY")
-        or os.environ.get("GEMINI_PRO_API_KEY")
-        or os.environ.get("GEMINI_API_KEY")
-    )
-    client = genai.Client(api_key=api_key)
-    img = Image.open(image_path)
-
-    _is_pro = "pro" in model_name.lower()
-    _cfg = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_json_schema=_GeminiRegionList.model_json_schema(),
-        **({} if _is_pro else {"thinking_config": types.ThinkingConfig(thinking_budget=0)}),
-    )
-    response = client.models.generate_content(
-        model=model_name,
-        contents=[img, prompt],
-        config=_cfg,
+    *image* may be a path or an already-loaded PIL image (e.g. an in-memory
+    strip from :meth:`~newspapers.segmentation.structure.PageStrip.image`).
+    """
+    img, image_name = _image_and_name(image)
+
+    config = gemini_clients.config(model_name, response_schema=_GeminiRegionList)
+    response = gemini_clients.generate(
+        model_name,
+        [img, prompt],
+        config=config,
+        slot=lambda: request_limiter.slot(model_name),  # released during backoff
     )
 
     raw = response.text or ""
     regions = _parse_regions_json(raw, source="Gemini")
 
     logger.info(
-        "_call_gemini_with_prompt: %d valid regions for %s", len(regions), image_path.name
+        "_call_gemini_with_prompt: %d valid regions for %s", len(regions), image_name
     )
     return regions
 
 
 def _critique_annotations(
-    image_path: Path,
+    image: Path | Image.Image,
     regions: list["BBoxRegion"],
     model_name: str,
 ) -> list["BBoxRegion"]:
     """Send image + first-pass annotations to the critic model and return refined regions."""
-    _load_dotenv()
-
-    try:
-        from google import genai
-    except ImportError as exc:
-        raise ImportError(
-            "google-genai is required. Install with: uv pip install google-genai"
-        ) from exc
-
-    from google.genai import types  # noqa: PLC0415
-
-    api_key = os.environ.get("GEMINI_PRO_API_KEY") or os.environ.get("GEMINI_API_KEY")
-    client = genai.Client(api_key=api_key)
-    img = Image.open(image_path)
+    img, image_name = _image_and_name(image)
 
     annotations_json = json.dumps(
         [{"label": r.label, "box": r.box} for r in regions], indent=2
@@ -508,16 +575,12 @@ def _critique_annotations(
         annotations_json=annotations_json,
     )
 
-    _is_pro = "pro" in model_name.lower()
-    _cfg = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_json_schema=_GeminiRegionList.model_json_schema(),
-        **({} if _is_pro else {"thinking_config": types.ThinkingConfig(thinking_budget=0)}),
-    )
-    response = client.models.generate_content(
-        model=model_name,
-        contents=[img, prompt],
-        config=_cfg,
+    config = gemini_clients.config(model_name, response_schema=_GeminiRegionList)
+    response = gemini_clients.generate(
+        model_name,
+        [img, prompt],
+        config=config,
+        slot=lambda: request_limiter.slot(model_name),  # released during backoff
     )
 
     raw = response.text or ""
@@ -525,33 +588,58 @@ def _critique_annotations(
 
     logger.info(
         "Critic refined %d → %d regions for %s",
-        len(regions), len(refined), image_path.name,
+        len(regions), len(refined), image_name,
     )
     return refined
 
 
-def _write_yolo_label(regions: list[BBoxRegion], label_path: Path) -> None:
+def _write_yolo_label(regions: list[BBoxRegion] | RegionSet, label_path: Path) -> None:
     """Write a YOLO-format .txt label file."""
-    lines: list[str] = []
-    for region in regions:
-        class_id, cx, cy, w, h = region.to_yolo()
-        if class_id < 0:
-            continue
-        lines.append(f"{class_id} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}")
+    if not isinstance(regions, RegionSet):
+        regions = RegionSet.from_regions(regions)
+    rows = regions.to_yolo()
+    rows = rows[rows[:, 0] >= 0]
+    lines = [
+        f"{int(class_id)} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}"
+        for class_id, cx, cy, w, h in rows.tolist()
+    ]
     label_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
     logger.debug("Wrote %d YOLO labels to %s", len(lines), label_path)
 
 
 def _write_visualisation(
     image_path: Path,
-    regions: list[BBoxRegion],
+    regions: list[BBoxRegion] | RegionSet,
     output_path: Path,
     *,
     round_label: str = "",
     column_bounds: list[int] | None = None,
+    max_size: int | None = VIS_MAX_SIZE,
+    quality: int = VIS_QUALITY,
 ) -> None:
-    """Draw bounding boxes + optional column boundary lines on the image and save as PNG."""
-    img = Image.open(image_path).convert("RGB")
+    """Draw bounding boxes + optional column boundary lines on the image and save it.
+
+    The page is reduced to at most *max_size* pixels on its longest side
+    before drawing (boxes are 0-1000 normalised, column bounds are scaled),
+    and saved in the format given by *output_path*'s suffix — ``.webp`` or
+    ``.jpg`` at *quality*, or lossless ``.png``.
+    """
+    from newspapers.data.image_cache import page_cache  # noqa: PLC0415
+
+    fmt = _VIS_FORMATS[output_path.suffix.lower()]
+    page = page_cache.get_rgb(image_path)
+    page_h, page_w = page.shape[:2]
+    scale = 1.0
+    if max_size is not None and max(page_w, page_h) > max_size:
+        scale = max_size / max(page_w, page_h)
+        preview = cv2.resize(
+            page,
+            (max(1, round(page_w * scale)), max(1, round(page_h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+        img = Image.fromarray(preview)
+    else:
+        img = Image.fromarray(page.copy())
     draw = ImageDraw.Draw(img, "RGBA")
     width, height = img.size
 
@@ -561,26 +649,28 @@ def _write_visualisation(
         # Pillow < 10 doesn't support size kwarg on load_default
         font = ImageFont.load_default()
 
-    for region in regions:
-        y_min_n, x_min_n, y_max_n, x_max_n = (v / 1000.0 for v in region.box)
+    if not isinstance(regions, RegionSet):
+        regions = RegionSet.from_regions(regions)
+    for label, box in zip(regions.labels, regions.boxes.tolist()):
+        y_min_n, x_min_n, y_max_n, x_max_n = (v / 1000.0 for v in box)
         x0 = int(x_min_n * width)
         y0 = int(y_min_n * height)
         x1 = int(x_max_n * width)
         y1 = int(y_max_n * height)
-        colour = _VIS_COLOURS.get(region.label, "#FFFFFF")
+        colour = _VIS_COLOURS.get(label, "#FFFFFF")
 
         # Semi-transparent fill
         draw.rectangle([x0, y0, x1, y1], fill=colour + "33", outline=colour, width=2)
 
         # Label tag background
-        tag_text = region.label.replace("_", " ")
+        tag_text = label.replace("_", " ")
         bbox_text = draw.textbbox((x0 + 2, y0 + 2), tag_text, font=font)
         draw.rectangle(bbox_text, fill=colour + "CC")
         draw.text((x0 + 2, y0 + 2), tag_text, fill="#FFFFFF", font=font)
 
     if column_bounds:
-        img_w, _ = img.size
         for bx in column_bounds:
+            bx = int(bx * scale)
             draw.line([(bx, 0), (bx, height)], fill="#E63946", width=2)
 
     if round_label:
@@ -592,10 +682,76 @@ def _write_visualisation(
         draw.rectangle([0, 0, width, banner_h], fill="#000000DD")
         draw.text((6, 6), round_label, fill="#FFFFFF", font=font_banner)
 
-    img.save(output_path, format="PNG")
+    if fmt == "PNG":
+        img.save(output_path, format=fmt, compress_level=1)
+    else:
+        img.save(output_path, format=fmt, quality=quality)
     logger.info("Saved visualisation → %s", output_path)
 
 
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write *data* as JSON via a temporary file, so readers never see a partial file."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class OutputWriter:
+    """Write review outputs (overlays, stats sidecars) on a background thread.
+
+    Rendering and encoding an overlay takes long enough to delay the next
+    Gemini call, so :func:`annotate_page` hands them to this writer and
+    carries on.  At most *max_pending* jobs are queued; :meth:`submit`
+    blocks beyond that, so a slow disk cannot pile up page copies in memory.
+    :meth:`flush` waits for everything submitted so far and re-raises the
+    first error::
+
+        with OutputWriter() as writer:
+            writer.submit(_write_visualisation, image_path, regions, out)
+            ...                      # next API call runs meanwhile
+            writer.flush()           # end of page
+    """
+
+    def __init__(self, max_pending: int = WRITER_MAX_PENDING, workers: int = 1) -> None:
+        self.max_pending = max(1, max_pending)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="annotate-writer")
+        self._pending: set[Future] = set()
+
+    def submit(self, fn, /, *args: Any, **kwargs: Any) -> None:
+        """Queue ``fn(*args, **kwargs)``; the arguments must not be mutated afterwards."""
+        while len(self._pending) >= self.max_pending:
+            done, self._pending = wait(self._pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                fut.result()
+        self._pending.add(self._pool.submit(fn, *args, **kwargs))
+
+    def flush(self) -> None:
+        """Block until every submitted job has finished."""
+        pending, self._pending = self._pending, set()
+        done, _ = wait(pending)
+        errors = [fut.exception() for fut in done if fut.exception() is not None]
+        for exc in errors[1:]:
+            logger.error("Background write failed: %s", exc)
+        if errors:
+            raise errors[0]
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self) -> OutputWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -612,9 +768,15 @@ def annotate_page(
     critique_rounds: int = 1,
     model_name: str | None = None,
     overwrite: bool = False,
+    vis_format: str = VIS_FORMAT,
+    vis_max_size: int | None = VIS_MAX_SIZE,
+    writer: OutputWriter | None = None,
 ) -> list[BBoxRegion]:
     """Auto-annotate a single newspaper page with a Generator/Critic pattern.
 
+    Overlays and the stats sidecar are written in the background while the
+    next round is requested; all outputs exist when the function returns.
+
     Parameters
     ----------
     image_path:
@@ -624,7 +786,7 @@ def annotate_page(
     images_dir:
         Directory where a copy of the image will be placed for YOLO training.
     vis_dir:
-        Directory for human-review overlay PNGs (one per round + final).
+        Directory for human-review overlays (one per round + final).
     generator_model:
         Gemini model used for the first-pass annotation.
     critic_model:
@@ -635,6 +797,12 @@ def annotate_page(
         Deprecated shorthand; overrides *generator_model* when set.
     overwrite:
         If ``False`` (default), skip images that already have a label file.
+    vis_format, vis_max_size:
+        Overlay file format (``webp``, ``jpg`` or ``png``) and longest side
+        in pixels (``None`` = page size).
+    writer:
+        Background writer for overlays and stats; a private one is used
+        when ``None``.
 
     Returns
     -------
@@ -644,6 +812,22 @@ def annotate_page(
     if model_name is not None:
         generator_model = model_name
 
+    if writer is None:
+        with OutputWriter() as own_writer:
+            return annotate_page(
+                image_path,
+                labels_dir,
+                images_dir,
+                vis_dir,
+                generator_model=generator_model,
+                critic_model=critic_model,
+                critique_rounds=critique_rounds,
+                overwrite=overwrite,
+                vis_format=vis_format,
+                vis_max_size=vis_max_size,
+                writer=own_writer,
+            )
+
     labels_dir.mkdir(parents=True, exist_ok=True)
     images_dir.mkdir(parents=True, exist_ok=True)
     vis_dir.mkdir(parents=True, exist_ok=True)
@@ -662,11 +846,13 @@ def annotate_page(
 
     # ── Round 0: generator ────────────────────────────────────────────────
     regions = _call_gemini(image_path, generator_model)
-    _write_visualisation(
+    writer.submit(
+        _write_visualisation,
         image_path,
         regions,
-        vis_dir / f"{stem}_r0_vis.png",
+        vis_dir / f"{stem}_r0_vis.{vis_format}",
         round_label=f"Round 0 | Generator: {generator_model} | {len(regions)} regions",
+        max_size=vis_max_size,
     )
     round_stats = [
         {
@@ -683,14 +869,16 @@ def annotate_page(
     # ── Critique passes ───────────────────────────────────────────────────
     for i in range(critique_rounds):
         refined = _critique_annotations(image_path, current_regions, critic_model)
-        _write_visualisation(
+        writer.submit(
+            _write_visualisation,
             image_path,
             refined,
-            vis_dir / f"{stem}_r{i + 1}_vis.png",
+            vis_dir / f"{stem}_r{i + 1}_vis.{vis_format}",
             round_label=(
                 f"Round {i + 1} | Critic: {critic_model}"
                 f" | {len(refined)} regions (was {len(current_regions)})"
             ),
+            max_size=vis_max_size,
         )
         round_stats.append(
             {
@@ -705,11 +893,13 @@ def annotate_page(
 
     # ── Write final YOLO label + canonical visualisation ─────────────────
     _write_yolo_label(current_regions, label_path)
-    _write_visualisation(
+    writer.submit(
+        _write_visualisation,
         image_path,
         current_regions,
-        vis_dir / f"{stem}_vis.png",
+        vis_dir / f"{stem}_vis.{vis_format}",
         round_label=f"FINAL | {len(current_regions)} regions",
+        max_size=vis_max_size,
     )
 
     # ── Per-page stats sidecar ────────────────────────────────────────────
@@ -721,7 +911,8 @@ def annotate_page(
         "critique_rounds": critique_rounds,
         "rounds": round_stats,
     }
-    (vis_dir / f"{stem}_stats.json").write_text(json.dumps(stats, indent=2), encoding="utf-8")
+    writer.submit(_write_json, vis_dir / f"{stem}_stats.json", stats)
+    writer.flush()
     logger.info(
         "annotate_page done: %s — %d final regions after %d round(s)",
         image_path.name, len(current_regions), critique_rounds,
@@ -740,9 +931,13 @@ def annotate_directory(
     critique_rounds: int = 1,
     model_name: str | None = None,
     overwrite: bool = False,
+    vis_format: str = VIS_FORMAT,
+    vis_max_size: int | None = VIS_MAX_SIZE,
+    page_workers: int = PAGE_WORKERS,
 ) -> dict[str, int]:
     """Batch-annotate all ``.jpg`` files in *input_dir*.
 
+    *page_workers* pages are annotated concurrently (see :func:`run_pages`).
     Returns a summary dict ``{image_stem: region_count}``.
     """
     jpg_files = sorted(input_dir.glob("*.jpg"))
@@ -750,25 +945,22 @@ def annotate_directory(
         logger.warning("No .jpg files found in %s", input_dir)
         return {}
 
-    summary: dict[str, int] = {}
-    for jpg in jpg_files:
-        try:
-            regions = annotate_page(
-                jpg,
-                labels_dir=labels_dir,
-                images_dir=images_dir,
-                vis_dir=vis_dir,
-                generator_model=generator_model,
-                critic_model=critic_model,
-                critique_rounds=critique_rounds,
-                model_name=model_name,
-                overwrite=overwrite,
-            )
-            summary[jpg.stem] = len(regions)
-        except Exception:
-            logger.exception("Failed to annotate %s – continuing.", jpg.name)
-            summary[jpg.stem] = -1
+    def _annotate(jpg: Path) -> list[BBoxRegion]:
+        return annotate_page(
+            jpg,
+            labels_dir=labels_dir,
+            images_dir=images_dir,
+            vis_dir=vis_dir,
+            generator_model=generator_model,
+            critic_model=critic_model,
+            critique_rounds=critique_rounds,
+            model_name=model_name,
+            overwrite=overwrite,
+            vis_format=vis_format,
+            vis_max_size=vis_max_size,
+        )
 
+    summary = run_pages(jpg_files, _annotate, page_workers=page_workers)
     logger.info(
         "Batch annotation complete: %d images, %d total regions.",
         len(summary),
@@ -794,8 +986,13 @@ def annotate_page_structured(
     n_columns_hint: int = 8,
     masthead_frac: float = 0.12,
     overlap_frac: float = 0.05,
+    analysis_width: int | None = None,
     show_vis: bool = False,
     overwrite: bool = False,
+    persist_strips: bool = True,
+    vis_format: str = VIS_FORMAT,
+    vis_max_size: int | None = VIS_MAX_SIZE,
+    strip_workers: int = STRIP_WORKERS,
 ) -> list[BBoxRegion]:
     """Column-aware annotation: detect page structure then annotate per strip.
 
@@ -806,7 +1003,8 @@ def annotate_page_structured(
     3. Supplement boundary detection with printed vertical-rule detection.
     4. Decompose page into masthead strip, N column strips, and a
        full-page thumbnail.
-    5. Annotate each strip with Gemini (generator → optional critic).
+    5. Annotate the strips with Gemini (generator → optional critic),
+       *strip_workers* strips at a time.
     6. Convert all strip-local boxes to full-page coordinates.
     7. IoU-deduplicate across strips.
     8. Write YOLO labels, per-round visualisations (with column boundary lines),
@@ -832,8 +1030,25 @@ def annotate_page_structured(
         Fraction of page height treated as masthead zone.
     overlap_frac:
         Overlap fraction added to each side of a column strip.
+    analysis_width:
+        Width at which columns are detected (``None`` = full resolution).
+        Pass :data:`~newspapers.segmentation.structure.DEFAULT_ANALYSIS_WIDTH`
+        to use the faster multi-scale mode; that matches
+        ``python -m newspapers.segmentation.structure``, so pages analysed in
+        batch are then taken from the structure index.
     overwrite:
         Skip if final label file already exists.
+    persist_strips:
+        Save strip PNGs (in the artifact store, so reruns reuse them).  When
+        ``False`` strips are sliced from the page in memory and sent to
+        Gemini without any PNG encoding.
+    vis_format, vis_max_size:
+        Overlay format and longest side (see :func:`annotate_page`).
+    strip_workers:
+        Maximum number of strips whose Gemini calls are in flight at once
+        (1 = one strip after another).  Each strip's generator → critic
+        chain stays sequential, so a page takes about as long as its
+        slowest chain.
 
     Returns
     -------
@@ -842,7 +1057,7 @@ def annotate_page_structured(
     """
     from newspapers.segmentation.structure import (
         analyse_page_structure,
-        merge_strip_annotations,
+        merge_strip_regions,
         draw_column_bounds,
     )
 
@@ -865,6 +1080,8 @@ def annotate_page_structured(
         n_columns_hint=n_columns_hint,
         masthead_frac=masthead_frac,
         overlap_frac=overlap_frac,
+        analysis_width=analysis_width,
+        persist_strips=persist_strips,
     )
     logger.info(
         "Page structure: skew=%.2f°, %d column bounds, %d strips",
@@ -874,11 +1091,15 @@ def annotate_page_structured(
     # ── Checkpoint setup ────────────────────────────────────────────
     checkpoint_path = vis_dir / (image_path.stem + "_checkpoint.json")
     strip_cache_dir = vis_dir / (image_path.stem + "_strips_cache")
+    structure_key = strips[0].meta.get("structure_key")
     completed_strip_ids: set[str] = set()
     if not overwrite and checkpoint_path.exists():
         try:
             ckpt = json.loads(checkpoint_path.read_text(encoding="utf-8"))
-            completed_strip_ids = set(ckpt.get("completed_strips", []))
+            # A checkpoint from a different strip layout (other params or a
+            # changed page) refers to different crops; start afresh.
+            if ckpt.get("structure_key") == structure_key:
+                completed_strip_ids = set(ckpt.get("completed_strips", []))
             if completed_strip_ids:
                 logger.info(
                     "Resuming from checkpoint: %d strips already done.",
@@ -888,11 +1109,12 @@ def annotate_page_structured(
             completed_strip_ids = set()
 
     # ── Step 2: annotate each strip ──────────────────────────────────
-    strip_results: list[tuple] = []
+    annotated: dict[str, RegionSet] = {}
     annotated_at = datetime.now(timezone.utc).isoformat()
 
     strip_cache_dir.mkdir(parents=True, exist_ok=True)
 
+    pending_strips = []
     for strip in strips:
         cache_file = strip_cache_dir / f"{strip.strip_id}.json"
 
@@ -901,20 +1123,25 @@ def annotate_page_structured(
             logger.info("Loading cached annotation for strip '%s'.", strip.strip_id)
             try:
                 cached = json.loads(cache_file.read_text(encoding="utf-8"))
-                regions: list[BBoxRegion] = [
-                    BBoxRegion(label=item["label"], box=item["box"])
-                    for item in cached
+                valid = [
+                    item for item in cached
                     if item.get("label") in CLASS_ID and len(item.get("box", [])) == 4
                 ]
-            except (json.JSONDecodeError, OSError, KeyError):
+                cached_regions = RegionSet.from_arrays(
+                    np.array([item["box"] for item in valid], dtype=np.float32),
+                    [item["label"] for item in valid],
+                )
+            except (json.JSONDecodeError, OSError, KeyError, ValueError):
                 logger.warning("Could not load cache for strip '%s'; re-annotating.", strip.strip_id)
                 completed_strip_ids.discard(strip.strip_id)
-                regions = []  # will fall through to annotation below
             else:
-                strip_results.append((strip, regions))
+                annotated[strip.strip_id] = cached_regions
                 continue
+        pending_strips.append(strip)
 
-        logger.info("Annotating strip '%s': %s", strip.strip_id, strip.image_path.name)
+    def _annotate_strip(strip) -> list[BBoxRegion]:
+        logger.info("Annotating strip '%s': %s", strip.strip_id, strip.name)
+        strip_img = strip.image()
 
         # Choose the appropriate prompt based on strip type
         if strip.strip_id == "masthead":
@@ -932,32 +1159,60 @@ def annotate_page_structured(
                 x_end=strip.x_offset + strip.strip_width,
             )
 
-        regions = _call_gemini_with_prompt(strip.image_path, generator_model, prompt)
+        regions = _call_gemini_with_prompt(strip_img, generator_model, prompt)
 
         if critique_rounds > 0:
             for _ in range(critique_rounds):
-                regions = _critique_annotations(strip.image_path, regions, critic_model)
+                regions = _critique_annotations(strip_img, regions, critic_model)
+        return regions
+
+    # Workers only talk to Gemini; cache files and the checkpoint are written
+    # here, on the calling thread, as strips finish — so the checkpoint only
+    # ever lists strips whose cache file is complete.
+    error: BaseException | None = None
+    with ThreadPoolExecutor(
+        max_workers=max(1, strip_workers), thread_name_prefix="annotate-strip"
+    ) as pool:
+        futures = {pool.submit(_annotate_strip, strip): strip for strip in pending_strips}
+        for fut in as_completed(futures):
+            strip = futures[fut]
+            if fut.cancelled():
+                continue
+            try:
+                regions = fut.result()
+            except Exception as exc:
+                logger.error("Strip '%s' failed: %s", strip.strip_id, exc)
+                if error is None:
+                    # Stop starting new strips; those in flight still finish
+                    # and are checkpointed, so a rerun resumes after them.
+                    error = exc
+                    for other in futures:
+                        other.cancel()
+                continue
 
-        # Persist strip result to cache and update checkpoint
-        cache_file.write_text(
-            json.dumps([{"label": r.label, "box": r.box} for r in regions], indent=2),
-            encoding="utf-8",
-        )
-        completed_strip_ids.add(strip.strip_id)
-        checkpoint_path.write_text(
-            json.dumps({"completed_strips": list(completed_strip_ids)}, indent=2),
-            encoding="utf-8",
-        )
-        logger.info(
-            "Checkpoint saved: %d/%d strips done.", len(completed_strip_ids), len(strips)
-        )
+            # Persist strip result to cache and update checkpoint
+            _write_json_atomic(
+                strip_cache_dir / f"{strip.strip_id}.json",
+                [{"label": r.label, "box": r.box} for r in regions],
+            )
+            completed_strip_ids.add(strip.strip_id)
+            _write_json_atomic(
+                checkpoint_path,
+                {"structure_key": structure_key, "completed_strips": sorted(completed_strip_ids)},
+            )
+            logger.info(
+                "Checkpoint saved: %d/%d strips done.", len(completed_strip_ids), len(strips)
+            )
+            annotated[strip.strip_id] = RegionSet.from_regions(regions)
+    if error is not None:
+        raise error
 
-        strip_results.append((strip, regions))
+    strip_results = [(strip, annotated[strip.strip_id]) for strip in strips]
 
     # ── Step 3: merge into full-page coordinates ──────────────────────
     page_w = strips[0].page_width
     page_h = strips[0].page_height
-    final_regions = merge_strip_annotations(
+    final_regions = merge_strip_regions(
         strip_results, page_w, page_h, column_bounds
     )
 
@@ -967,13 +1222,14 @@ def annotate_page_structured(
         shutil.copy2(image_path, dest_image)
 
     _write_yolo_label(final_regions, label_path)
-    vis_png = vis_dir / (image_path.stem + "_structured_vis.png")
+    vis_png = vis_dir / f"{image_path.stem}_structured_vis.{vis_format}"
     _write_visualisation(
         image_path,
         final_regions,
         vis_png,
         round_label=f"STRUCTURED | {len(strips)} strips | {len(final_regions)} regions",
         column_bounds=column_bounds,
+        max_size=vis_max_size,
     )
     if show_vis and vis_png.exists():
         import os as _os  # noqa: PLC0415
@@ -985,7 +1241,7 @@ def annotate_page_structured(
             "strip_id": s.strip_id,
             "column_index": s.column_index,
             "n_regions": len(r),
-            "class_counts": dict(Counter(reg.label for reg in r)),
+            "class_counts": dict(Counter(r.labels)),
         }
         for s, r in strip_results
     ]
@@ -1001,7 +1257,7 @@ def annotate_page_structured(
         "column_bounds": column_bounds,
         "overlap_frac": overlap_frac,
         "final_n_regions": len(final_regions),
-        "final_class_counts": dict(Counter(r.label for r in final_regions)),
+        "final_class_counts": dict(Counter(final_regions.labels)),
         "strips": strip_stats,
     }
     (vis_dir / (image_path.stem + "_structured_stats.json")).write_text(
@@ -1016,7 +1272,7 @@ def annotate_page_structured(
         "annotate_page_structured done: %s — %d final regions from %d strips",
         image_path.name, len(final_regions), len(strips),
     )
-    return final_regions
+    return final_regions.to_regions()
 
 
 # ---------------------------------------------------------------------------
@@ -1024,6 +1280,15 @@ def annotate_page_structured(
 # ---------------------------------------------------------------------------
 
 
+def _model_limit(value: str) -> tuple[str, int]:
+    model, sep, limit = value.partition("=")
+    if not sep or not model or not limit.isdigit():
+        raise argparse.ArgumentTypeError(f"expected MODEL=N, got {value!r}")
+    if int(limit) < 1:
+        raise argparse.ArgumentTypeError(f"limit must be at least 1, got {value!r}")
+    return model, int(limit)
+
+
 def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description=(
@@ -1053,7 +1318,19 @@ def _build_parser() -> argparse.ArgumentParser:
         "--vis",
         type=Path,
         default=Path("data/annotations/visualizations"),
-        help="Output directory for human-review overlay PNGs.",
+        help="Output directory for human-review overlays.",
+    )
+    p.add_argument(
+        "--vis-format",
+        choices=["webp", "jpg", "png"],
+        default=VIS_FORMAT,
+        help="File format of the review overlays.",
+    )
+    p.add_argument(
+        "--vis-max-size",
+        type=int,
+        default=VIS_MAX_SIZE,
+        help="Longest side of the review overlays in pixels; 0 = full page size.",
     )
     p.add_argument(
         "--generator-model",
@@ -1093,10 +1370,56 @@ def _build_parser() -> argparse.ArgumentParser:
         default=0.05,
         help="Overlap fraction added to each side of a column strip (--structured only).",
     )
+    p.add_argument(
+        "--analysis-width",
+        type=int,
+        default=0,
+        help=(
+            "Column-detection width in pixels; 0 = full resolution. "
+            f"{DEFAULT_ANALYSIS_WIDTH} matches the batch structure CLI, so its "
+            "precomputed layouts are reused (--structured only)."
+        ),
+    )
+    p.add_argument(
+        "--page-workers",
+        type=int,
+        default=PAGE_WORKERS,
+        help="Pages annotated concurrently when --input is a directory.",
+    )
+    p.add_argument(
+        "--max-requests",
+        type=int,
+        default=MAX_GEMINI_REQUESTS,
+        help="Gemini requests in flight at once, across all pages and strips.",
+    )
+    p.add_argument(
+        "--model-limit",
+        type=_model_limit,
+        action="append",
+        default=[],
+        metavar="MODEL=N",
+        help=(
+            "Cap in-flight requests to models whose name contains MODEL, e.g. "
+            "'pro=2' (repeatable; defaults: "
+            + ", ".join(f"{k}={v}" for k, v in GEMINI_MODEL_LIMITS.items())
+            + ")."
+        ),
+    )
+    p.add_argument(
+        "--strip-workers",
+        type=int,
+        default=STRIP_WORKERS,
+        help="Strips annotated concurrently per page (--structured only).",
+    )
+    p.add_argument(
+        "--in-memory-strips",
+        action="store_true",
+        help="Keep column strips in memory instead of writing PNGs (--structured only).",
+    )
     p.add_argument(
         "--show-vis",
         action="store_true",
-        help="Open the visualisation PNG in the default viewer after each image (--structured only).",
+        help="Open the visualisation in the default viewer after each image (--structured only).",
     )
     p.add_argument(
         "--verbose",
@@ -1113,30 +1436,40 @@ if __name__ == "__main__":
         format="%(asctime)s %(levelname)s %(name)s – %(message)s",
     )
 
+    request_limiter.configure(
+        args.max_requests, {**GEMINI_MODEL_LIMITS, **dict(args.model_limit)}
+    )
+
     inp: Path = args.input
     if inp.is_dir():
         if args.structured:
             # Batch structured run over all JPGs
-            jpg_files = sorted(inp.glob("*.jpg"))
-            for jpg in jpg_files:
-                try:
-                    regions = annotate_page_structured(
-                        jpg,
-                        labels_dir=args.labels,
-                        images_dir=args.images,
-                        vis_dir=args.vis,
-                        generator_model=args.generator_model,
-                        critic_model=args.critic_model,
-                        critique_rounds=args.critique_rounds,
-                        n_columns_hint=args.n_columns,
-                        overlap_frac=args.overlap_frac,
-                        show_vis=args.show_vis,
-                        overwrite=args.overwrite,
-                    )
-                    print(f"  {jpg.stem}: {len(regions)} regions (structured)")
-                except Exception:
-                    logger.exception("Failed to annotate %s", jpg.name)
-                    print(f"  {jpg.stem}: FAILED")
+            def _annotate_structured(jpg: Path) -> list[BBoxRegion]:
+                return annotate_page_structured(
+                    jpg,
+                    labels_dir=args.labels,
+                    images_dir=args.images,
+                    vis_dir=args.vis,
+                    generator_model=args.generator_model,
+                    critic_model=args.critic_model,
+                    critique_rounds=args.critique_rounds,
+                    n_columns_hint=args.n_columns,
+                    overlap_frac=args.overlap_frac,
+                    analysis_width=args.analysis_width or None,
+                    show_vis=args.show_vis,
+                    overwrite=args.overwrite,
+                    persist_strips=not args.in_memory_strips,
+                    strip_workers=args.strip_workers,
+                    vis_format=args.vis_format,
+                    vis_max_size=args.vis_max_size or None,
+                )
+
+            summary = run_pages(
+                sorted(inp.glob("*.jpg")), _annotate_structured, page_workers=args.page_workers
+            )
+            for stem, count in summary.items():
+                status = f"{count} regions (structured)" if count >= 0 else "FAILED"
+                print(f"  {stem}: {status}")
         else:
             summary = annotate_directory(
                 inp,
@@ -1147,10 +1480,16 @@ if __name__ == "__main__":
                 critic_model=args.critic_model,
                 critique_rounds=args.critique_rounds,
                 overwrite=args.overwrite,
+                vis_format=args.vis_format,
+                vis_max_size=args.vis_max_size or None,
+                page_workers=args.page_workers,
             )
             for stem, count in summary.items():
                 status = f"{count} regions" if count >= 0 else "FAILED"
                 print(f"  {stem}: {status}")
+        for key, by_model in gemini_clients.key_stats().items():
+            for model, usage in by_model.items():
+                logger.info("Gemini key %s, %s: %s", key, model, usage)
     else:
         if args.structured:
             regions = annotate_page_structured(
@@ -1163,8 +1502,13 @@ if __name__ == "__main__":
                 critique_rounds=args.critique_rounds,
                 n_columns_hint=args.n_columns,
                 overlap_frac=args.overlap_frac,
+                analysis_width=args.analysis_width or None,
                 show_vis=args.show_vis,
                 overwrite=args.overwrite,
+                persist_strips=not args.in_memory_strips,
+                strip_workers=args.strip_workers,
+                vis_format=args.vis_format,
+                vis_max_size=args.vis_max_size or None,
             )
         else:
             regions = annotate_page(
@@ -1176,6 +1520,8 @@ if __name__ == "__main__":
                 critic_model=args.critic_model,
                 critique_rounds=args.critique_rounds,
                 overwrite=args.overwrite,
+                vis_format=args.vis_format,
+                vis_max_size=args.vis_max_size or None,
             )
         print(f"Annotated {inp.name}: {len(regions)} regions detected.")
         for r in regions:
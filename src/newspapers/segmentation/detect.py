@@ -28,8 +28,13 @@ from __future__ import annotations
 import argparse
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from newspapers.models import PageSegment
+from newspapers.segmentation.regions import RegionSet
+
+if TYPE_CHECKING:
+    from newspapers.segmentation.structure import SkewTransform
 
 logger = logging.getLogger(__name__)
 
@@ -38,12 +43,12 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
-def detect_segments(
+def detect_regions(
     image_path: Path,
     model_path: Path,
     *,
     confidence_threshold: float = 0.25,
-) -> list[PageSegment]:
+) -> RegionSet:
     """Run YOLOv11 inference on a newspaper page image.
 
     Parameters
@@ -57,8 +62,9 @@ def detect_segments(
 
     Returns
     -------
-    list[PageSegment]
-        Detected page segments with bounding boxes and labels.
+    RegionSet
+        Detected boxes (pixel coordinates), model class ids and confidences,
+        taken from the result tensors without per-box objects.
     """
     try:
         from ultralytics import YOLO
@@ -70,36 +76,42 @@ def detect_segments(
     model = YOLO(str(model_path))
     results = model(str(image_path))
 
-    segments: list[PageSegment] = []
+    parts: list[RegionSet] = []
     for result in results:
-        for box in result.boxes:
-            conf = float(box.conf[0])
-            if conf < confidence_threshold:
-                continue
-            x1, y1, x2, y2 = (float(c) for c in box.xyxy[0])
-            cls_id = int(box.cls[0])
-            label = result.names.get(cls_id, f"class_{cls_id}")
-            segments.append(
-                PageSegment(
-                    label=label,
-                    x_min=x1,
-                    y_min=y1,
-                    x_max=x2,
-                    y_max=y2,
-                    confidence=conf,
-                )
-            )
+        boxes = result.boxes
+        conf = boxes.conf.cpu().numpy()
+        keep = conf >= confidence_threshold
+        parts.append(RegionSet.from_xyxy(
+            boxes.xyxy.cpu().numpy()[keep],
+            boxes.cls.cpu().numpy()[keep],
+            conf[keep],
+            result.names,
+        ))
+    regions = RegionSet.concat(parts)
 
-    logger.info("Detected %d segments in %s", len(segments), image_path.name)
-    return segments
+    logger.info("Detected %d segments in %s", len(regions), image_path.name)
+    return regions
+
+
+def detect_segments(
+    image_path: Path,
+    model_path: Path,
+    *,
+    confidence_threshold: float = 0.25,
+) -> list[PageSegment]:
+    """:func:`detect_regions` as a list of :class:`~newspapers.models.PageSegment`."""
+    return detect_regions(
+        image_path, model_path, confidence_threshold=confidence_threshold
+    ).to_segments()
 
 
 def crop_segments(
     image_path: Path,
-    segments: list[PageSegment],
+    segments: list[PageSegment] | RegionSet,
     output_dir: Path,
     *,
     inference_image_path: Path | None = None,
+    transform: SkewTransform | None = None,
 ) -> list[Path]:
     """Crop detected segments from a page image.
 
@@ -110,7 +122,8 @@ def crop_segments(
         produced by :func:`~newspapers.data.ingest.convert_jp2` for maximum
         legibility when passed to the downstream Vision LLM.
     segments:
-        Segments produced by :func:`detect_segments`.  Their bounding-box
+        Segments produced by :func:`detect_regions` or
+        :func:`detect_segments`.  Their bounding-box
         coordinates are in the pixel space of the image that was fed to YOLO
         (usually a low-res JPEG).
     output_dir:
@@ -122,17 +135,39 @@ def crop_segments(
         coordinate from JPEG pixel space to full-res PNG pixel space before
         cropping.  If ``None``, coordinates are used as-is (suitable when
         both images share identical dimensions).
+    transform:
+        Skew correction of *image_path*
+        (:class:`~newspapers.segmentation.structure.SkewTransform`, e.g.
+        rebuilt from a strip's ``meta["deskew"]``).  When given, segment
+        boxes are in the levelled page and each crop is resampled from the
+        original on its own, without deskewing the whole page.
+
+    If a tiled copy of *image_path* exists (``<stem>.tiles/``, written by
+    ``convert_jp2(..., write_tiles=True)``), each crop decodes only the tiles
+    it overlaps instead of the whole page.
 
     Returns
     -------
     list[Path]
         Paths to the cropped image files (PNG).
     """
+    import numpy as np
     from PIL import Image
 
+    from newspapers.data.image_cache import page_cache
+    from newspapers.data.tiles import open_tiled
+
     output_dir.mkdir(parents=True, exist_ok=True)
-    img = Image.open(image_path)
-    crop_w, crop_h = img.size
+    tiled = open_tiled(image_path)
+    if tiled is not None:
+        logger.debug("Cropping from tiled page %s", tiled.path.name)
+        img = None
+        crop_w, crop_h = tiled.size
+    else:
+        img = page_cache.get_rgb(image_path)
+        crop_h, crop_w = img.shape[:2]
+    if transform is not None:
+        crop_w, crop_h = transform.size
     stem = image_path.stem
 
     # Derive scale factors when the inference image differs from the crop image
@@ -148,12 +183,14 @@ def crop_segments(
                 infer_w, infer_h, crop_w, crop_h, scale_x, scale_y,
             )
 
+    if not isinstance(segments, RegionSet):
+        segments = RegionSet.from_segments(segments)
+    # Scale every box at once, then clamp/crop per segment
+    scaled = (segments.boxes.astype(np.float64) * [scale_y, scale_x, scale_y, scale_x])
+    scaled = scaled.astype(np.int64).tolist()
+
     paths: list[Path] = []
-    for idx, seg in enumerate(segments):
-        x0 = int(seg.x_min * scale_x)
-        y0 = int(seg.y_min * scale_y)
-        x1 = int(seg.x_max * scale_x)
-        y1 = int(seg.y_max * scale_y)
+    for idx, ((y0, x0, y1, x1), label) in enumerate(zip(scaled, segments.labels)):
 
         # Clamp to image bounds
         x0 = max(0, min(x0, crop_w))
@@ -165,8 +202,21 @@ def crop_segments(
             logger.warning("Degenerate crop box at idx %d – skipping.", idx)
             continue
 
-        crop = img.crop((x0, y0, x1, y1))
-        out = output_dir / f"{stem}_seg{idx:04d}_{seg.label}.png"
+        if transform is not None:
+            box = (x0, y0, x1, y1)
+            if tiled is not None:
+                src_box = transform.source_box(box)
+                region = np.asarray(tiled.read_region(src_box).convert("RGB"))
+                crop = Image.fromarray(
+                    transform.warp(region, box, source_origin=src_box[:2])
+                )
+            else:
+                crop = Image.fromarray(transform.warp(img, box))
+        elif tiled is not None:
+            crop = tiled.read_region((x0, y0, x1, y1))
+        else:
+            crop = Image.fromarray(img[y0:y1, x0:x1])
+        out = output_dir / f"{stem}_seg{idx:04d}_{label}.png"
         crop.save(out, format="PNG")
         paths.append(out)
 
@@ -240,7 +290,7 @@ if __name__ == "__main__":
         if crop_source != jpg:
             logger.info("Using high-res PNG for cropping: %s", png.name)
 
-        segs = detect_segments(jpg, args.model, confidence_threshold=args.conf)
+        segs = detect_regions(jpg, args.model, confidence_threshold=args.conf)
         if not segs:
             print(f"  {jpg.name}: no segments detected.")
             continue
@@ -0,0 +1,252 @@
+"""Array-backed container for page regions.
+
+A page can carry thousands of candidate boxes between annotation, merging,
+detection and label writing.  :class:`RegionSet` holds them as parallel
+NumPy arrays (struct-of-arrays) instead of a list of pydantic objects, so
+filtering, slicing and format conversion are array operations::
+
+    regions = RegionSet.from_regions(gemini_regions)      # list[BBoxRegion] →
+    wide = regions[regions.widths >= 300]                 # boolean mask
+    rows = regions.to_yolo()                              # (N, 5) array
+    api_objects = regions.to_regions()                    # → list[BBoxRegion]
+
+Pydantic models (``BBoxRegion``, :class:`~newspapers.models.PageSegment`)
+are only built at the API boundary via :meth:`RegionSet.to_regions` /
+:meth:`RegionSet.to_segments`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from newspapers.models import PageSegment
+    from newspapers.segmentation.annotate import BBoxRegion
+
+# ---------------------------------------------------------------------------
+# Class taxonomy – must stay consistent with data/annotations/classes.txt
+#                  and data/annotations/dataset.yaml
+# ---------------------------------------------------------------------------
+CLASS_NAMES: list[str] = [
+    "job_advertisement",  # 0 – primary extraction target
+    "article_text",  # 1 – general news columns
+    "headline",  # 2 – section/article headings
+    "commercial_advertisement",  # 3 – non-job ads
+    "financial_table",  # 4 – price lists, stock tables
+    "masthead",  # 5 – newspaper title/date banner
+]
+CLASS_ID: dict[str, int] = {name: idx for idx, name in enumerate(CLASS_NAMES)}
+
+
+@dataclass(frozen=True)
+class RegionSet:
+    """*N* labelled boxes stored column-wise.
+
+    Indexing with an int, slice, mask or index array returns a new
+    ``RegionSet``; plain slices are views onto the same arrays (no copy).
+    """
+
+    boxes: np.ndarray
+    """``(N, 4)`` float32 ``[y_min, x_min, y_max, x_max]`` — 0-1000 space for
+    LLM annotations, pixels for detector output."""
+
+    class_ids: np.ndarray
+    """``(N,)`` int16 indices into :attr:`names`."""
+
+    confidence: np.ndarray
+    """``(N,)`` float32 scores (1.0 for LLM annotations)."""
+
+    names: tuple[str, ...] = field(default=tuple(CLASS_NAMES))
+    """Label of each class id (defaults to :data:`CLASS_NAMES`)."""
+
+    def __post_init__(self) -> None:
+        n = len(self.boxes)
+        if self.boxes.shape != (n, 4) or len(self.class_ids) != n or len(self.confidence) != n:
+            raise ValueError(
+                f"RegionSet arrays disagree: boxes {self.boxes.shape}, "
+                f"class_ids {self.class_ids.shape}, confidence {self.confidence.shape}"
+            )
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def empty(cls, names: Sequence[str] = CLASS_NAMES) -> RegionSet:
+        return cls(
+            np.empty((0, 4), dtype=np.float32),
+            np.empty(0, dtype=np.int16),
+            np.empty(0, dtype=np.float32),
+            tuple(names),
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        boxes: np.ndarray,
+        labels: Sequence[str] | np.ndarray,
+        confidence: np.ndarray | None = None,
+    ) -> RegionSet:
+        """Build from ``[y_min, x_min, y_max, x_max]`` boxes and label strings.
+
+        Labels outside :data:`CLASS_NAMES` get class ids after the known
+        classes, so nothing is lost in a round trip.
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        names = list(CLASS_NAMES)
+        ids = {name: i for i, name in enumerate(names)}
+        class_ids = np.empty(len(boxes), dtype=np.int16)
+        for i, label in enumerate(labels):
+            cid = ids.get(label)
+            if cid is None:
+                cid = ids[label] = len(names)
+                names.append(str(label))
+            class_ids[i] = cid
+        if confidence is None:
+            confidence = np.ones(len(boxes), dtype=np.float32)
+        return cls(boxes, class_ids, np.asarray(confidence, dtype=np.float32), tuple(names))
+
+    @classmethod
+    def from_xyxy(
+        cls,
+        xyxy: np.ndarray,
+        class_ids: np.ndarray,
+        confidence: np.ndarray,
+        names: Mapping[int, str] | Sequence[str],
+    ) -> RegionSet:
+        """Build from detector output (``[x1, y1, x2, y2]`` boxes, model class ids)."""
+        if isinstance(names, Mapping):
+            names = [names.get(i, f"class_{i}") for i in range(max(names, default=-1) + 1)]
+        xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        return cls(
+            xyxy[:, [1, 0, 3, 2]],
+            np.asarray(class_ids, dtype=np.int16),
+            np.asarray(confidence, dtype=np.float32),
+            tuple(names),
+        )
+
+    @classmethod
+    def from_regions(cls, regions: Iterable[BBoxRegion]) -> RegionSet:
+        """Build from ``BBoxRegion`` objects (0-1000 ``box`` + ``label``)."""
+        regions = list(regions)
+        return cls.from_arrays(
+            np.array([r.box for r in regions], dtype=np.float32), [r.label for r in regions]
+        )
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[PageSegment]) -> RegionSet:
+        """Build from detector :class:`~newspapers.models.PageSegment` objects."""
+        segments = list(segments)
+        return cls.from_arrays(
+            np.array([[s.y_min, s.x_min, s.y_max, s.x_max] for s in segments], dtype=np.float32),
+            [s.label for s in segments],
+            np.array([s.confidence for s in segments], dtype=np.float32),
+        )
+
+    @classmethod
+    def concat(cls, parts: Iterable[RegionSet]) -> RegionSet:
+        """Join region sets, re-mapping class ids onto one shared name table."""
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        names = list(parts[0].names)
+        ids = {name: i for i, name in enumerate(names)}
+        class_ids: list[np.ndarray] = []
+        for part in parts:
+            remap = np.empty(len(part.names), dtype=np.int16)
+            for i, name in enumerate(part.names):
+                if name not in ids:
+                    ids[name] = len(names)
+                    names.append(name)
+                remap[i] = ids[name]
+            class_ids.append(remap[part.class_ids])
+        return cls(
+            np.concatenate([p.boxes for p in parts]),
+            np.concatenate(class_ids),
+            np.concatenate([p.confidence for p in parts]),
+            tuple(names),
+        )
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __getitem__(self, index) -> RegionSet:
+        if isinstance(index, (int, np.integer)):
+            index = slice(index, index + 1 or None)
+        return RegionSet(
+            self.boxes[index], self.class_ids[index], self.confidence[index], self.names
+        )
+
+    @property
+    def labels(self) -> list[str]:
+        return [self.names[i] for i in self.class_ids.tolist()]
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        """``(N, 4)`` ``[x1, y1, x2, y2]`` copy of the boxes."""
+        return self.boxes[:, [1, 0, 3, 2]]
+
+    @property
+    def widths(self) -> np.ndarray:
+        return self.boxes[:, 3] - self.boxes[:, 1]
+
+    @property
+    def heights(self) -> np.ndarray:
+        return self.boxes[:, 2] - self.boxes[:, 0]
+
+    @property
+    def areas(self) -> np.ndarray:
+        return self.widths * self.heights
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def yolo_class_ids(self) -> np.ndarray:
+        """:data:`CLASS_ID` of each region, ``-1`` for labels outside the taxonomy."""
+        table = np.array([CLASS_ID.get(name, -1) for name in self.names], dtype=np.int16)
+        return table[self.class_ids] if len(self) else np.empty(0, dtype=np.int16)
+
+    def to_yolo(self, width: float = 1000.0, height: float = 1000.0) -> np.ndarray:
+        """``(N, 5)`` rows of ``class_id, cx, cy, w, h`` normalised to 0-1.
+
+        *width* / *height* are the extent of the box coordinate space (1000
+        for 0-1000 annotations, the page size for pixel boxes).  Regions whose
+        label is not a YOLO class get ``class_id = -1``.
+        """
+        b = self.boxes.astype(np.float64) / [height, width, height, width]
+        out = np.empty((len(self), 5), dtype=np.float64)
+        out[:, 0] = self.yolo_class_ids()
+        out[:, 1] = (b[:, 1] + b[:, 3]) / 2.0
+        out[:, 2] = (b[:, 0] + b[:, 2]) / 2.0
+        out[:, 3] = b[:, 3] - b[:, 1]
+        out[:, 4] = b[:, 2] - b[:, 0]
+        return out
+
+    def to_regions(self) -> list[BBoxRegion]:
+        """``BBoxRegion`` objects (integer 0-1000 boxes) for the API boundary."""
+        from newspapers.segmentation.annotate import BBoxRegion  # noqa: PLC0415
+
+        return [
+            BBoxRegion(label=label, box=box)
+            for label, box in zip(self.labels, self.boxes.astype(np.int64).tolist())
+        ]
+
+    def to_segments(self) -> list[PageSegment]:
+        """:class:`~newspapers.models.PageSegment` objects (pixel boxes)."""
+        from newspapers.models import PageSegment  # noqa: PLC0415
+
+        return [
+            PageSegment(label=label, y_min=y1, x_min=x1, y_max=y2, x_max=x2, confidence=conf)
+            for label, (y1, x1, y2, x2), conf in zip(
+                self.labels, self.boxes.tolist(), self.confidence.tolist()
+            )
+        ]
@@ -0,0 +1,150 @@
+"""Shared test fixtures."""
+
+import hashlib
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from newspapers.data.drive import FOLDER_MIME_TYPE, RangeIgnoredError
+from newspapers.data.structure_index import StructureIndex
+from newspapers.segmentation import structure
+
+
+@pytest.fixture(autouse=True)
+def structure_index(tmp_path: Path, monkeypatch) -> StructureIndex:
+    """Keep structure layouts out of ``data/interim`` during tests."""
+    index = StructureIndex(tmp_path / "structure_index.sqlite")
+    monkeypatch.setattr(structure, "default_index", index)
+    return index
+
+
+# ---------------------------------------------------------------------------
+# Synthetic pages
+# ---------------------------------------------------------------------------
+
+
+def _write_columns_page(
+    path: Path,
+    *,
+    size=(2400, 1600),
+    n_cols: int = 6,
+    rules=(2, 4),
+    seed: int = 0,
+) -> Path:
+    """Synthetic newspaper page: word-like blocks in columns, thin printed rules."""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    arr = np.full((h, w), 240, dtype=np.uint8)
+    margin, gutter = 80, 30
+    col_w = (w - 2 * margin) // n_cols
+    for i in range(n_cols):
+        x_lo = margin + i * col_w + gutter // 2
+        x_hi = margin + (i + 1) * col_w - gutter // 2
+        for y in range(150, h - 60, 26):
+            x = x_lo
+            while x < x_hi:
+                word = int(rng.integers(15, 70))
+                arr[y : y + 14, x : min(x + word, x_hi)] = 30
+                x += word + int(rng.integers(8, 14))
+    for r in rules:
+        x = margin + r * col_w
+        arr[150 : h - 60, x - 1 : x + 2] = 10
+    Image.fromarray(arr).convert("RGB").save(path, format="PNG")
+    return path
+
+
+def _noise_page(size: tuple[int, int], *, seed: int = 0) -> Image.Image:
+    """Random RGB image; every pixel differs, so crops and resizes are checkable."""
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8), "RGB")
+
+
+@pytest.fixture()
+def write_page() -> Callable[..., Path]:
+    """Factory writing a synthetic column page to a PNG path."""
+    return _write_columns_page
+
+
+@pytest.fixture()
+def noise_page() -> Callable[..., Image.Image]:
+    """Factory for random-noise RGB pages of a given size."""
+    return _noise_page
+
+
+# ---------------------------------------------------------------------------
+# Google Drive
+# ---------------------------------------------------------------------------
+
+
+class FakeDrive:
+    """In-memory Drive with paginated listings and ranged downloads.
+
+    With *honour_ranges* false it behaves like a server that answers ranged
+    requests with the whole file.
+    """
+
+    def __init__(self, tree: dict, *, page_size: int = 2, honour_ranges: bool = True) -> None:
+        self.page_size = page_size
+        self.honour_ranges = honour_ranges
+        self.children: dict[str, list[dict]] = {}
+        self.blobs: dict[str, bytes] = {}
+        self.ranges: list[tuple[str, int, int]] = []
+        self._lock = threading.Lock()
+        self._add("root", tree)
+
+    def _add(self, folder_id: str, tree: dict) -> None:
+        items = self.children.setdefault(folder_id, [])
+        for name, value in tree.items():
+            if isinstance(value, dict):
+                items.append({"id": name, "name": name, "mimeType": FOLDER_MIME_TYPE})
+                self._add(name, value)
+            else:
+                file_id = name if name not in self.blobs else f"{folder_id}/{name}"
+                self.blobs[file_id] = value
+                items.append(
+                    {
+                        "id": file_id,
+                        "name": name,
+                        "mimeType": "image/jp2",
+                        "size": str(len(value)),
+                        "md5Checksum": hashlib.md5(value).hexdigest(),
+                    }
+                )
+
+    def list_folder(self, folder_id, page_token=None):
+        start = int(page_token or 0)
+        items = self.children.get(folder_id, [])
+        end = start + self.page_size
+        return items[start:end], (str(end) if end < len(items) else None)
+
+    def fetch_range(self, file_id, start, end):
+        with self._lock:
+            self.ranges.append((file_id, start, end))
+        if start > 0 and not self.honour_ranges:
+            raise RangeIgnoredError(file_id, self.blobs[file_id])
+        return self.blobs[file_id][start : end + 1]
+
+
+@pytest.fixture()
+def make_drive() -> Callable[..., FakeDrive]:
+    """Factory for a :class:`FakeDrive` holding a nested ``{name: bytes | dict}`` tree."""
+    return FakeDrive
+
+
+@pytest.fixture()
+def drive(make_drive) -> FakeDrive:
+    return make_drive(
+        {
+            "a.jp2": b"A" * 25,
+            "notes.txt": b"skip me",
+            "1900": {
+                "b.jp2": b"B" * 10,
+                "c.jp2": b"C" * 7,
+                "01": {"d.jp2": b"D" * 3},
+            },
+        }
+    )
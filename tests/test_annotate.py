@@ -0,0 +1,255 @@
+"""Tests for annotation outputs that don't need the Gemini API."""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from newspapers.segmentation import annotate
+from newspapers.segmentation.annotate import BBoxRegion, _write_json, _write_visualisation
+
+
+def _page(tmp_path: Path, size: tuple[int, int] = (3000, 4000)) -> Path:
+    path = tmp_path / "page.jpg"
+    Image.fromarray(np.full((size[1], size[0], 3), 230, dtype=np.uint8)).save(path)
+    return path
+
+
+class TestVisualisation:
+    """Review overlays are downscaled previews in a compact format."""
+
+    @pytest.mark.parametrize(("suffix", "fmt"), [(".webp", "WEBP"), (".jpg", "JPEG")])
+    def test_preview_size_and_format(self, tmp_path: Path, suffix: str, fmt: str):
+        out = tmp_path / f"page_vis{suffix}"
+        regions = [BBoxRegion(label="headline", box=[500, 500, 1000, 1000])]
+        _write_visualisation(_page(tmp_path), regions, out, max_size=800)
+        with Image.open(out) as img:
+            assert img.format == fmt
+            assert img.size == (600, 800)
+            # The box is scaled with the preview: its fill covers the bottom-right quarter.
+            arr = np.asarray(img.convert("RGB"))
+        assert abs(int(arr[700, 500, 0]) - int(arr[100, 100, 0])) > 10
+
+    def test_column_bounds_are_scaled(self, tmp_path: Path):
+        out = tmp_path / "page_vis.png"
+        _write_visualisation(_page(tmp_path), [], out, column_bounds=[1500], max_size=1000)
+        with Image.open(out) as img:
+            arr = np.asarray(img.convert("RGB"))
+        assert arr.shape[:2] == (1000, 750)
+        red = np.flatnonzero((arr[500, :, 0] > 200) & (arr[500, :, 1] < 100))
+        assert red.min() >= 373 and red.max() <= 377
+
+    def test_small_pages_are_not_upscaled(self, tmp_path: Path):
+        out = tmp_path / "page_vis.webp"
+        _write_visualisation(_page(tmp_path, (400, 300)), [], out, max_size=2000)
+        with Image.open(out) as img:
+            assert img.size == (400, 300)
+
+
+class TestOutputWriter:
+    """Overlays and stats are written while the next round is requested."""
+
+    def test_rounds_do_not_wait_for_overlays(self, tmp_path: Path, monkeypatch):
+        regions = [BBoxRegion(label="headline", box=[0, 0, 100, 100])]
+        critic_called = threading.Event()
+        real_write = annotate._write_visualisation
+
+        def slow_write(image_path, regs, output_path, **kwargs):
+            if output_path.name.endswith("_r0_vis.webp"):
+                # Only completes if the critic runs while this overlay is pending.
+                assert critic_called.wait(5)
+            real_write(image_path, regs, output_path, **kwargs)
+
+        def critic(image_path, current, model):
+            critic_called.set()
+            return current
+
+        monkeypatch.setattr(annotate, "_call_gemini", lambda *a: regions)
+        monkeypatch.setattr(annotate, "_critique_annotations", critic)
+        monkeypatch.setattr(annotate, "_write_visualisation", slow_write)
+
+        page = _page(tmp_path, (400, 300))
+        vis = tmp_path / "vis"
+        result = annotate.annotate_page(
+            page, tmp_path / "labels", tmp_path / "images", vis, critique_rounds=1
+        )
+        assert result == regions
+        assert sorted(p.name for p in vis.iterdir()) == [
+            "page_r0_vis.webp",
+            "page_r1_vis.webp",
+            "page_stats.json",
+            "page_vis.webp",
+        ]
+
+    def test_flush_reraises_background_errors(self, tmp_path: Path):
+        def fail():
+            raise OSError("disk full")
+
+        with annotate.OutputWriter() as writer:
+            writer.submit(_write_json, tmp_path / "a.json", {"a": 1})
+            writer.submit(fail)
+            with pytest.raises(OSError, match="disk full"):
+                writer.flush()
+            writer.submit(_write_json, tmp_path / "b.json", {"b": 2})
+        assert (tmp_path / "a.json").exists() and (tmp_path / "b.json").exists()
+
+
+class TestConcurrentStrips:
+    """Strips are annotated concurrently with a consistent checkpoint."""
+
+    @pytest.fixture()
+    def page(self, tmp_path: Path, write_page) -> Path:
+        png = write_page(tmp_path / "page.png", size=(1200, 800), n_cols=4, rules=())
+        jpg = tmp_path / "page.jpg"
+        Image.open(png).save(jpg)
+        return jpg
+
+    @staticmethod
+    def _fake_gemini(monkeypatch, *, fail: str | None = None, delay: float = 0.05):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0, "calls": []}
+
+        def generator(strip_img, model, prompt):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                state["calls"].append(prompt)
+            try:
+                time.sleep(delay)
+                if fail is not None and fail in prompt:
+                    raise RuntimeError("quota exceeded")
+                return [BBoxRegion(label="article_text", box=[100, 100, 900, 900])]
+            finally:
+                with lock:
+                    state["active"] -= 1
+
+        monkeypatch.setattr(annotate, "_call_gemini_with_prompt", generator)
+        monkeypatch.setattr(annotate, "_critique_annotations", lambda img, regions, m: regions)
+        return state
+
+    def _run(self, page: Path, out: Path, **kwargs) -> list[BBoxRegion]:
+        return annotate.annotate_page_structured(
+            page,
+            out / "labels",
+            out / "images",
+            out / "vis",
+            persist_strips=False,
+            vis_format="png",
+            **kwargs,
+        )
+
+    def test_concurrency_limit_and_stable_result(self, page: Path, tmp_path: Path, monkeypatch):
+        state = self._fake_gemini(monkeypatch)
+        concurrent = self._run(page, tmp_path / "a", strip_workers=3)
+        n_strips = len(state["calls"])
+        assert n_strips >= 3
+        assert 2 <= state["peak"] <= 3
+
+        state = self._fake_gemini(monkeypatch)
+        serial = self._run(page, tmp_path / "b", strip_workers=1)
+        assert state["peak"] == 1
+        assert [(r.label, r.box) for r in concurrent] == [(r.label, r.box) for r in serial]
+        assert len(state["calls"]) == n_strips
+        assert not (tmp_path / "a" / "vis" / "page_checkpoint.json").exists()
+
+    def test_failed_strip_keeps_checkpoint_consistent(
+        self, page: Path, tmp_path: Path, monkeypatch
+    ):
+        self._fake_gemini(monkeypatch, fail="TOP STRIP")
+        with pytest.raises(RuntimeError, match="quota"):
+            self._run(page, tmp_path, strip_workers=2)
+
+        vis = tmp_path / "vis"
+        ckpt = json.loads((vis / "page_checkpoint.json").read_text())
+        assert "masthead" not in ckpt["completed_strips"]
+        for strip_id in ckpt["completed_strips"]:
+            assert (vis / "page_strips_cache" / f"{strip_id}.json").exists()
+
+        # A rerun only annotates the strips that are not checkpointed.
+        state = self._fake_gemini(monkeypatch)
+        self._run(page, tmp_path, strip_workers=2)
+        stats = json.loads((vis / "page_structured_stats.json").read_text())
+        assert len(state["calls"]) == len(stats["strips"]) - len(ckpt["completed_strips"])
+
+
+class TestRequestScheduling:
+    """Pages run concurrently under global and per-model request caps."""
+
+    @staticmethod
+    def _hammer(limiter, models: list[str], delay: float = 0.02) -> dict:
+        lock = threading.Lock()
+        active: dict[str, int] = {"all": 0}
+        peak: dict[str, int] = {"all": 0}
+
+        def call(model: str) -> None:
+            with limiter.slot(model):
+                with lock:
+                    for key in ("all", model):
+                        active[key] = active.get(key, 0) + 1
+                        peak[key] = max(peak.get(key, 0), active[key])
+                time.sleep(delay)
+                with lock:
+                    for key in ("all", model):
+                        active[key] -= 1
+
+        threads = [threading.Thread(target=call, args=(m,)) for m in models]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+        return peak
+
+    def test_global_and_model_caps(self):
+        limiter = annotate.RequestLimiter(4, {"pro": 1})
+        peak = self._hammer(limiter, ["gemini-2.5-pro", "gemini-2.5-flash"] * 6)
+        assert peak["all"] <= 4
+        assert peak["gemini-2.5-pro"] == 1
+        assert peak["gemini-2.5-flash"] == 3
+
+    def test_blocked_model_does_not_hold_up_others(self):
+        limiter = annotate.RequestLimiter(2, {"pro": 1})
+        pro_entered, flash_entered = threading.Event(), threading.Event()
+
+        def request(model: str, entered: threading.Event) -> None:
+            with limiter.slot(model):
+                entered.set()
+
+        with limiter.slot("gemini-2.5-pro"):
+            queued_pro = threading.Thread(target=request, args=("gemini-2.5-pro", pro_entered))
+            queued_pro.start()
+            time.sleep(0.05)  # the second Pro request is now waiting
+            threading.Thread(target=request, args=("gemini-2.5-flash", flash_entered)).start()
+            assert flash_entered.wait(5)
+            assert not pro_entered.is_set()
+        queued_pro.join(5)
+        assert pro_entered.is_set()
+
+    def test_limit_lookup(self):
+        limiter = annotate.RequestLimiter(8, {"pro": 2, "gemini-2.5-pro-exp": 1})
+        assert limiter.limit_for("gemini-2.5-pro-exp") == 1
+        assert limiter.limit_for("gemini-2.5-PRO") == 2
+        assert limiter.limit_for("gemini-2.5-flash") == 8
+
+    def test_zero_model_limit_is_rejected(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            annotate.RequestLimiter(8, {"pro": 0})
+        with pytest.raises(SystemExit):
+            annotate._build_parser().parse_args(["--model-limit", "pro=0"])
+
+    def test_run_pages_keeps_order_and_isolates_failures(self, tmp_path: Path):
+        pages = [tmp_path / f"p{i}.jpg" for i in range(6)]
+
+        def fake(page: Path) -> list[BBoxRegion]:
+            i = int(page.stem[1:])
+            time.sleep(0.01 * (6 - i))  # later pages finish first
+            if i == 3:
+                raise RuntimeError("boom")
+            return [BBoxRegion(label="headline", box=[0, 0, 1, 1])] * i
+
+        summary = annotate.run_pages(pages, fake, page_workers=3)
+        assert list(summary) == [p.stem for p in pages]
+        assert summary == {"p0": 0, "p1": 1, "p2": 2, "p3": -1, "p4": 4, "p5": 5}
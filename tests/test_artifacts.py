@@ -0,0 +1,119 @@
+"""Tests for the content-addressed artifact store."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from newspapers.data.artifacts import MANIFEST_NAME, ArtifactStore, artifact_key
+from newspapers.segmentation import structure
+from newspapers.segmentation.structure import analyse_page_structure
+
+
+class TestArtifactKey:
+    """Keys depend on content, parameters and version — not on filenames."""
+
+    def test_content_addressed(self, tmp_path: Path):
+        a = tmp_path / "a.bin"
+        b = tmp_path / "b.bin"
+        a.write_bytes(b"page")
+        b.write_bytes(b"page")
+        assert artifact_key("s", inputs=[a]) == artifact_key("s", inputs=[b])
+
+        b.write_bytes(b"other page")
+        assert artifact_key("s", inputs=[a]) != artifact_key("s", inputs=[b])
+
+    def test_params_and_version(self, tmp_path: Path):
+        base = artifact_key("s", inputs=["x"], params={"overlap": 0.05})
+        assert base == artifact_key("s", inputs=["x"], params={"overlap": 0.05})
+        assert base != artifact_key("s", inputs=["x"], params={"overlap": 0.1})
+        assert base != artifact_key("s", inputs=["x"], params={"overlap": 0.05}, version="2")
+
+
+class TestArtifactStore:
+    """Artifacts become visible only once committed."""
+
+    def test_commit_marks_complete(self, tmp_path: Path):
+        store = ArtifactStore(tmp_path)
+        build = store.prepare("ocr", "k1")
+        (build / "text.txt").write_text("hej")
+        assert store.lookup("ocr", "k1") is None
+
+        out = store.commit("ocr", "k1", build, params={"backend": "b"})
+        assert store.lookup("ocr", "k1") == out == store.path("ocr", "k1")
+        assert (out / MANIFEST_NAME).exists()
+        assert (out / "text.txt").read_text() == "hej"
+        assert not build.exists()
+
+    def test_concurrent_builds_do_not_interfere(self, tmp_path: Path):
+        store = ArtifactStore(tmp_path)
+        first = store.prepare("ocr", "k1")
+        (first / "text.txt").write_text("first")
+        second = store.prepare("ocr", "k1")  # must not reset the first build
+        assert first != second and (first / "text.txt").exists()
+        (second / "text.txt").write_text("second")
+
+        out = store.commit("ocr", "k1", first)
+        assert store.commit("ocr", "k1", second) == out
+        assert (out / "text.txt").read_text() == "first"
+        assert sorted(p.name for p in (tmp_path / "ocr").iterdir()) == ["k1"]
+
+    def test_commit_replaces_legacy_partial_build(self, tmp_path: Path):
+        store = ArtifactStore(tmp_path)
+        stale = store.path("ocr", "k1")
+        stale.mkdir(parents=True)
+        (stale / "stale.txt").write_text("half written")
+        out = store.commit("ocr", "k1", store.prepare("ocr", "k1"))
+        assert not (out / "stale.txt").exists()
+        assert store.lookup("ocr", "k1") == out
+
+    def test_abort_discards_build(self, tmp_path: Path):
+        store = ArtifactStore(tmp_path)
+        build = store.prepare("ocr", "k1")
+        (build / "text.txt").write_text("partial")
+        store.abort(build)
+        assert not build.exists()
+        assert store.lookup("ocr", "k1") is None
+
+
+class TestStructureArtifacts:
+    """analyse_page_structure reuses results for unchanged inputs."""
+
+    def test_rerun_loads_artifact(self, tmp_path: Path, write_page):
+        page = write_page(tmp_path / "page.png", size=(800, 600), n_cols=4, rules=())
+        store = ArtifactStore(tmp_path / "artifacts")
+
+        bounds, strips, profile, skew = analyse_page_structure(page, n_columns_hint=4, store=store)
+        key = strips[0].meta["structure_key"]
+        assert store.lookup("structure", key) is not None
+        assert all(s.image_path.exists() for s in strips)
+
+        mtimes = [s.image_path.stat().st_mtime_ns for s in strips]
+        bounds2, strips2, profile2, skew2 = analyse_page_structure(
+            page, n_columns_hint=4, store=store
+        )
+        assert bounds2 == bounds and skew2 == skew
+        assert np.array_equal(profile2, profile)
+        assert [s.image_path for s in strips2] == [s.image_path for s in strips]
+        assert [s.image_path.stat().st_mtime_ns for s in strips2] == mtimes
+
+    def test_parameter_change_gets_own_artifact(self, tmp_path: Path, write_page):
+        page = write_page(tmp_path / "page.png", size=(800, 600), n_cols=4, rules=())
+        store = ArtifactStore(tmp_path / "artifacts")
+
+        _, narrow, _, _ = analyse_page_structure(page, overlap_frac=0.0, store=store)
+        _, wide, _, _ = analyse_page_structure(page, overlap_frac=0.2, store=store)
+        assert narrow[0].meta["structure_key"] != wide[0].meta["structure_key"]
+        assert narrow[1].image_path.parent != wide[1].image_path.parent
+        assert narrow[1].image_path.exists() and wide[1].image_path.exists()
+
+    def test_failed_analysis_leaves_no_build(self, tmp_path: Path, monkeypatch, write_page):
+        def fail(*args, **kwargs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(structure, "decompose_into_strips", fail)
+        page = write_page(tmp_path / "page.png", size=(800, 600), n_cols=4, rules=())
+        store = ArtifactStore(tmp_path / "artifacts")
+        with pytest.raises(RuntimeError):
+            analyse_page_structure(page, store=store)
+        assert list((tmp_path / "artifacts" / "structure").iterdir()) == []
@@ -0,0 +1,139 @@
+"""Tests for the concurrent Google Drive downloader (against a local fake)."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from newspapers.data.drive import (
+    MANIFEST_NAME,
+    DownloadManifest,
+    DriveFile,
+    GoogleDriveClient,
+    RangeIgnoredError,
+    crawl_folder_tree,
+    download_files,
+)
+
+
+class TestCrawlFolderTree:
+    """Breadth-first paginated crawl."""
+
+    def test_finds_all_nested_files(self, drive):
+        files = crawl_folder_tree(drive, "root", workers=4)
+        assert sorted(f.name for f in files) == ["a.jp2", "b.jp2", "c.jp2", "d.jp2"]
+        d = next(f for f in files if f.name == "d.jp2")
+        assert d.folder == "1900/01"
+        assert d.size == 3
+
+    def test_max_files(self, drive):
+        assert len(crawl_folder_tree(drive, "root", max_files=2)) == 2
+
+
+class TestDownloadFiles:
+    """Concurrent, resumable downloads with a manifest."""
+
+    def test_downloads_then_skips(self, drive, tmp_path: Path):
+        files = crawl_folder_tree(drive, "root")
+        summary = download_files(drive, files, tmp_path, workers=3, chunk_size=4)
+
+        assert summary.downloaded == 4
+        assert (tmp_path / "a.jp2").read_bytes() == b"A" * 25
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        assert all(entry["complete"] for entry in manifest.values())
+
+        drive.ranges.clear()
+        again = download_files(drive, files, tmp_path, workers=3, chunk_size=4)
+        assert again.skipped == 4
+        assert drive.ranges == []
+
+    def test_resumes_partial_file(self, drive, tmp_path: Path):
+        f = next(f for f in crawl_folder_tree(drive, "root") if f.name == "a.jp2")
+        (tmp_path / MANIFEST_NAME).write_text(
+            json.dumps(
+                {
+                    f.id: {
+                        "name": f.name,
+                        "size": f.size,
+                        "md5Checksum": f.md5,
+                        "complete": False,
+                    },
+                }
+            )
+        )
+        (tmp_path / "a.jp2.part").write_bytes(b"A" * 12)
+
+        done: list[Path] = []
+        summary = download_files(
+            drive, [f], tmp_path, chunk_size=8, on_complete=lambda _f, p: done.append(p)
+        )
+
+        assert summary.resumed == 1
+        assert drive.ranges[0] == ("a.jp2", 12, 19)
+        assert (tmp_path / "a.jp2").read_bytes() == b"A" * 25
+        assert done == [tmp_path / "a.jp2"]
+
+    def test_restarts_when_range_is_ignored(self, make_drive, tmp_path: Path):
+        no_range = make_drive({"a.jp2": b"0123456789" * 3}, honour_ranges=False)
+        f = crawl_folder_tree(no_range, "root")[0]
+        (tmp_path / MANIFEST_NAME).write_text(
+            json.dumps(
+                {
+                    f.id: {
+                        "name": f.name,
+                        "size": f.size,
+                        "md5Checksum": f.md5,
+                        "complete": False,
+                    },
+                }
+            )
+        )
+        (tmp_path / "a.jp2.part").write_bytes(b"0123456789" * 2)
+
+        summary = download_files(no_range, [f], tmp_path, chunk_size=4)
+        assert summary.downloaded == 1
+        assert (tmp_path / "a.jp2").read_bytes() == b"0123456789" * 3
+
+    def test_ranged_200_is_not_taken_as_partial(self):
+        class Response:
+            def __init__(self, status):
+                self.status = status
+
+        client = GoogleDriveClient(credentials=None)
+        client._local.http = type(
+            "Http", (), {"request": lambda self, *a, **kw: (Response(200), b"whole file")}
+        )()
+        assert client.fetch_range("f", 0, 3) == b"whole file"
+        with pytest.raises(RangeIgnoredError) as info:
+            client.fetch_range("f", 4, 7)
+        assert info.value.content == b"whole file"
+
+    def test_same_name_in_different_folders(self, make_drive, tmp_path: Path):
+        drive = make_drive({"1900": {"p.jp2": b"old" * 4}, "1901": {"p.jp2": b"new" * 5}})
+        files = crawl_folder_tree(drive, "root")
+        summary = download_files(drive, files, tmp_path, chunk_size=4)
+        assert summary.downloaded == 2
+        assert (tmp_path / "1900" / "p.jp2").read_bytes() == b"old" * 4
+        assert (tmp_path / "1901" / "p.jp2").read_bytes() == b"new" * 5
+
+    def test_manifest_writes_are_batched(self, drive, tmp_path: Path, monkeypatch):
+        writes = []
+        real_replace = os.replace
+        monkeypatch.setattr(
+            "newspapers.data.drive.os.replace",
+            lambda src, dst: (writes.append(dst), real_replace(src, dst))[1],
+        )
+        manifest = DownloadManifest(tmp_path / MANIFEST_NAME, flush_interval=3600)
+        files = crawl_folder_tree(drive, "root")
+        download_files(drive, files, tmp_path, manifest=manifest, chunk_size=4)
+
+        assert writes.count(tmp_path / MANIFEST_NAME) == 1  # the final flush only
+        on_disk = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        assert len(on_disk) == 4 and all(e["complete"] for e in on_disk.values())
+
+    def test_md5_mismatch_fails(self, drive, tmp_path: Path):
+        bad = DriveFile(id="b.jp2", name="b.jp2", size=10, md5="0" * 32)
+        summary = download_files(drive, [bad], tmp_path)
+        assert summary.failed == 1
+        assert not (tmp_path / "b.jp2").exists()
@@ -0,0 +1,363 @@
+"""Tests for the shared Gemini client manager (against a fake SDK client)."""
+
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from newspapers import gemini
+from newspapers.gemini import (
+    CircuitBreaker,
+    CircuitOpenError,
+    GeminiClients,
+    KeyPool,
+    RetryPolicy,
+    TokenBucket,
+    retry_after,
+)
+
+
+class FakeClient:
+    """Stands in for ``genai.Client``; records generate_content calls."""
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.calls = []
+        self.models = self
+
+    def generate_content(self, *, model, contents, config):
+        self.calls.append((model, contents, config))
+        return f"{model}:{self.api_key}"
+
+
+@pytest.fixture()
+def keys(monkeypatch):
+    monkeypatch.setattr(gemini, "load_dotenv", lambda *a: None)
+    monkeypatch.setenv("GEMINI_FLASH_API_KEY", "flash-key")
+    monkeypatch.setenv("GEMINI_PRO_API_KEY", "pro-key")
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+
+class TestGeminiClients:
+    def test_one_client_per_key_across_threads(self, keys):
+        built = []
+
+        def factory(api_key):
+            built.append(api_key)
+            return FakeClient(api_key)
+
+        clients = GeminiClients(factory)
+        seen = []
+        threads = [
+            threading.Thread(target=lambda: seen.append(clients.client("gemini-2.5-flash")))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert built == ["flash-key"]
+        assert all(c is seen[0] for c in seen)
+
+        assert clients.client("gemini-2.5-pro").api_key == "pro-key"
+        assert built == ["flash-key", "pro-key"]
+
+    def test_key_fallback(self, keys, monkeypatch):
+        monkeypatch.delenv("GEMINI_FLASH_API_KEY")
+        clients = GeminiClients(FakeClient)
+        assert clients.api_key("gemini-2.5-flash") == "pro-key"
+        monkeypatch.delenv("GEMINI_PRO_API_KEY")
+        monkeypatch.setenv("GEMINI_API_KEY", "shared-key")
+        clients.reset()  # keys are read once
+        assert clients.api_key("gemini-2.5-pro") == "shared-key"
+
+    def test_generate_uses_shared_client(self, keys, monkeypatch):
+        monkeypatch.delenv("GEMINI_PRO_API_KEY")
+        clients = GeminiClients(FakeClient)
+        assert clients.generate("gemini-2.5-flash", ("img", "prompt")) == (
+            "gemini-2.5-flash:flash-key"
+        )
+        clients.generate("gemini-2.5-flash", ["img", "other"], config="cfg")
+        client = clients.client("gemini-2.5-flash")
+        assert client.calls == [
+            ("gemini-2.5-flash", ["img", "prompt"], None),
+            ("gemini-2.5-flash", ["img", "other"], "cfg"),
+        ]
+
+    def test_dotenv_is_read_once(self, monkeypatch):
+        loads = []
+        monkeypatch.setattr(gemini, "load_dotenv", lambda *a: loads.append(1))
+        clients = GeminiClients(FakeClient)
+        for _ in range(3):
+            clients.client("gemini-2.5-flash")
+        assert loads == [1]
+        clients.reset()
+        clients.client("gemini-2.5-flash")
+        assert loads == [1, 1]
+
+
+class APIError(Exception):
+    """Shaped like ``google.genai.errors.APIError``."""
+
+    def __init__(self, code, message="", details=None):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.details = details or {}
+
+
+class FlakyClient(FakeClient):
+    """Raises the queued errors first, then succeeds."""
+
+    errors: list = []
+
+    def generate_content(self, *, model, contents, config):
+        self.calls.append(model)
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRequestExecution:
+    """Pacing, retries and circuit breaking around generate_content."""
+
+    @pytest.fixture()
+    def flaky(self, keys, monkeypatch):
+        monkeypatch.delenv("GEMINI_PRO_API_KEY")  # one key per model: no failover
+        monkeypatch.setattr(FlakyClient, "errors", [])
+        clock = FakeClock()
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock.sleep(seconds)
+
+        clients = GeminiClients(
+            FlakyClient,
+            rate_limits={},
+            retry=RetryPolicy(max_attempts=4, base_delay=0.5),
+            failure_threshold=5,
+            reset_timeout=60,
+            sleep=sleep,
+            clock=clock,
+        )
+        return clients, sleeps
+
+    def test_transient_errors_are_retried_honouring_hints(self, flaky):
+        clients, sleeps = flaky
+        quota = APIError(
+            429,
+            "RESOURCE_EXHAUSTED",
+            {"error": {"details": [{"@type": "RetryInfo", "retryDelay": "26s"}]}},
+        )
+        FlakyClient.errors = [quota, APIError(503, "UNAVAILABLE")]
+        assert clients.generate("gemini-2.5-flash", ["x"]) == "ok"
+        assert len(sleeps) == 2
+        assert sleeps[0] >= 26
+        assert 0 <= sleeps[1] <= 1.0
+
+    def test_client_errors_are_not_retried(self, flaky):
+        clients, sleeps = flaky
+        FlakyClient.errors = [APIError(400, "INVALID_ARGUMENT")]
+        with pytest.raises(APIError):
+            clients.generate("gemini-2.5-flash", ["x"])
+        assert sleeps == []
+
+    def test_gives_up_after_max_attempts_and_opens_circuit(self, flaky):
+        clients, sleeps = flaky
+        # Each request uses up its own retries; the breaker counts requests.
+        for _ in range(5):
+            FlakyClient.errors = [ConnectionError("reset")] * 4
+            with pytest.raises(ConnectionError):
+                clients.generate("gemini-2.5-flash", ["x"])
+        assert len(sleeps) == 5 * 3
+        # The circuit is now open for this model/key; other models are unaffected.
+        with pytest.raises(CircuitOpenError):
+            clients.generate("gemini-2.5-flash", ["x"])
+        assert clients.generate("gemini-2.5-pro", ["x"]) == "ok"
+
+    def test_throttling_does_not_trip_the_circuit(self, flaky):
+        clients, sleeps = flaky
+        for _ in range(8):
+            FlakyClient.errors = [APIError(429, "RESOURCE_EXHAUSTED")]
+            assert clients.generate("gemini-2.5-flash", ["x"]) == "ok"
+        assert len(sleeps) == 8
+        assert all(breaker.state == "closed" for breaker in clients._breakers.values())
+
+    def test_retrying_request_waits_out_open_circuit(self, flaky):
+        clients, sleeps = flaky
+
+        class TrippingClient(FlakyClient):
+            """Fails once while other requests open the circuit meanwhile."""
+
+            def generate_content(self, *, model, contents, config):
+                if not self.calls:
+                    for _ in range(5):
+                        clients._route(model, self.api_key)[1].record_failure()
+                return super().generate_content(model=model, contents=contents, config=config)
+
+        clients._factory = TrippingClient
+        FlakyClient.errors = [APIError(503, "UNAVAILABLE")]
+        assert clients.generate("gemini-2.5-flash", ["x"]) == "ok"
+        assert sum(sleeps) >= 60  # waited for the circuit to half-open
+        breaker = clients._route("gemini-2.5-flash", "flash-key")[1]
+        assert breaker.state == "closed"  # the trial call succeeded
+
+    def test_failure_threshold_must_exceed_attempts(self):
+        with pytest.raises(ValueError, match="failure_threshold"):
+            GeminiClients(FakeClient, retry=RetryPolicy(max_attempts=6), failure_threshold=6)
+
+    def test_slot_is_released_during_backoff(self, flaky):
+        clients, sleeps = flaky
+        held = []
+
+        @contextmanager
+        def slot():
+            held.append(True)
+            try:
+                yield
+            finally:
+                held.append(False)
+
+        def sleep(seconds):
+            sleeps.append(held[-1])
+
+        clients._sleep = sleep
+        FlakyClient.errors = [APIError(503, "UNAVAILABLE")] * 2
+        assert clients.generate("gemini-2.5-flash", ["x"], slot=slot) == "ok"
+        assert held == [True, False] * 3
+        assert sleeps == [False, False]
+
+    def test_circuit_half_opens_after_timeout(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        breaker.before_call("m")
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("m")
+
+        clock.now = 31
+        assert breaker.state == "half-open"
+        breaker.before_call("m")  # the single trial call
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("m")
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now = 62
+        breaker.before_call("m")
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_token_bucket_paces_and_pauses(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, burst=2, clock=clock, sleep=clock.sleep)
+        for _ in range(4):
+            bucket.acquire()
+        assert clock.now == pytest.approx(2.0)  # burst of 2, then 1/s
+
+        bucket.pause(10)
+        bucket.acquire()
+        assert clock.now == pytest.approx(12.0)
+
+    def test_retry_hint_sources(self):
+        class Response:
+            headers = {"retry-after": "7"}
+
+        exc = APIError(429)
+        exc.response = Response()
+        assert retry_after(exc) == 7
+        assert retry_after(APIError(429, "Please retry in 26.5s.")) == 26.5
+        assert retry_after(APIError(503)) is None
+
+
+class TestKeyPool:
+    """Requests are spread over all configured keys and avoid throttled ones."""
+
+    def test_keys_from_env(self, keys, monkeypatch):
+        monkeypatch.setenv("GEMINI_API_KEYS", "extra-1, extra-2,pro-key")
+        pool = KeyPool.from_env()
+        assert pool.keys_for("gemini-2.5-flash") == ["flash-key", "pro-key", "extra-1", "extra-2"]
+        assert pool.keys_for("gemini-2.5-pro") == ["pro-key", "extra-1", "extra-2"]
+
+    def test_spreads_requests_across_keys(self, keys):
+        clients = GeminiClients(FakeClient, rate_limits={})
+        results = [clients.generate("gemini-2.5-flash", ["x"]) for _ in range(4)]
+        assert (
+            sorted(results)
+            == ["gemini-2.5-flash:flash-key"] * 2 + ["gemini-2.5-flash:pro-key"] * 2
+        )
+        stats = clients.key_stats()
+        assert list(stats) == ["1:…-key", "2:…-key"]
+        assert [s["gemini-2.5-flash"]["requests"] for s in stats.values()] == [2, 2]
+
+    def test_in_flight_and_error_rate_steer_choice(self):
+        clock = FakeClock()
+        pool = KeyPool({"flash": ["a", "b", "c"]}, clock=clock)
+        flash = "gemini-2.5-flash"
+        pool.started(flash, "a")
+        assert pool.choose(flash) == "b"
+        pool.finished(flash, "a")
+        pool.started(flash, "b")
+        pool.finished(flash, "b", error=True)
+        assert pool.choose(flash) == "c"
+        assert pool.choose(flash, avoid=["a", "c"]) == "b"
+
+    def test_throttled_key_cools_down(self):
+        clock = FakeClock()
+        pool = KeyPool({"flash": ["a", "b"]}, clock=clock)
+        flash = "gemini-2.5-flash"
+        pool.started(flash, "a")
+        pool.finished(flash, "a", error=True, throttled=True, retry_after=20)
+        pool.started(flash, "b")
+        pool.finished(flash, "b", error=True)
+        assert pool.choose(flash) == "b"
+        assert pool.stats()["1:…"][flash]["cooling_down"]
+        clock.now = 21
+        assert pool.choose(flash) == "a"
+        assert pool.stats()["1:…"][flash] == {
+            "requests": 1,
+            "errors": 1,
+            "throttled": 1,
+            "per_minute": 1,
+            "error_rate": 0.2,
+            "cooling_down": False,
+        }
+
+    def test_throttling_is_per_model(self):
+        pool = KeyPool({"pro": ["a", "b"], "flash": ["a", "b"]}, clock=FakeClock())
+        pool.started("gemini-2.5-pro", "a")
+        pool.finished("gemini-2.5-pro", "a", error=True, throttled=True)
+        assert pool.choose("gemini-2.5-pro") == "b"
+        # Key "a" still has Flash quota and stays first choice for Flash.
+        assert pool.choose("gemini-2.5-flash") == "a"
+        assert list(pool.stats()["1:…"]) == ["gemini-2.5-pro"]
+
+    def test_retry_after_429_moves_to_another_key(self, keys, monkeypatch):
+        monkeypatch.setattr(FlakyClient, "errors", [APIError(429, "Please retry in 26s.")])
+        sleeps = []
+        built = {}
+
+        def factory(api_key):
+            built[api_key] = FlakyClient(api_key)
+            return built[api_key]
+
+        clients = GeminiClients(factory, rate_limits={}, sleep=sleeps.append)
+        assert clients.generate("gemini-2.5-flash", ["x"]) == "ok"
+        assert built["flash-key"].calls == ["gemini-2.5-flash"]
+        assert built["pro-key"].calls == ["gemini-2.5-flash"]
+        assert len(sleeps) == 1 and sleeps[0] < 26  # no need to wait out the hint
+        # The throttled key is avoided until its cooldown ends.
+        assert clients.api_key("gemini-2.5-flash") == "pro-key"
@@ -0,0 +1,65 @@
+"""Tests for the shared decoded-page cache."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from newspapers.data.image_cache import PageImageCache
+
+
+@pytest.fixture()
+def write(noise_page):
+    """Write a small noise page to *path*; *seed* varies its content."""
+
+    def make(path: Path, seed: int = 0) -> Path:
+        noise_page((40, 30), seed=seed).save(path, format="PNG")
+        return path
+
+    return make
+
+
+class TestPageImageCache:
+    """Decode once, share read-only arrays, evict by byte budget."""
+
+    def test_decodes_once(self, tmp_path: Path, write):
+        cache = PageImageCache()
+        page = write(tmp_path / "p.png")
+
+        rgb = cache.get_rgb(page)
+        assert cache.get_rgb(page) is rgb
+        assert rgb.shape == (30, 40, 3)
+        with pytest.raises(ValueError):
+            rgb[0, 0, 0] = 0
+
+        gray = cache.get_gray(page)
+        expected = np.asarray(Image.open(page).convert("RGB").convert("L"))
+        assert np.array_equal(gray, expected)
+        assert cache.misses == 2  # RGB decode + gray derivation, no second file read
+
+    def test_rewritten_file_is_redecoded(self, tmp_path: Path, write):
+        cache = PageImageCache()
+        page = write(tmp_path / "p.png")
+        first = cache.get_rgb(page)
+
+        write(page, seed=1)
+        st = page.stat()
+        os.utime(page, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert not np.array_equal(cache.get_rgb(page), first)
+
+    def test_lru_eviction(self, tmp_path: Path, write):
+        one_page = 40 * 30 * 3
+        cache = PageImageCache(max_bytes=2 * one_page)
+        pages = [write(tmp_path / f"p{i}.png") for i in range(3)]
+
+        for p in pages:
+            cache.get_rgb(p)
+        assert len(cache) == 2
+        assert cache.nbytes == 2 * one_page
+
+        cache.get_rgb(pages[1])
+        assert cache.hits == 1
+        cache.get_rgb(pages[0])
+        assert cache.misses == 4
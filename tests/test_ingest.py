@@ -4,7 +4,13 @@ from pathlib import Path
 
 from PIL import Image
 
-from newspapers.data.ingest import convert_jp2
+from newspapers.data.ingest import (
+    _build_parser,
+    _jp2_reduce_factor,
+    convert_directory,
+    convert_jp2,
+    ensure_png,
+)
 
 
 class TestConvertJp2:
@@ -37,3 +43,72 @@ class TestConvertJp2:
         convert_jp2(src, out_dir)
 
         assert out_dir.exists()
+
+    def test_reduced_decode_skips_png(self, tmp_path: Path):
+        img = Image.new("RGB", (4000, 6000), color="white")
+        src = tmp_path / "page.jp2"
+        img.save(src, format="JPEG2000")
+
+        out_dir = tmp_path / "output"
+        jpg_path, png_path = convert_jp2(src, out_dir, write_png=False)
+
+        assert png_path is None
+        assert not (out_dir / "page.png").exists()
+        thumb = Image.open(jpg_path)
+        assert thumb.size == (853, 1280)
+
+    def test_ensure_png_materialises_once(self, tmp_path: Path):
+        img = Image.new("RGB", (300, 200), color="blue")
+        src = tmp_path / "page.jp2"
+        img.save(src, format="PNG")
+
+        out_dir = tmp_path / "output"
+        png_path = ensure_png(src, out_dir)
+        mtime = png_path.stat().st_mtime_ns
+
+        assert Image.open(png_path).size == (300, 200)
+        assert ensure_png(src, out_dir).stat().st_mtime_ns == mtime
+
+
+class TestJp2ReduceFactor:
+    """Test selection of the JPEG2000 decode resolution level."""
+
+    def test_keeps_decoded_image_above_target(self):
+        assert _jp2_reduce_factor((4000, 6000), (1280, 1280)) == 2
+        assert _jp2_reduce_factor((2000, 3000), (1280, 1280)) == 1
+
+    def test_small_image_not_reduced(self):
+        assert _jp2_reduce_factor((1500, 1500), (1280, 1280)) == 0
+
+    def test_capped(self):
+        assert _jp2_reduce_factor((200_000, 200_000), (100, 100)) == 5
+
+
+class TestConvertDirectory:
+    """Test batch conversion of a .jp2 tree."""
+
+    def test_converts_tree_then_skips(self, tmp_path: Path):
+        raw = tmp_path / "raw"
+        for rel in ("a/p1.jp2", "a/b/p2.jp2", "p3.jp2"):
+            src = raw / rel
+            src.parent.mkdir(parents=True, exist_ok=True)
+            Image.new("RGB", (400, 600), color="white").save(src, format="PNG")
+
+        out_dir = tmp_path / "processed"
+        summary = convert_directory(raw, out_dir, workers=2)
+
+        assert (summary.converted, summary.skipped, summary.failed) == (3, 0, 0)
+        assert sorted(p.name for p in out_dir.glob("*.jpg")) == ["p1.jpg", "p2.jpg", "p3.jpg"]
+
+        again = convert_directory(raw, out_dir, workers=2)
+        assert (again.converted, again.skipped) == (0, 3)
+
+
+class TestCli:
+    """--verbose is accepted before or after the subcommand."""
+
+    def test_verbose_position(self):
+        parser = _build_parser()
+        assert parser.parse_args(["convert", "--verbose"]).verbose
+        assert parser.parse_args(["--verbose", "download"]).verbose
+        assert not parser.parse_args(["convert"]).verbose
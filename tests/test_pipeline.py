@@ -0,0 +1,45 @@
+"""Tests for the streaming download → convert pipeline."""
+
+import io
+import json
+from pathlib import Path
+
+from PIL import Image
+
+from newspapers.data.drive import MANIFEST_NAME
+from newspapers.data.pipeline import stream_ingest
+
+
+def _png_bytes(size: tuple[int, int]) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color="white").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class TestStreamIngest:
+    """Downloads are converted as they land; raw files can be discarded."""
+
+    def test_converts_and_deletes_raw(self, make_drive, tmp_path: Path):
+        drive = make_drive(
+            {
+                "p1.jp2": _png_bytes((300, 400)),
+                "1900": {"p2.jp2": _png_bytes((200, 100)), "p3.jp2": b"not an image"},
+            }
+        )
+        raw, out = tmp_path / "raw", tmp_path / "processed"
+
+        summary = stream_ingest(
+            drive, "root", raw, out, convert_workers=2, max_pending_raw=1, delete_raw=True
+        )
+
+        assert (summary.converted, summary.failed, summary.raw_deleted) == (2, 1, 2)
+        assert sorted(p.name for p in out.glob("*.jpg")) == ["p1.jpg", "p2.jpg"]
+        assert [p.relative_to(raw).as_posix() for p in raw.rglob("*.jp2")] == ["1900/p3.jp2"]
+        manifest = json.loads((raw / MANIFEST_NAME).read_text())
+        assert manifest["p1.jp2"]["converted"] is True
+        assert "converted" not in manifest["p3.jp2"]
+
+        drive.ranges.clear()
+        again = stream_ingest(drive, "root", raw, out, convert_workers=2, delete_raw=True)
+        assert again.already_converted == 2
+        assert all(file_id == "p3.jp2" for file_id, _, _ in drive.ranges)
@@ -0,0 +1,75 @@
+"""Tests for the array-backed region container."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from newspapers.models import PageSegment
+from newspapers.segmentation.annotate import BBoxRegion, _write_yolo_label
+from newspapers.segmentation.regions import CLASS_ID, RegionSet
+
+
+def _regions() -> list[BBoxRegion]:
+    return [
+        BBoxRegion(label="headline", box=[10, 20, 60, 900]),
+        BBoxRegion(label="job_advertisement", box=[100, 0, 400, 333]),
+        BBoxRegion(label="not_a_class", box=[500, 500, 510, 510]),
+    ]
+
+
+class TestRegionSet:
+    """Struct-of-arrays regions with pydantic export only at the boundary."""
+
+    def test_round_trip_keeps_unknown_labels(self):
+        regions = RegionSet.from_regions(_regions())
+        assert len(regions) == 3
+        assert regions.labels == ["headline", "job_advertisement", "not_a_class"]
+        assert [(r.label, r.box) for r in regions.to_regions()] == [
+            (r.label, r.box) for r in _regions()
+        ]
+
+    def test_yolo_matches_bbox_region(self):
+        rows = RegionSet.from_regions(_regions()).to_yolo()
+        for row, region in zip(rows, _regions()):
+            class_id, *rest = region.to_yolo()
+            assert row[0] == class_id
+            assert row[1:] == pytest.approx(rest)
+        assert rows[2, 0] == -1
+
+    def test_slices_are_views_and_masks_filter(self):
+        regions = RegionSet.from_regions(_regions())
+        head = regions[:2]
+        assert np.shares_memory(head.boxes, regions.boxes)
+        wide = regions[regions.widths > 300]
+        assert wide.labels == ["headline", "job_advertisement"]
+        assert regions[-1].labels == ["not_a_class"]
+
+    def test_concat_remaps_class_tables(self):
+        a = RegionSet.from_arrays(np.zeros((1, 4)), ["other"])
+        b = RegionSet.from_arrays(np.ones((2, 4)), ["masthead", "another"])
+        joined = RegionSet.concat([a, RegionSet.empty(), b])
+        assert joined.labels == ["other", "masthead", "another"]
+        assert joined.yolo_class_ids().tolist() == [-1, CLASS_ID["masthead"], -1]
+
+    def test_segments_and_xyxy(self):
+        segment = PageSegment(
+            label="job_advertisement", x_min=5, y_min=7, x_max=50, y_max=70, confidence=0.5
+        )
+        regions = RegionSet.from_segments([segment])
+        assert regions.xyxy.tolist() == [[5, 7, 50, 70]]
+        assert regions.to_segments() == [segment]
+
+        detected = RegionSet.from_xyxy(
+            regions.xyxy, np.array([3]), np.array([0.5]), {3: "job_advertisement"}
+        )
+        assert detected.to_segments() == [segment]
+
+    def test_yolo_label_file(self, tmp_path: Path):
+        label = tmp_path / "page.txt"
+        _write_yolo_label(_regions(), label)
+        expected = []
+        for region in _regions()[:2]:
+            class_id, cx, cy, w, h = region.to_yolo()
+            expected.append(f"{class_id} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}")
+        assert label.read_text(encoding="utf-8") == "\n".join(expected) + "\n"
@@ -0,0 +1,383 @@
+"""Tests for the classical-CV page structure pipeline."""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from newspapers.data.artifacts import ArtifactStore
+from newspapers.segmentation import structure
+from newspapers.segmentation.structure import (
+    analyse_page_structure,
+    binarise_page,
+    column_ink_sums,
+    compute_projection_profile,
+    correct_skew,
+    detect_skew,
+    detect_vertical_rules,
+)
+
+
+@pytest.fixture()
+def no_strips(monkeypatch):
+    """Skip strip PNG encoding; these tests only compare the analysis."""
+    monkeypatch.setattr(structure, "decompose_into_strips", lambda *a, **k: [])
+
+
+class TestMultiScaleAnalysis:
+    """Downsampled analysis refined at full resolution."""
+
+    def test_matches_full_resolution(self, tmp_path: Path, no_strips, write_page):
+        page = write_page(tmp_path / "page.png")
+        kwargs = dict(n_columns_hint=6, correct_skew_flag=False, interim_dir=tmp_path / "out")
+
+        full_bounds, _, full_profile, _ = analyse_page_structure(page, **kwargs)
+        ms_bounds, _, ms_profile, _ = analyse_page_structure(page, analysis_width=800, **kwargs)
+
+        assert len(full_bounds) == 5
+        assert ms_bounds == full_bounds
+        assert ms_profile.shape == full_profile.shape
+
+    def test_narrow_page_is_not_downsampled(self):
+        assert structure._downsample_factor(900, 1200) == 1
+        assert structure._downsample_factor(4000, 1200) == 3
+        assert structure._downsample_factor(4000, None) == 1
+
+
+class TestSkew:
+    """Sub-degree skew estimation that correct_skew can undo."""
+
+    @pytest.mark.parametrize("angle", [0.0, 0.35, -0.6, 2.5])
+    def test_detects_and_corrects(self, tmp_path: Path, angle: float, write_page):
+        page = write_page(tmp_path / "page.png", size=(1600, 1200), rules=())
+        gray = np.asarray(Image.open(page).convert("L"))
+        h, w = gray.shape
+        m = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        tilted = cv2.warpAffine(gray, m, (w, h), borderValue=255)
+
+        skew = detect_skew(tilted)
+        assert skew == pytest.approx(angle, abs=0.05)
+
+        levelled = correct_skew(Image.fromarray(tilted), skew)
+        assert abs(detect_skew(np.asarray(levelled.convert("L")))) < 0.1
+
+    def test_blank_page(self):
+        assert detect_skew(np.full((300, 200), 255, dtype=np.uint8)) == 0.0
+
+
+class TestSharedBinarisation:
+    """One Otsu pass feeds both the profile and the rule detector."""
+
+    def test_shared_mask_matches_standalone(self, tmp_path: Path, write_page):
+        page = write_page(tmp_path / "page.png")
+        gray = np.asarray(Image.open(page).convert("L"))
+        binary, threshold = binarise_page(gray)
+
+        assert np.array_equal(column_ink_sums(binary), (gray <= threshold).sum(axis=0))
+        assert np.array_equal(
+            compute_projection_profile(gray, binary=binary), compute_projection_profile(gray)
+        )
+        assert detect_vertical_rules(gray, binary=binary) == detect_vertical_rules(gray)
+
+
+class TestInMemoryStrips:
+    """Strips as views onto the page array, with optional persistence."""
+
+    def test_no_files_written(self, tmp_path: Path, write_page):
+        page = write_page(tmp_path / "page.png", size=(1200, 800))
+        out = tmp_path / "strips"
+
+        _, strips, _, _ = analyse_page_structure(
+            page, n_columns_hint=6, interim_dir=out, persist_strips=False
+        )
+
+        assert not out.exists()
+        assert [s.strip_id for s in strips][:2] == ["masthead", "col_1"]
+        col = strips[1]
+        assert col.image_path is None
+        assert col.pixels.shape == (col.strip_height, col.strip_width, 3)
+        assert not col.pixels.flags.writeable
+        page_rgb = np.asarray(Image.open(page).convert("RGB"))
+        assert np.array_equal(
+            col.pixels, page_rgb[:, col.x_offset : col.x_offset + col.strip_width]
+        )
+
+    def test_matches_persisted_strips(self, tmp_path: Path, write_page):
+        page = write_page(tmp_path / "page.png", size=(1200, 800))
+        _, on_disk, _, _ = analyse_page_structure(page, interim_dir=tmp_path / "out")
+        _, in_memory, _, _ = analyse_page_structure(page, persist_strips=False)
+
+        for disk, mem in zip(on_disk, in_memory, strict=True):
+            assert np.array_equal(np.asarray(disk.image()), np.asarray(mem.image()))
+
+        saved = in_memory[1].save(tmp_path / "col.png")
+        assert in_memory[1].image_path == saved
+        assert np.array_equal(np.asarray(Image.open(saved).convert("RGB")), in_memory[1].pixels)
+
+
+class TestStripEncoding:
+    """Persisted strips are encoded on a thread pool at the chosen level."""
+
+    def test_deskewed_page_strips_on_disk(self, tmp_path: Path, tilted_page):
+        page = tilted_page(1.5)
+        out = tmp_path / "out"
+        _, strips, _, skew = analyse_page_structure(
+            page, interim_dir=out, compress_level=0, encode_workers=3
+        )
+        assert skew == pytest.approx(1.5, abs=0.05)
+        col = strips[1]
+        assert np.array_equal(np.asarray(Image.open(col.image_path)), np.asarray(col.image()))
+
+        _, in_memory, _, _ = analyse_page_structure(page, persist_strips=False)
+        assert np.array_equal(in_memory[1].pixels, np.asarray(col.image()))
+
+
+@pytest.fixture()
+def tilted_page(tmp_path: Path, write_page):
+    """Factory for a column page rotated by *angle* degrees."""
+
+    def make(angle: float) -> Path:
+        flat = write_page(tmp_path / "flat.png", size=(1200, 800), rules=())
+        gray = np.asarray(Image.open(flat).convert("L"))
+        m = cv2.getRotationMatrix2D((600, 400), angle, 1.0)
+        page = tmp_path / "page.png"
+        Image.fromarray(cv2.warpAffine(gray, m, (1200, 800), borderValue=255)).save(page)
+        return page
+
+    return make
+
+
+class TestLazyDeskew:
+    """Skew correction applied per strip, straight from the original page."""
+
+    def test_strips_match_deskewed_page(self, tmp_path: Path, tilted_page):
+        page = tilted_page(-1.2)
+        out = tmp_path / "out"
+        _, strips, _, skew = analyse_page_structure(page, interim_dir=out)
+
+        assert sorted(p.name for p in out.iterdir())[0] == "page_col01.png"  # no page PNG
+        deskewed = np.asarray(correct_skew(Image.open(page).convert("RGB"), skew))
+        for strip in strips[:-1]:
+            assert (strip.page_width, strip.page_height) == deskewed.shape[1::-1]
+            x0, y0 = strip.x_offset, strip.y_offset
+            expected = deskewed[y0 : y0 + strip.strip_height, x0 : x0 + strip.strip_width]
+            diff = np.abs(np.asarray(strip.image()).astype(int) - expected)
+            assert diff.max() <= 1  # fixed-point interpolation rounding
+
+        transform = structure.SkewTransform.from_meta(strips[1].meta["deskew"])
+        assert transform.angle == skew
+        assert transform.size == deskewed.shape[1::-1]
+
+    def test_region_from_source_box(self):
+        rng = np.random.default_rng(0)
+        src = rng.integers(0, 255, (500, 400, 3), dtype=np.uint8)
+        transform = structure.SkewTransform.from_angle(400, 500, 2.0)
+        box = (50, 60, 300, 420)
+        sx0, sy0, sx1, sy1 = transform.source_box(box)
+        from_region = transform.warp(src[sy0:sy1, sx0:sx1], box, source_origin=(sx0, sy0))
+        assert np.abs(from_region.astype(int) - transform.warp(src, box)).max() <= 1
+
+
+class TestBatchStructure:
+    """Process-pool directory analysis into one columnar record file."""
+
+    def test_records_round_trip_and_reuse(self, tmp_path: Path, monkeypatch, write_page):
+        pages = tmp_path / "pages"
+        pages.mkdir()
+        write_page(pages / "a.png", size=(1200, 800))
+        write_page(pages / "b.png", size=(1200, 800), n_cols=4, rules=(), seed=1)
+        Image.open(pages / "b.png").convert("RGB").save(pages / "b.jpg")  # PNG preferred
+        out = tmp_path / "records.npz"
+        hashed: list[Path] = []
+        real_digest = structure.file_digest
+        monkeypatch.setattr(structure, "file_digest", lambda p: hashed.append(p) or real_digest(p))
+
+        records = structure.analyse_directory(pages, out, n_columns_hint=6, workers=1)
+        assert hashed == []  # no prior records: pages are hashed by the workers only
+        assert [r.page for r in records] == ["a.png", "b.png"]
+        assert len(records[0].column_bounds) == 5
+        assert records[0].profile.shape == (structure.PROFILE_SUMMARY_BINS,)
+
+        loaded, params = structure.load_structure_records(out)
+        assert params["n_columns_hint"] == 6
+        assert [r.column_bounds for r in loaded] == [r.column_bounds for r in records]
+        assert [r.rules for r in loaded] == [r.rules for r in records]
+
+        # Unchanged pages are served from the file without re-analysis
+        def _fail(*_a, **_k):
+            raise AssertionError("page re-analysed")
+
+        monkeypatch.setattr(structure, "_structure_record_worker", _fail)
+        again = structure.analyse_directory(pages, out, n_columns_hint=6, workers=1)
+        assert [r.digest for r in again] == [r.digest for r in records]
+        assert sorted(p.name for p in hashed) == ["a.png", "b.png"]
+
+
+class TestStructureIndex:
+    """Layouts are recorded once and reused instead of re-running detection."""
+
+    @staticmethod
+    def _no_detection(monkeypatch):
+        def _fail(*_a, **_k):
+            raise AssertionError("structure re-detected")
+
+        monkeypatch.setattr(structure, "detect_skew", _fail)
+        monkeypatch.setattr(structure, "detect_columns", _fail)
+
+    def test_in_memory_rerun_uses_index(
+        self, tmp_path: Path, monkeypatch, structure_index, write_page
+    ):
+        page = write_page(tmp_path / "page.png", size=(1200, 800))
+        bounds, strips, profile, skew = analyse_page_structure(
+            page, n_columns_hint=6, persist_strips=False
+        )
+        assert len(structure_index) == 1
+
+        layout = structure_index.get(strips[0].meta["structure_key"])
+        assert layout.column_bounds == bounds
+        assert layout.strips == structure.strip_geometry(1200, 800, bounds)
+        assert np.array_equal(layout.profile, profile)
+
+        self._no_detection(monkeypatch)
+        bounds2, strips2, profile2, skew2 = analyse_page_structure(
+            page, n_columns_hint=6, persist_strips=False
+        )
+        assert (bounds2, skew2) == (bounds, skew)
+        assert np.array_equal(profile2, profile)
+        for a, b in zip(strips, strips2, strict=True):
+            assert np.array_equal(a.pixels, b.pixels)
+
+    def test_batch_populates_index(self, tmp_path: Path, monkeypatch, structure_index, write_page):
+        pages = tmp_path / "pages"
+        pages.mkdir()
+        page = write_page(pages / "a.png", size=(1200, 800))
+        [record] = structure.analyse_directory(
+            pages, tmp_path / "records.npz", n_columns_hint=6, workers=1
+        )
+        assert len(structure_index) == 1
+
+        self._no_detection(monkeypatch)
+        bounds, strips, _, _ = analyse_page_structure(
+            page,
+            n_columns_hint=6,
+            analysis_width=structure.DEFAULT_ANALYSIS_WIDTH,
+            store=ArtifactStore(tmp_path / "artifacts"),
+        )
+        assert bounds == record.column_bounds
+        assert all(s.image_path.exists() for s in strips)
+
+
+class TestMergeAnnotations:
+    """Array-backed strip merge with vectorised, class-aware NMS."""
+
+    @staticmethod
+    def _greedy(boxes, classes, threshold=0.5):
+        """Reference: the pairwise greedy NMS the vectorised version replaces."""
+
+        def iou(a, b):
+            ih = min(a[2], b[2]) - max(a[0], b[0])
+            iw = min(a[3], b[3]) - max(a[1], b[1])
+            inter = max(0, ih) * max(0, iw)
+            if inter == 0:
+                return 0.0
+            return inter / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter)
+
+        area = [(b[2] - b[0]) * (b[3] - b[1]) for b in boxes]
+        kept: list[int] = []
+        for i in sorted(range(len(boxes)), key=lambda i: -area[i]):
+            if not any(
+                classes[k] == classes[i] and iou(boxes[i], boxes[k]) > threshold for k in kept
+            ):
+                kept.append(i)
+        return kept
+
+    def test_nms_matches_greedy_reference(self, monkeypatch):
+        monkeypatch.setattr(structure, "NMS_BLOCK_ROWS", 64)  # exercise the blocking
+        rng = np.random.default_rng(3)
+        n = 400
+        y, x = rng.integers(0, 950, n), rng.integers(0, 950, n)
+        boxes = np.stack([y, x, y + rng.integers(5, 120, n), x + rng.integers(5, 60, n)], 1)
+        classes = rng.integers(0, 4, n)
+
+        kept = structure.nms_largest_first(boxes, classes)
+        assert kept.tolist() == self._greedy(boxes.tolist(), classes.tolist())
+
+    def test_strip_filters_and_coords(self):
+        from newspapers.segmentation.annotate import BBoxRegion
+
+        geometry = structure.strip_geometry(1000, 2000, [250, 500, 750], overlap_frac=0.0)
+        masthead, col_1, *_, full = (structure.PageStrip(image_path=None, **g) for g in geometry)
+        results = [
+            (masthead, [BBoxRegion(label="masthead", box=[0, 0, 1000, 1000])]),
+            (
+                col_1,
+                [
+                    BBoxRegion(label="article_text", box=[100, 0, 200, 1000]),
+                    BBoxRegion(label="article_text", box=[300, 0, 400, 1000]),
+                    BBoxRegion(label="headline", box=[100, 0, 120, 1000]),
+                ],
+            ),
+            (
+                full,
+                [
+                    BBoxRegion(label="commercial_advertisement", box=[500, 0, 600, 100]),  # narrow
+                    BBoxRegion(label="commercial_advertisement", box=[700, 0, 800, 600]),
+                ],
+            ),
+        ]
+        merged = structure.merge_strip_annotations(results, 1000, 2000, [250, 500, 750])
+
+        assert structure.strip_to_page_coords([100, 0, 200, 1000], col_1) == [100, 0, 200, 250]
+        assert sorted((r.label, r.box) for r in merged) == [
+            ("article_text", [100, 0, 200, 250]),
+            ("article_text", [300, 0, 400, 250]),
+            ("commercial_advertisement", [700, 0, 800, 600]),
+            ("headline", [100, 0, 120, 250]),
+            ("masthead", [0, 0, 120, 1000]),
+        ]
+
+
+class TestDrawColumnBounds:
+    """Profile waveform rasterised in one pass, optionally on a preview."""
+
+    def test_matches_per_column_drawing(self):
+        from PIL import ImageDraw
+
+        rng = np.random.default_rng(0)
+        page = Image.fromarray(rng.integers(0, 255, (300, 200, 3), dtype=np.uint8))
+        profile = rng.random(200).astype(np.float32)
+        bounds = [50, 120]
+
+        # Reference: the original two-lines-per-column rendering
+        expected = page.copy()
+        draw = ImageDraw.Draw(expected)
+        for x in bounds:
+            draw.line([(x, 0), (x, 300)], fill="#E63946", width=3)
+        prof_h = int(300 * 0.08)
+        for px in range(200):
+            bar_h = int(profile[px] / profile.max() * prof_h)
+            draw.line([(px, 300 - prof_h), (px, 300)], fill="#DDDDDD")
+            draw.line([(px, 300 - bar_h), (px, 300)], fill="#4A90D9")
+        for x in bounds:
+            draw.line([(x, 300 - prof_h), (x, 300)], fill="#E63946", width=3)
+
+        out = structure.draw_column_bounds(page, bounds, profile)
+        assert np.array_equal(np.asarray(out), np.asarray(expected))
+
+    def test_preview_size(self):
+        page = Image.new("L", (1200, 1800), 255)
+        out = structure.draw_column_bounds(
+            page, [600], np.ones(1200, dtype=np.float32), max_size=300
+        )
+        assert out.size == (200, 300) and out.mode == "RGB"
+        arr = np.asarray(out)
+        assert tuple(arr[150, 100]) == (0xE6, 0x39, 0x46)  # bound scaled to x=100
+        assert tuple(arr[-1, 10]) == (0x4A, 0x90, 0xD9)  # full-height bars
+
+    @pytest.mark.parametrize("mode", ["1", "P", "I;16"])
+    def test_preview_of_unusual_modes(self, mode: str):
+        page = Image.new(mode, (1200, 1800))
+        out = structure.draw_column_bounds(page, [600], None, max_size=300)
+        assert out.size == (200, 300) and out.mode == "RGB"
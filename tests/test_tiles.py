@@ -0,0 +1,50 @@
+"""Tests for tiled multi-resolution page storage."""
+
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from newspapers.data.tiles import open_tiled, tiles_path, write_tiled_page
+
+
+class TestTiledPage:
+    """Region reads decode only intersecting tiles at the right level."""
+
+    def test_full_res_region_matches_crop(self, tmp_path: Path, noise_page):
+        page = noise_page((1100, 700))
+        write_tiled_page(page, tiles_path(tmp_path / "page.png"), tile_size=256)
+
+        tiled = open_tiled(tmp_path / "page.png")
+        assert tiled is not None
+        assert tiled.size == (1100, 700)
+        assert len(tiled.levels) == 4
+
+        box = (200, 250, 777, 699)
+        region = tiled.read_region(box)
+        assert np.array_equal(np.asarray(region), np.asarray(page.crop(box)))
+
+    def test_scaled_region_uses_pyramid_level(self, tmp_path: Path):
+        page = Image.new("L", (2048, 1024), color=200)
+        out = write_tiled_page(page, tmp_path / "p.tiles", tile_size=256)
+        tiled = open_tiled(out)
+
+        assert tiled._level_for_scale(0.25) == 2
+        region = tiled.read_region((0, 0, 1024, 1024), scale=0.25)
+        assert region.size == (256, 256)
+        assert region.mode == "L"
+        assert max(tiled.thumbnail(300).size) == 300
+
+    def test_missing_tiles(self, tmp_path: Path):
+        assert open_tiled(tmp_path / "absent.png") is None
+
+    def test_stale_tiles_are_ignored(self, tmp_path: Path, noise_page):
+        png = tmp_path / "page.png"
+        noise_page((600, 400)).save(png)
+        write_tiled_page(png, tiles_path(png), tile_size=256)
+        assert open_tiled(png) is not None
+
+        # Converted again without tiles: the old pyramid no longer matches.
+        Image.new("RGB", (800, 500), "white").save(png)
+        assert open_tiled(png) is None
+        assert open_tiled(tiles_path(png)) is not None  # explicit .tiles path still opens